@@ -0,0 +1,180 @@
+"""Pipeline benchmarks on deterministic synthetic videos.
+
+Videos are generated with ffmpeg's lavfi sources, so every machine benchmarks
+the same inputs without downloading anything:
+
+- slides:        a new static test card every 10 seconds
+- scrolling:     color bars scrolling continuously (UI scrolling)
+- talking-head:  static background with a small animated region
+
+All use a sine tone as audio. Each stage is timed separately and results
+can be compared against a previous run to catch regressions.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import logging
+import platform
+import shutil
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from vidwise import __version__
+from vidwise.runner import run_tool
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = {
+    "slides": "testsrc2=size=1280x720:rate=0.1:duration={d},fps=10",
+    "scrolling": "smptehdbars=size=1280x720:rate=10:duration={d},scroll=vertical=0.01",
+    "talking-head": (
+        "color=c=0x203040:size=1280x720:rate=10:duration={d}[bg];"
+        "testsrc2=size=240x240:rate=10:duration={d}[face];"
+        "[bg][face]overlay=520:200:shortest=1"
+    ),
+}
+AUDIO = "sine=frequency=440:sample_rate=16000:duration={d}"
+
+# Slowdowns below this many seconds are treated as noise
+NOISE_FLOOR_S = 0.05
+
+
+def generate_video(path: Path, scenario: str, duration: int) -> Path:
+    """Render a synthetic benchmark video (reused if it already exists)."""
+    if path.exists():
+        return path
+    cmd = [
+        "ffmpeg",
+        "-f", "lavfi", "-i", SCENARIOS[scenario].format(d=duration),
+        "-f", "lavfi", "-i", AUDIO.format(d=duration),
+        "-shortest",
+        "-pix_fmt", "yuv420p",
+        str(path),
+        "-y",
+    ]
+    run_tool(cmd, f"generating {scenario} video")
+    return path
+
+
+def run_benchmarks(
+    workdir: Path,
+    scenarios: list[str],
+    durations: list[int],
+    whisper_model: str | None = "tiny",
+    interval: float = 2,
+    repeat: int = 1,
+) -> dict:
+    """Benchmark every scenario at every duration.
+
+    Returns a JSON-serializable report; each case maps stage names to the
+    best wall-clock time (seconds) over `repeat` runs.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    cases = {}
+    for scenario in scenarios:
+        for duration in durations:
+            name = f"{scenario}-{duration}s"
+            logger.info(f"Benchmarking {name}...")
+            video = generate_video(workdir / f"{name}.mp4", scenario, duration)
+            runs = [
+                _run_case(video, workdir / name, whisper_model, interval) for _ in range(repeat)
+            ]
+            case = runs[0]
+            case["stages"] = {
+                stage: min(run["stages"][stage] for run in runs) for stage in case["stages"]
+            }
+            cases[name] = case
+            for stage, seconds in case["stages"].items():
+                logger.info(f"  {stage:<18} {seconds:8.3f}s")
+
+    return {
+        "vidwise_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "interval": interval,
+        "whisper_model": whisper_model,
+        "cases": cases,
+    }
+
+
+def _run_case(video: Path, out: Path, whisper_model: str | None, interval: float) -> dict:
+    from vidwise.extractor import extract_all
+    from vidwise.frames import plan_batches, select_key_frames
+    from vidwise.guide import generate_guide
+    from vidwise.providers.async_base import SyncGuideProvider
+    from vidwise.providers.mock import MockGuideProvider
+
+    shutil.rmtree(out, ignore_errors=True)  # each repeat starts cold, with nothing to reuse
+    out.mkdir(parents=True)
+    stages: dict[str, float] = {}
+
+    audio, frames = _timed(stages, "extract_all", extract_all, video, out, interval)
+    key_frames = _timed(stages, "select_key_frames", select_key_frames, frames)
+
+    if whisper_model:
+        from vidwise.transcriber import transcribe
+
+        transcript = _timed(stages, "transcribe", transcribe, audio, out, whisper_model)
+    else:
+        transcript = {"text": "", "segments": []}
+
+    batches = _timed(
+        stages, "batch_frames", plan_batches, key_frames, transcript["segments"],
+        interval=interval,
+    )
+
+    provider = SyncGuideProvider(MockGuideProvider())
+    try:
+        _timed(
+            stages, "guide", generate_guide, provider, frames, transcript, out,
+            frame_interval=interval,
+        )
+    finally:
+        provider.close()
+
+    return {
+        "frames": len(frames),
+        "key_frames": len(key_frames),
+        "batches": len(batches),
+        "stages": stages,
+    }
+
+
+def _timed(stages: dict[str, float], name: str, fn: Callable, *args, **kwargs):
+    """Call fn with its output silenced, recording its wall-clock time."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    stages[name] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25) -> list[str]:
+    """List stages that got slower than baseline by more than `tolerance`.
+
+    Only cases and stages present in both reports are compared.
+    """
+    regressions = []
+    for name, case in current["cases"].items():
+        base_case = baseline.get("cases", {}).get(name)
+        if base_case is None:
+            continue
+        for stage, seconds in case["stages"].items():
+            base = base_case["stages"].get(stage)
+            if base is None:
+                continue
+            if seconds > base * (1 + tolerance) and seconds - base > NOISE_FLOOR_S:
+                change = f"+{(seconds / base - 1) * 100:.0f}%" if base else "new cost"
+                regressions.append(
+                    f"{name} {stage}: {seconds:.3f}s vs {base:.3f}s baseline ({change})"
+                )
+    return regressions
+
+
+def save_report(report: dict, path: Path) -> None:
+    """Write a benchmark report as JSON."""
+    path.write_text(json.dumps(report, indent=2) + "\n")
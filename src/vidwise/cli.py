@@ -2,15 +2,114 @@
 
 from __future__ import annotations
 
+import logging
+import sys
 from pathlib import Path
 
 import click
 
 from vidwise import __version__
-from vidwise.utils import check_dependency, format_output_dir
+from vidwise.transcriber import COMPUTE_TYPES
+from vidwise.utils import check_dependency
 
 
-@click.command()
+class _DefaultContext(click.Context):
+    @property
+    def command_path(self) -> str:
+        # The default command is invoked without a name; drop the gap it leaves
+        return super().command_path.rstrip()
+
+
+class DefaultCommand(click.Command):
+    """Command meant to be a DefaultGroup's default (its usage omits its name).
+
+    Its help is what `vidwise --help` shows, so it also lists the group's
+    other commands.
+    """
+
+    context_class = _DefaultContext
+
+    def format_epilog(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        super().format_epilog(ctx, formatter)
+        group = ctx.parent.command if ctx.parent else None
+        if not isinstance(group, click.Group):
+            return
+        commands = [
+            (name, command)
+            for name in group.list_commands(ctx.parent)
+            if (command := group.get_command(ctx.parent, name)) and not command.hidden
+        ]
+        if not commands:
+            return
+        limit = formatter.width - 6 - max(len(name) for name, _ in commands)
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [(name, command.get_short_help_str(limit)) for name, command in commands]
+            )
+
+
+class DefaultGroup(click.Group):
+    """Command group that falls back to a default command.
+
+    Keeps `vidwise <source> [options]` working next to subcommands such as
+    `vidwise bench`: any first argument that isn't a subcommand name is
+    handed to the default command.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if not args or args[0] not in self.commands:
+            args = [self.default_command, *args]
+            ctx.meta["vidwise.default_command"] = True
+        return super().parse_args(ctx, args)
+
+    def invoke(self, ctx: click.Context):
+        from vidwise.errors import VidwiseError
+
+        try:
+            return super().invoke(ctx)
+        except VidwiseError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            raise SystemExit(1) from None
+
+    def resolve_command(self, ctx: click.Context, args: list[str]):
+        name, cmd, rest = super().resolve_command(ctx, args)
+        if ctx.meta.get("vidwise.default_command"):
+            # Show usage as `vidwise [OPTIONS] SOURCE`, not `vidwise process ...`
+            name = ""
+        return name, cmd, rest
+
+
+class _ConsoleHandler(logging.Handler):
+    """Print vidwise's log messages as plain CLI output; errors go to stderr."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = self.format(record)
+        if record.levelno >= logging.ERROR:
+            print(f"Error: {message}", file=sys.stderr)
+        else:
+            print(message)
+
+
+def _log_to_console() -> None:
+    """Show the library's progress messages, which it logs rather than prints."""
+    logger = logging.getLogger("vidwise")
+    if not any(isinstance(h, _ConsoleHandler) for h in logger.handlers):
+        logger.addHandler(_ConsoleHandler())
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+@click.group(cls=DefaultGroup, default_command="process")
+def main() -> None:
+    """vidwise — extract knowledge from videos for LLMs."""
+    _log_to_console()
+
+
+@main.command("process", cls=DefaultCommand, hidden=True)
 @click.argument("source")
 @click.option(
     "--model", "-m",
@@ -19,6 +118,19 @@ from vidwise.utils import check_dependency, format_output_dir
     show_default=True,
     help="Whisper model size (speed vs accuracy).",
 )
+@click.option(
+    "--compute-type",
+    type=click.Choice(COMPUTE_TYPES),
+    default="default",
+    show_default=True,
+    help="Whisper weight precision; 'auto' benchmarks once per host and remembers the fastest.",
+)
+@click.option("--cpu-threads", type=click.IntRange(min=0), default=0,
+              help="CPU threads for Whisper (0 = backend default).")
+@click.option("--whisper-workers", type=click.IntRange(min=1), default=1, show_default=True,
+              help="faster-whisper workers (concurrent transcriptions sharing one model).")
+@click.option("--whisper-batch-size", type=click.IntRange(min=0), default=0, show_default=True,
+              help="Use faster-whisper's batched pipeline with this batch size (0 = off).")
 @click.option(
     "--output-dir", "-o",
     type=click.Path(),
@@ -32,14 +144,14 @@ from vidwise.utils import check_dependency, format_output_dir
 )
 @click.option(
     "--provider", "-p",
-    type=click.Choice(["auto", "claude", "openai"]),
+    type=click.Choice(["auto", "claude", "openai", "local"]),
     default="auto",
     show_default=True,
     help="AI provider for guide generation.",
 )
 @click.option(
     "--frame-interval",
-    type=int,
+    type=click.FloatRange(min=0, min_open=True),
     default=2,
     show_default=True,
     help="Seconds between frame captures.",
@@ -51,15 +163,66 @@ from vidwise.utils import check_dependency, format_output_dir
     show_default=True,
     help="Pixel difference threshold for key frame selection (0.0-1.0).",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Parallel ffmpeg processes for frame extraction (splits the video by time).",
+)
+@click.option(
+    "--frame-store",
+    is_flag=True,
+    help="Keep frames in one indexed pack file; export only key frames as PNGs.",
+)
+@click.option(
+    "--ocr",
+    is_flag=True,
+    help="OCR key frames locally (needs tesseract); text-only frames skip the image upload.",
+)
+@click.option(
+    "--previous",
+    type=click.Path(exists=True, file_okay=False),
+    default=None,
+    help="Previous output directory; unchanged spans reuse its analysis.",
+)
+@click.option(
+    "--word-timestamps",
+    is_flag=True,
+    help="Transcribe with word timestamps; guide batches get exactly the words in their window.",
+)
+@click.option(
+    "--full-json",
+    is_flag=True,
+    help="Save Whisper's complete output (tokens, log-probs) in transcript.json.",
+)
+@click.option(
+    "--batch-tokens",
+    type=click.IntRange(min=1000),
+    default=24000,
+    show_default=True,
+    help="Estimated input token budget per AI request (frames + transcript).",
+)
 @click.version_option(version=__version__)
-def main(
+def process(
     source: str,
     model: str,
+    compute_type: str,
+    cpu_threads: int,
+    whisper_workers: int,
+    whisper_batch_size: int,
     output_dir: str | None,
     no_guide: bool,
     provider: str,
-    frame_interval: int,
+    frame_interval: float,
     frame_threshold: float,
+    workers: int,
+    frame_store: bool,
+    ocr: bool,
+    previous: str | None,
+    word_timestamps: bool,
+    full_json: bool,
+    batch_tokens: int,
 ) -> None:
     """Extract knowledge from VIDEO for LLMs.
 
@@ -71,60 +234,42 @@ def main(
       vidwise https://youtube.com/watch?v=abc --model small
       vidwise https://loom.com/share/xyz --provider claude
     """
-    from vidwise.downloader import acquire_video, is_url
-    from vidwise.extractor import extract_all
-    from vidwise.transcriber import transcribe
+    from vidwise.pipeline import Pipeline
+    from vidwise.transcriber import WhisperOptions
 
-    # Check dependencies
-    if not check_dependency("ffmpeg", "brew install ffmpeg"):
-        raise SystemExit(1)
-    if is_url(source) and not check_dependency("yt-dlp", "brew install yt-dlp"):
-        raise SystemExit(1)
+    pipeline = Pipeline(
+        source,
+        output_dir,
+        whisper_model=model,
+        whisper_options=WhisperOptions(
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=whisper_workers,
+            batch_size=whisper_batch_size,
+        ),
+        word_timestamps=word_timestamps,
+        provider=None if no_guide else provider,
+        frame_interval=frame_interval,
+        frame_threshold=frame_threshold,
+        workers=workers,
+        frame_store=frame_store,
+        full_json=full_json,
+        batch_tokens=batch_tokens,
+        previous_dir=Path(previous) if previous else None,
+        ocr=ocr,
+    )
+    result = pipeline.run()
+    out = result.output_dir
 
-    # Resolve output directory
-    if output_dir:
-        out = Path(output_dir)
-    else:
-        out = format_output_dir(source)
-    out.mkdir(parents=True, exist_ok=True)
-    (out / "frames").mkdir(exist_ok=True)
-
-    print(f"Output: {out}\n")
-
-    # Step 1: Acquire video
-    video_path = acquire_video(source, out)
-    print(f"  Video: {video_path.name}\n")
-
-    # Step 2: Extract audio + frames (parallel)
-    audio_path, frame_paths = extract_all(video_path, out, interval=frame_interval)
-    print()
-
-    # Step 3: Transcribe
-    transcript_result = transcribe(audio_path, out, model_size=model)
-    print()
-
-    # Step 4: Generate guide (optional)
-    if not no_guide:
-        from vidwise.guide import detect_provider, generate_guide
-
-        ai_provider = detect_provider(provider)
-        if ai_provider:
-            generate_guide(
-                ai_provider,
-                frame_paths,
-                transcript_result,
-                out,
-                frame_threshold=frame_threshold,
-            )
-            print()
-        else:
-            print(
-                "No AI provider configured. Skipping guide generation.\n"
-                "Set ANTHROPIC_API_KEY or OPENAI_API_KEY to enable it,\n"
-                "or use the Claude Code plugin for free AI-powered guides (no API key needed):\n"
-                "  /plugin marketplace add jpdjere/vidwise\n"
-                "  /plugin install vidwise@vidwise\n"
-            )
+    if result.guide is None and not no_guide:
+        print(
+            "No AI provider configured. Skipping guide generation.\n"
+            "Set ANTHROPIC_API_KEY or OPENAI_API_KEY to enable it,\n"
+            "set VIDWISE_LOCAL_URL to use a local OpenAI-compatible server,\n"
+            "or use the Claude Code plugin for free AI-powered guides (no API key needed):\n"
+            "  /plugin marketplace add jpdjere/vidwise\n"
+            "  /plugin install vidwise@vidwise\n"
+        )
 
     # Summary
     print("Done! Output directory contents:")
@@ -142,5 +287,360 @@ def main(
                 print(f"  {f.name}  ({size} B)")
 
 
+@main.command()
+@click.option(
+    "--scenario", "-s",
+    "scenarios",
+    multiple=True,
+    type=click.Choice(["slides", "scrolling", "talking-head"]),
+    help="Synthetic video type (repeatable; default: all).",
+)
+@click.option(
+    "--duration", "-d",
+    "durations",
+    multiple=True,
+    type=click.IntRange(min=1),
+    help="Video length in seconds (repeatable; default: 30 and 120).",
+)
+@click.option(
+    "--whisper-model",
+    default="tiny",
+    show_default=True,
+    help="Whisper model to time transcription with.",
+)
+@click.option("--no-transcribe", is_flag=True, help="Skip the transcription stage.")
+@click.option(
+    "--frame-interval",
+    type=click.FloatRange(min=0, min_open=True),
+    default=2,
+    show_default=True,
+    help="Seconds between frame captures.",
+)
+@click.option("--repeat", type=click.IntRange(min=1), default=1, show_default=True,
+              help="Runs per case; the fastest time per stage is kept.")
+@click.option(
+    "--workdir",
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Where to keep generated videos and outputs (default: a temporary directory).",
+)
+@click.option(
+    "--output", "-o",
+    type=click.Path(dir_okay=False),
+    default="vidwise-bench.json",
+    show_default=True,
+    help="Where to write the JSON report.",
+)
+@click.option(
+    "--baseline",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Previous report to compare against; exits 1 on regressions.",
+)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Allowed slowdown per stage before it counts as a regression (0.25 = 25%).",
+)
+def bench(
+    scenarios: tuple[str, ...],
+    durations: tuple[int, ...],
+    whisper_model: str,
+    no_transcribe: bool,
+    frame_interval: float,
+    repeat: int,
+    workdir: str | None,
+    output: str,
+    baseline: str | None,
+    tolerance: float,
+) -> None:
+    """Benchmark the pipeline on synthetic videos generated with ffmpeg.
+
+    \b
+    Examples:
+      vidwise bench
+      vidwise bench -s slides -d 600 --no-transcribe
+      vidwise bench --baseline vidwise-bench.json -o current.json
+    """
+    import json
+    import tempfile
+
+    from vidwise.bench import compare, run_benchmarks, save_report
+
+    if not check_dependency("ffmpeg", "brew install ffmpeg"):
+        raise SystemExit(1)
+
+    with tempfile.TemporaryDirectory(prefix="vidwise-bench-") as tmp:
+        report = run_benchmarks(
+            Path(workdir) if workdir else Path(tmp),
+            list(scenarios) or ["slides", "scrolling", "talking-head"],
+            list(durations) or [30, 120],
+            whisper_model=None if no_transcribe else whisper_model,
+            interval=frame_interval,
+            repeat=repeat,
+        )
+    save_report(report, Path(output))
+    print(f"\nReport written to {output}")
+
+    if baseline:
+        regressions = compare(report, json.loads(Path(baseline).read_text()), tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print("No regressions against baseline.")
+
+
+_index_option = click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Index database (default: $VIDWISE_INDEX or ~/.vidwise/index.db).",
+)
+
+
+@main.command()
+@click.argument("roots", nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@_index_option
+def index(roots: tuple[str, ...], index_path: str | None) -> None:
+    """Add output directories to the search index.
+
+    Each ROOT is a vidwise output directory or a folder containing many.
+    Unchanged outputs are skipped, so re-running after new videos is cheap.
+
+    \b
+    Examples:
+      vidwise index ~/videos
+      vidwise index vidwise-abc123-2025-01-01
+    """
+    from vidwise.index import connect, default_index_path, update_index
+
+    db = Path(index_path) if index_path else default_index_path()
+    conn = connect(db)
+    try:
+        counts = update_index(conn, [Path(root) for root in roots])
+    finally:
+        conn.close()
+    summary = ", ".join(f"{n} {state}" for state, n in counts.items())
+    print(f"Indexed outputs in {db}: {summary}")
+
+
+@main.command()
+@click.argument("query")
+@_index_option
+@click.option("--limit", "-n", type=click.IntRange(min=1), default=20, show_default=True,
+              help="Maximum number of hits.")
+@click.option("--json", "as_json", is_flag=True, help="Print hits as JSON.")
+def search(query: str, index_path: str | None, limit: int, as_json: bool) -> None:
+    """Search indexed transcripts and frame descriptions.
+
+    QUERY uses SQLite FTS5 syntax: words, "exact phrases", prefix*, OR, NOT.
+
+    \b
+    Examples:
+      vidwise search "configure SSO"
+      vidwise search 'deploy* NOT staging' -n 5
+    """
+    import json
+    import time
+
+    from vidwise.index import connect, default_index_path
+    from vidwise.index import search as search_index
+    from vidwise.utils import timestamp_label
+
+    db = Path(index_path) if index_path else default_index_path()
+    if not db.exists():
+        print(f"Error: no index at {db}. Run 'vidwise index <dir>' first.", file=sys.stderr)
+        raise SystemExit(1)
+
+    conn = connect(db)
+    try:
+        start = time.perf_counter()
+        hits = search_index(conn, query, limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+
+    if as_json:
+        print(json.dumps([hit.to_dict() for hit in hits], indent=2))
+        return
+    for hit in hits:
+        at = timestamp_label(round(hit.start, 3))
+        frame = f"  {Path(hit.output) / hit.frame}" if hit.frame else ""
+        print(f"{hit.title} @ {at} [{hit.kind}]{frame}")
+        print(f"  {hit.snippet}")
+    print(f"{len(hits)} hit(s) in {elapsed_ms:.1f} ms")
+
+
+_queue_option = click.option(
+    "--queue",
+    "queue_path",
+    type=click.Path(dir_okay=False),
+    envvar="VIDWISE_QUEUE",
+    required=True,
+    help="Queue database on storage shared by all nodes ($VIDWISE_QUEUE).",
+)
+
+
+@main.command()
+@click.argument("sources", nargs=-1, required=True)
+@_queue_option
+@click.option("--output-root", "-o", type=click.Path(file_okay=False), default=".",
+              show_default=True, help="Shared directory the output directories are created in.")
+@click.option("--model", "-m", type=click.Choice(["tiny", "base", "small", "medium", "large"]),
+              default="medium", show_default=True, help="Whisper model size.")
+@click.option("--compute-type",
+              type=click.Choice(COMPUTE_TYPES),
+              default="default", show_default=True,
+              help="Whisper weight precision ('auto' tunes on each node).")
+@click.option("--no-guide", is_flag=True, help="Skip AI guide generation.")
+@click.option("--provider", "-p", type=click.Choice(["auto", "claude", "openai", "local"]),
+              default="auto", show_default=True,
+              help="AI provider for guide generation (resolved on each worker).")
+@click.option("--frame-interval", type=click.FloatRange(min=0, min_open=True), default=2,
+              show_default=True, help="Seconds between frame captures.")
+@click.option("--frame-threshold", type=float, default=0.05, show_default=True,
+              help="Pixel difference threshold for key frame selection (0.0-1.0).")
+@click.option("--frame-store", is_flag=True, help="Pack frames into one indexed file.")
+@click.option("--word-timestamps", is_flag=True, help="Transcribe with word timestamps.")
+@click.option("--ocr", is_flag=True, help="Read on-screen text of key frames locally.")
+@click.option("--batch-tokens", type=click.IntRange(min=1000), default=24000, show_default=True,
+              help="Estimated input token budget per AI request.")
+@click.option("--chunk-seconds", type=click.FloatRange(min=30), default=None,
+              help="Split transcription of longer videos into chunks of this length, "
+                   "each its own task.")
+@click.option("--attempts", type=click.IntRange(min=1), default=3, show_default=True,
+              help="Attempts per task before it is marked failed.")
+@click.option("--retry-failed", is_flag=True,
+              help="Requeue these videos' failed tasks with fresh attempts.")
+@click.option("--wait", is_flag=True, help="Wait for the queue to drain and report results.")
+def distribute(
+    sources: tuple[str, ...],
+    queue_path: str,
+    output_root: str,
+    model: str,
+    compute_type: str,
+    no_guide: bool,
+    provider: str,
+    frame_interval: float,
+    frame_threshold: float,
+    frame_store: bool,
+    word_timestamps: bool,
+    ocr: bool,
+    batch_tokens: int,
+    chunk_seconds: float | None,
+    attempts: int,
+    retry_failed: bool,
+    wait: bool,
+) -> None:
+    """Queue videos for workers on other nodes ('vidwise worker').
+
+    SOURCES, the queue and the output root must be reachable from every
+    worker; local files are queued by absolute path. Each video is written
+    to its own vidwise-<name>-<date> directory under the output root.
+    A source is queued once; use --retry-failed to run its failed tasks again.
+
+    \b
+    Examples:
+      vidwise distribute /shared/videos/*.mp4 --queue /shared/queue.db -o /shared/out
+      vidwise distribute talk.mp4 --queue /shared/queue.db --chunk-seconds 600 --wait
+      vidwise distribute /shared/videos/*.mp4 --queue /shared/queue.db --retry-failed
+    """
+    from vidwise.distributed import enqueue_videos, wait_for
+    from vidwise.transcriber import WhisperOptions
+    from vidwise.workqueue import WorkQueue
+
+    settings = {
+        "whisper_model": model,
+        "whisper_options": WhisperOptions(compute_type=compute_type),
+        "word_timestamps": word_timestamps,
+        "provider": None if no_guide else provider,
+        "frame_interval": frame_interval,
+        "frame_threshold": frame_threshold,
+        "frame_store": frame_store,
+        "batch_tokens": batch_tokens,
+        "ocr": ocr,
+    }
+    with WorkQueue(Path(queue_path)) as queue:
+        ids = enqueue_videos(
+            queue, list(sources), Path(output_root), settings,
+            chunk_seconds=chunk_seconds, max_attempts=attempts, retry_failed=retry_failed,
+        )
+        print(f"Queued {len(ids)} video(s) in {queue_path}")
+        if not wait:
+            print("Start workers with: vidwise worker --queue " + queue_path)
+            return
+        results = wait_for(queue, ids)
+
+    failed = [task for task in results if task["status"] == "failed"]
+    for task in results:
+        print(f"  [{task['status']}] {task['key']}")
+    if failed:
+        raise SystemExit(1)
+
+
+@main.command()
+@_queue_option
+@click.option("--lease", type=click.FloatRange(min=10), default=120, show_default=True,
+              help="Seconds a claimed task stays reserved without a heartbeat.")
+@click.option("--poll", type=click.FloatRange(min=0.1), default=5, show_default=True,
+              help="Seconds between checks of an empty queue.")
+@click.option("--exit-when-idle", is_flag=True,
+              help="Exit once no task is pending or running, instead of waiting for more.")
+@click.option("--max-tasks", type=click.IntRange(min=1), default=None,
+              help="Exit after running this many tasks.")
+def worker(
+    queue_path: str, lease: float, poll: float, exit_when_idle: bool, max_tasks: int | None
+) -> None:
+    """Run queued tasks from 'vidwise distribute' on this node.
+
+    Start any number of workers, on any number of machines. Tasks are
+    leased and kept alive with heartbeats; a task whose worker dies is
+    picked up by another, and failed tasks are retried.
+
+    \b
+    Examples:
+      vidwise worker --queue /shared/queue.db
+      VIDWISE_QUEUE=/shared/queue.db vidwise worker --exit-when-idle
+    """
+    from vidwise.distributed import run_worker
+
+    count = run_worker(
+        Path(queue_path), lease=lease, poll=poll, exit_when_idle=exit_when_idle,
+        max_tasks=max_tasks,
+    )
+    print(f"Ran {count} task(s)")
+
+
+@main.command("queue-status")
+@_queue_option
+@click.option("--json", "as_json", is_flag=True, help="Print every task as JSON.")
+def queue_status(queue_path: str, as_json: bool) -> None:
+    """Show the tasks in a distributed queue."""
+    import json
+
+    from vidwise.workqueue import WorkQueue
+
+    if not Path(queue_path).exists():
+        print(f"Error: no queue at {queue_path}.", file=sys.stderr)
+        raise SystemExit(1)
+    with WorkQueue(Path(queue_path)) as queue:
+        tasks = queue.tasks()
+        counts = queue.counts()
+    if as_json:
+        print(json.dumps(tasks, indent=2))
+        return
+    print(", ".join(f"{n} {status}" for status, n in counts.items()))
+    for task in tasks:
+        if task["status"] in ("running", "failed"):
+            detail = task["worker"] if task["status"] == "running" else task["error"]
+            last_line = ((detail or "").strip().splitlines() or [""])[-1]
+            print(f"  #{task['id']} {task['kind']} [{task['status']}] {task['key']}: {last_line}")
+
+
 if __name__ == "__main__":
     main()
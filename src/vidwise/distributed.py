@@ -0,0 +1,290 @@
+"""Distributed processing — a coordinator queues videos, workers on many nodes run them.
+
+The queue is a vidwise.workqueue file on storage every node can reach, and
+so are the sources (local files are queued by absolute path) and the output
+root. Each video becomes a ``video`` task that runs the whole pipeline into
+``<output root>/vidwise-<name>-<date>/``, the same layout ``vidwise``
+writes on one machine.
+
+With ``chunk_seconds``, transcription of long videos is spread too. The
+``video`` task only acquires the video and extracts audio and frames. It
+then queues one ``transcribe`` task per chunk of audio and a ``finish``
+task that waits for all of them. ``finish`` merges the chunk transcripts
+into the usual transcript files and writes the guide. Guide batches stay
+in ``finish``: they are planned from the merged transcript, and the
+overview needs every batch result.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import time
+import traceback
+from dataclasses import asdict
+from pathlib import Path
+
+from vidwise.errors import Cancelled, VidwiseError
+from vidwise.pipeline import Pipeline
+from vidwise.transcriber import WhisperOptions
+from vidwise.workqueue import LEASE_SECONDS, MAX_ATTEMPTS, Heartbeat, Task, WorkQueue
+
+logger = logging.getLogger(__name__)
+
+QUEUE_ENV = "VIDWISE_QUEUE"
+POLL_SECONDS = 5
+CHUNKS_DIR = "transcript-chunks"
+
+# Pipeline arguments that can be queued with a task (all JSON-serializable)
+PIPELINE_SETTINGS = (
+    "whisper_model", "whisper_options", "word_timestamps", "provider", "timeouts",
+    "frame_interval", "frame_threshold", "workers", "frame_store", "full_json",
+    "batch_tokens", "ocr",
+)
+
+
+def worker_name() -> str:
+    """This worker's name in the queue: host:pid."""
+    return f"{platform.node()}:{os.getpid()}"
+
+
+def enqueue_videos(
+    queue: WorkQueue,
+    sources: list[str],
+    output_root: Path,
+    settings: dict | None = None,
+    chunk_seconds: float | None = None,
+    max_attempts: int = MAX_ATTEMPTS,
+    retry_failed: bool = False,
+) -> list[int]:
+    """Queue one task per video; returns their ids.
+
+    settings are Pipeline keyword arguments (see PIPELINE_SETTINGS);
+    whisper_options may be given as a WhisperOptions. A source already
+    queued is not queued twice, on any day; with retry_failed, its failed
+    tasks (and those derived from it) are requeued instead.
+    """
+    from vidwise.downloader import is_url
+    from vidwise.utils import format_output_dir
+
+    settings = dict(settings or {})
+    unknown = set(settings) - set(PIPELINE_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown pipeline setting(s): {', '.join(sorted(unknown))}")
+    if isinstance(settings.get("whisper_options"), WhisperOptions):
+        settings["whisper_options"] = asdict(settings["whisper_options"])
+
+    ids = []
+    for source in sources:
+        if not is_url(source):
+            source = str(Path(source).resolve())
+        key = video_key(source)
+        output_dir = format_output_dir(source, base_dir=output_root.resolve())
+        payload = {
+            "source": source,
+            "key": key,
+            "output_dir": str(output_dir),
+            "settings": settings,
+            "chunk_seconds": chunk_seconds,
+            "max_attempts": max_attempts,
+        }
+        ids.append(queue.add("video", payload, key=key, max_attempts=max_attempts))
+    if retry_failed:
+        queue.requeue_failed(video_key_of(task) for task in queue.tasks(ids))
+    return ids
+
+
+def video_key(source: str) -> str:
+    """The queue key of a video task; derived tasks append "#<part>"."""
+    return f"video:{source}"
+
+
+def video_key_of(task: dict) -> str:
+    """The video key a task (as returned by WorkQueue.tasks) belongs to."""
+    return task["key"].split("#", 1)[0]
+
+
+def run_worker(
+    queue_path: Path,
+    worker: str | None = None,
+    lease: float = LEASE_SECONDS,
+    poll: float = POLL_SECONDS,
+    exit_when_idle: bool = False,
+    max_tasks: int | None = None,
+) -> int:
+    """Claim and run tasks until stopped; returns how many were run.
+
+    With exit_when_idle, returns once no task is pending or running.
+    Failed tasks are retried by the queue (on any worker); on Ctrl-C the
+    current task is given back without using up an attempt.
+    """
+    worker = worker or worker_name()
+    done = 0
+    with WorkQueue(queue_path) as queue:
+        logger.info(f"Worker {worker} polling {queue_path}")
+        while max_tasks is None or done < max_tasks:
+            task = queue.claim(worker, lease)
+            if task is None:
+                counts = queue.counts()
+                if exit_when_idle and not counts["pending"] and not counts["running"]:
+                    break
+                time.sleep(poll)
+                continue
+            run_task(queue, task, lease)
+            done += 1
+    return done
+
+
+def run_task(queue: WorkQueue, task: Task, lease: float = LEASE_SECONDS) -> None:
+    """Run one claimed task, then complete or fail it in the queue."""
+    payload = task.payload
+    pipeline = _pipeline(payload)
+    logger.info(f"[task {task.id}] {task.kind} {payload['source']} (attempt {task.attempts})")
+    heartbeat = Heartbeat(queue.path, task, lease, on_lost=pipeline.cancel)
+    try:
+        with heartbeat:
+            result = _HANDLERS[task.kind](queue, task, pipeline)
+    except KeyboardInterrupt:
+        queue.release(task)
+        raise
+    except Cancelled:
+        if heartbeat.lost:
+            logger.info(f"[task {task.id}] lease lost to another worker; stopped")
+            return
+        status = queue.fail(task, "cancelled")
+    except Exception as e:
+        message = str(e) if isinstance(e, VidwiseError) else traceback.format_exc()
+        status = queue.fail(task, message)
+    else:
+        if not queue.complete(task, result):
+            logger.info(f"[task {task.id}] finished, but its lease was lost; result discarded")
+        else:
+            logger.info(f"[task {task.id}] done")
+        return
+    logger.info(f"[task {task.id}] failed ({'will retry' if status == 'pending' else status})")
+
+
+def _pipeline(payload: dict) -> Pipeline:
+    settings = dict(payload["settings"])
+    if settings.get("whisper_options") is not None:
+        settings["whisper_options"] = WhisperOptions(**settings["whisper_options"])
+    return Pipeline(payload["source"], payload["output_dir"], **settings)
+
+
+def _run_video(queue: WorkQueue, task: Task, pipeline: Pipeline) -> dict:
+    """Process one video, or split its transcription into chunk tasks."""
+    chunk_seconds = task.payload.get("chunk_seconds")
+    if not chunk_seconds:
+        result = pipeline.run()
+        return {"guide": str(result.guide) if result.guide else None}
+
+    from vidwise.extractor import probe_duration
+
+    out = pipeline.prepare_output()
+    _, audio_path, frame_paths = pipeline.extract(out)
+    duration = probe_duration(audio_path)
+    if not duration or duration <= chunk_seconds:
+        transcript = pipeline.transcribe(out, audio_path)
+        guide = pipeline.guide(out, frame_paths, transcript)
+        return {"guide": str(guide) if guide else None}
+
+    max_attempts = task.payload.get("max_attempts", MAX_ATTEMPTS)
+    key = task.payload["key"]
+    chunk_ids = []
+    starts = [i * chunk_seconds for i in range(int(-(-duration // chunk_seconds)))]
+    for n, start in enumerate(starts):
+        end = min(start + chunk_seconds, duration)
+        chunk = {**task.payload, "audio": str(audio_path), "index": n, "start": start, "end": end}
+        chunk_ids.append(queue.add(
+            "transcribe", chunk, key=f"{key}#transcribe-{n}", max_attempts=max_attempts
+        ))
+    queue.add(
+        "finish", {**task.payload, "chunks": len(starts)}, key=f"{key}#finish",
+        after=chunk_ids, max_attempts=max_attempts,
+    )
+    logger.info(f"  Queued transcription of {len(starts)} chunk(s) of {chunk_seconds:g}s")
+    return {"chunks": len(starts)}
+
+
+def _run_transcribe(queue: WorkQueue, task: Task, pipeline: Pipeline) -> dict:
+    """Transcribe one audio chunk to transcript-chunks/NNNN.json."""
+    from vidwise.transcriber import transcribe_chunk
+
+    payload = task.payload
+    chunks_dir = Path(payload["output_dir"]) / CHUNKS_DIR
+    chunks_dir.mkdir(exist_ok=True)
+    result = transcribe_chunk(
+        Path(payload["audio"]),
+        payload["start"],
+        payload["end"],
+        chunks_dir,
+        model_size=pipeline.whisper_model,
+        control=pipeline.control("transcribe"),
+        options=pipeline.whisper_options,
+        word_timestamps=pipeline.word_timestamps,
+    )
+    path = chunks_dir / f"{payload['index']:04d}.json"
+    data = {**result, "segments": [seg.to_dict() for seg in result["segments"]]}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(path)  # Never leave a half-written chunk behind for finish
+    return {"segments": len(result["segments"])}
+
+
+def _run_finish(queue: WorkQueue, task: Task, pipeline: Pipeline) -> dict:
+    """Merge chunk transcripts into the output and write the guide."""
+    from vidwise.transcriber import load_transcript, merge_chunks, write_transcript
+
+    out = Path(task.payload["output_dir"])
+    chunks_dir = out / CHUNKS_DIR
+    chunks = [
+        load_transcript(chunks_dir / f"{n:04d}.json") for n in range(task.payload["chunks"])
+    ]
+    transcript = merge_chunks(chunks)
+    write_transcript(transcript, out)
+
+    guide = pipeline.guide(out, _saved_frames(out, pipeline.frame_store), transcript)
+    for path in chunks_dir.iterdir():
+        path.unlink()
+    chunks_dir.rmdir()
+    return {"guide": str(guide) if guide else None}
+
+
+def _saved_frames(out: Path, frame_store: bool) -> list[Path]:
+    """The frames a video task extracted into out, in time order."""
+    if frame_store:
+        from vidwise.framestore import FrameStore
+
+        return FrameStore(out).frames
+
+    from vidwise.extractor import MANIFEST_NAME
+
+    manifest = json.loads((out / MANIFEST_NAME).read_text())
+    return [out / "frames" / frame["file"] for frame in manifest["frames"]]
+
+
+_HANDLERS = {"video": _run_video, "transcribe": _run_transcribe, "finish": _run_finish}
+
+
+def wait_for(queue: WorkQueue, ids: list[int], poll: float = POLL_SECONDS) -> list[dict]:
+    """Block until no queued task is pending or running, logging progress.
+
+    Returns the final state of the tasks in ids and of the chunk and
+    finish tasks derived from them.
+    """
+    last = None
+    while True:
+        counts = queue.counts()
+        line = ", ".join(f"{n} {status}" for status, n in counts.items())
+        if line != last:
+            logger.info(f"  Queue: {line}")
+            last = line
+        if not counts["pending"] and not counts["running"]:
+            keys = {task["key"] for task in queue.tasks(ids)}
+            return [
+                task for task in queue.tasks()
+                if task["id"] in ids or (task["key"] and video_key_of(task) in keys)
+            ]
+        time.sleep(poll)
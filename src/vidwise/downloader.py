@@ -2,54 +2,80 @@
 
 from __future__ import annotations
 
+import logging
 import shutil
-import subprocess
-import sys
 from pathlib import Path
 
+from vidwise.errors import DependencyError, SourceError
+from vidwise.progress import StageControl
+from vidwise.runner import run_tool
+
+logger = logging.getLogger(__name__)
+
+# yt-dlp prints one line like this per progress update (--newline)
+PROGRESS_PREFIX = "vidwise-progress "
+PROGRESS_TEMPLATE = (
+    "download:" + PROGRESS_PREFIX
+    + "%(progress.downloaded_bytes)s %(progress.total_bytes)s %(progress.total_bytes_estimate)s"
+)
+
 
 def is_url(source: str) -> bool:
     """Check if source is a URL."""
     return source.startswith(("http://", "https://"))
 
 
-def download_video(source: str, output_dir: Path) -> Path:
+def download_video(source: str, output_dir: Path, control: StageControl | None = None) -> Path:
     """Download video from URL using yt-dlp.
 
     Returns the path to the downloaded video file.
     """
     if shutil.which("yt-dlp") is None:
-        print(
-            "Error: yt-dlp is required for URL downloads.\n"
-            "Install it: brew install yt-dlp  (or)  pip install yt-dlp",
-            file=sys.stderr,
+        raise DependencyError(
+            "yt-dlp is required for URL downloads.\n"
+            "Install it: brew install yt-dlp  (or)  pip install yt-dlp"
         )
-        raise SystemExit(1)
 
     output_template = str(output_dir / "video.%(ext)s")
     cmd = [
         "yt-dlp",
         "--no-playlist",
+        "--newline", "--progress", "--progress-template", PROGRESS_TEMPLATE,
         "-o", output_template,
         source,
     ]
 
-    print(f"Downloading video from {source}...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error downloading video:\n{result.stderr}", file=sys.stderr)
-        raise SystemExit(1)
+    logger.info(f"Downloading video from {source}...")
+
+    def on_stdout(line: str) -> None:
+        if control and line.startswith(PROGRESS_PREFIX):
+            _report_download(control, line[len(PROGRESS_PREFIX):])
+
+    run_tool(cmd, "downloading video", control, on_stdout)
 
     # Find the downloaded file (extension varies)
     video_files = list(output_dir.glob("video.*"))
     video_files = [f for f in video_files if f.suffix not in (".wav", ".srt", ".txt", ".json")]
     if not video_files:
-        print("Error: no video file found after download.", file=sys.stderr)
-        raise SystemExit(1)
+        raise SourceError("no video file found after download.")
 
     return video_files[0]
 
 
+def _report_download(control: StageControl, fields: str) -> None:
+    """Report 'downloaded total estimate' byte counts (NA when unknown)."""
+    values = []
+    for field in fields.split():
+        try:
+            values.append(float(field))
+        except ValueError:
+            values.append(None)
+    if len(values) != 3 or values[0] is None:
+        return
+    downloaded, total, estimate = values
+    control.update(downloaded, total or estimate)
+
+
 def copy_local_video(source: str, output_dir: Path) -> Path:
     """Copy a local video file into the output directory.
 
@@ -57,20 +83,19 @@ def copy_local_video(source: str, output_dir: Path) -> Path:
     """
     src = Path(source).expanduser().resolve()
     if not src.exists():
-        print(f"Error: file not found: {src}", file=sys.stderr)
-        raise SystemExit(1)
+        raise SourceError(f"file not found: {src}")
 
     dst = output_dir / f"video{src.suffix}"
     shutil.copy2(src, dst)
     return dst
 
 
-def acquire_video(source: str, output_dir: Path) -> Path:
+def acquire_video(source: str, output_dir: Path, control: StageControl | None = None) -> Path:
     """Acquire video from source (URL or local file).
 
     Returns the path to the video file inside output_dir.
     """
     if is_url(source):
-        return download_video(source, output_dir)
+        return download_video(source, output_dir, control)
     else:
         return copy_local_video(source, output_dir)
@@ -0,0 +1,44 @@
+"""Exceptions raised by the vidwise pipeline.
+
+Library code raises these instead of exiting; the CLI prints them and
+exits with status 1.
+"""
+
+from __future__ import annotations
+
+
+class VidwiseError(Exception):
+    """Base class for all vidwise errors."""
+
+
+class DependencyError(VidwiseError):
+    """A required external tool or Python package is missing."""
+
+
+class ToolError(VidwiseError):
+    """An external tool (ffmpeg, yt-dlp, ...) exited with an error."""
+
+    def __init__(self, message: str, stderr: str = ""):
+        super().__init__(f"{message}:\n{stderr}" if stderr else message)
+        self.stderr = stderr
+
+
+class SourceError(VidwiseError):
+    """The video source could not be found or downloaded."""
+
+
+class Cancelled(VidwiseError):
+    """The pipeline was cancelled."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"cancelled during {stage}")
+        self.stage = stage
+
+
+class StageTimeout(VidwiseError):
+    """A pipeline stage exceeded its time limit."""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"{stage} timed out after {timeout:g}s")
+        self.stage = stage
+        self.timeout = timeout
@@ -2,15 +2,33 @@
 
 from __future__ import annotations
 
-import subprocess
-import sys
+import json
+import logging
+import math
+import queue
+import re
+import struct
+import threading
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from vidwise.errors import VidwiseError
+from vidwise.progress import StageControl
+from vidwise.runner import FfmpegProgress, ToolProcess, run_tool
 from vidwise.utils import timestamp_label
 
+logger = logging.getLogger(__name__)
 
-def extract_audio(video_path: Path, output_dir: Path) -> Path:
+MANIFEST_NAME = "frames.manifest.json"
+THUMB_SIZE = (128, 72)  # Thumbnails key frame selection compares and hashes
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_SHOWINFO_PTS = re.compile(r"\bn:\s*\d+\s+pts:\s*-?\d+\s+pts_time:(-?[\d.]+)")
+
+
+def extract_audio(
+    video_path: Path, output_dir: Path, control: StageControl | None = None
+) -> Path:
     """Extract 16kHz mono WAV audio from video.
 
     Whisper expects 16kHz sample rate, mono channel.
@@ -18,6 +36,7 @@ def extract_audio(video_path: Path, output_dir: Path) -> Path:
     audio_path = output_dir / "audio.wav"
     cmd = [
         "ffmpeg",
+        *FfmpegProgress.ARGS,
         "-i", str(video_path),
         "-vn",
         "-acodec", "pcm_s16le",
@@ -27,62 +46,271 @@ def extract_audio(video_path: Path, output_dir: Path) -> Path:
         "-y",
     ]
 
-    print("Extracting audio...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error extracting audio:\n{result.stderr}", file=sys.stderr)
-        raise SystemExit(1)
+    logger.info("Extracting audio...")
+    progress = FfmpegProgress(control)
+    run_tool(cmd, "extracting audio", control, progress.stdout_line, progress.stderr_line)
 
     return audio_path
 
 
+def probe_duration(video_path: Path) -> float | None:
+    """Get the container duration in seconds with ffprobe (None if unknown)."""
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        str(video_path),
+    ]
+    try:
+        return float(run_tool(cmd, "probing duration").strip())
+    except (VidwiseError, ValueError):
+        return None
+
+
 def extract_frames(
-    video_path: Path, output_dir: Path, interval: int = 2
+    video_path: Path,
+    output_dir: Path,
+    interval: float = 2,
+    workers: int = 1,
+    control: StageControl | None = None,
 ) -> list[Path]:
     """Extract frames at the specified interval (seconds).
 
-    Frames are saved as frame_0m00s.png, frame_0m02s.png, etc.
+    Frames are named after their presentation timestamp as reported by
+    ffmpeg (frame_0m00s.png, frame_0m02s.png, or frame_0m00.500s.png for
+    sub-second timestamps) and written once under that name. The
+    file-to-timestamp mapping is also saved to frames.manifest.json.
+
+    With workers > 1, the timeline is split into that many ranges aligned to
+    the interval, and each range is decoded by its own ffmpeg process using
+    input seeking. Results are merged in timestamp order.
+
+    control, if given, receives progress in seconds of video decoded.
+
     Returns sorted list of frame paths.
     """
     frames_dir = output_dir / "frames"
     frames_dir.mkdir(exist_ok=True)
 
-    # Extract with sequential numbering first
-    cmd = [
-        "ffmpeg",
-        "-i", str(video_path),
-        "-vf", f"fps=1/{interval}",
-        str(frames_dir / "frame_%04d.png"),
-        "-y",
-    ]
+    ranges: list[tuple[float, float | None]] = [(0, None)]
+    duration = probe_duration(video_path) if workers > 1 or control else None
+    if workers > 1:
+        if duration:
+            ranges = split_timeline(duration, interval, workers)
+        else:
+            logger.warning("  Could not probe video duration; extracting frames serially")
+    progress = _FrameProgress(control, interval, duration)
+
+    if len(ranges) > 1:
+        logger.info(f"Extracting frames (every {interval}s, {len(ranges)} parallel ranges)...")
+    else:
+        logger.info(f"Extracting frames (every {interval}s)...")
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        parts = list(pool.map(
+            lambda r: _extract_range(video_path, frames_dir, interval, *r, progress), ranges
+        ))
+    extracted = [item for part in parts for item in part]
+
+    frames = [frame for _, frame in extracted]
+    manifest = [{"file": frame.name, "seconds": seconds} for seconds, frame in extracted]
+    (output_dir / MANIFEST_NAME).write_text(
+        json.dumps({"interval": interval, "frames": manifest})
+    )
+
+    logger.info(f"  Extracted {len(frames)} frames")
+    return frames
+
+
+def split_timeline(
+    duration: float, interval: float, parts: int
+) -> list[tuple[float, float | None]]:
+    """Split [0, duration) into up to `parts` (start, length) ranges.
+
+    Range starts are multiples of the interval so every range samples the
+    same frame grid as a single pass would. The last range runs to the end.
+    """
+    steps = math.ceil(duration / interval)
+    per_part = max(1, math.ceil(steps / parts))
+    count = math.ceil(steps / per_part)
+    span = per_part * interval
+    # Starts are computed from the frame index, not by adding up lengths, so
+    # float error can't shift later ranges off the frame grid
+    return [(i * per_part * interval, span if i + 1 < count else None) for i in range(count)]
+
 
-    print(f"Extracting frames (every {interval}s)...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        print(f"Error extracting frames:\n{result.stderr}", file=sys.stderr)
-        raise SystemExit(1)
+def _extract_range(
+    video_path: Path,
+    frames_dir: Path,
+    interval: float,
+    start: float,
+    length: float | None,
+    progress: _FrameProgress,
+) -> list[tuple[int | float, Path]]:
+    """Write the frames of one time range to frames_dir."""
+    frames = []
+    stream = stream_frames(
+        video_path, interval, start=start, length=length, control=progress.control
+    )
+    for seconds, png in stream:
+        # fps may emit a frame on the range's end; the next range owns it
+        if length is not None and seconds >= start + length:
+            continue
+        frame = frames_dir / f"frame_{timestamp_label(seconds)}.png"
+        frame.write_bytes(png)
+        frames.append((seconds, frame))
+        progress.advance()
+    return frames
 
-    # Rename to timestamp-based names
-    raw_frames = sorted(frames_dir.glob("frame_*.png"))
-    renamed = []
-    for i, frame in enumerate(raw_frames):
-        seconds = i * interval
-        new_name = frames_dir / f"frame_{timestamp_label(seconds)}.png"
-        frame.rename(new_name)
-        renamed.append(new_name)
 
-    print(f"  Extracted {len(renamed)} frames")
-    return renamed
+class _FrameProgress:
+    """Reports frame extraction progress, summed over parallel ranges."""
+
+    def __init__(self, control: StageControl | None, interval: float, duration: float | None):
+        self.control = control
+        self.interval = interval
+        self.duration = duration
+        self._decoded = 0.0
+        self._lock = threading.Lock()
+
+    def advance(self) -> None:
+        if self.control is None:
+            return
+        with self._lock:
+            self._decoded += self.interval
+            decoded = self._decoded
+        if self.duration:
+            decoded = min(decoded, self.duration)
+        self.control.update(decoded, self.duration)
+
+
+def stream_frames(
+    video_path: Path,
+    interval: float = 2,
+    thumbnails: Path | None = None,
+    start: float = 0,
+    length: float | None = None,
+    control: StageControl | None = None,
+) -> Iterator[tuple[int | float, bytes]]:
+    """Decode one frame per interval and yield (timestamp, png_bytes) pairs.
+
+    Timestamps are the presentation times ffmpeg's showinfo filter reports
+    for each output frame, so they stay exact even when the fps filter
+    drops or duplicates frames, or the interval is fractional.
+
+    start and length restrict decoding to part of the video using input
+    seeking; yielded timestamps are still relative to the whole video.
+
+    If thumbnails is given, the same pass also writes raw THUMB_SIZE RGB
+    thumbnails of every frame to that file.
+
+    ffmpeg is killed if control is cancelled or times out, or if the
+    consumer stops early.
+    """
+    seek = []
+    if start:
+        seek += ["-ss", f"{start:.3f}"]
+    if length is not None:
+        seek += ["-t", f"{length:.3f}"]
+    if thumbnails is None:
+        outputs = ["-vf", f"fps=1/{interval},showinfo"]
+        outputs += ["-f", "image2pipe", "-c:v", "png", "pipe:1"]
+    else:
+        outputs = [
+            "-filter_complex",
+            f"fps=1/{interval},showinfo,split=2[full][t];"
+            f"[t]scale={THUMB_SIZE[0]}:{THUMB_SIZE[1]}[thumb]",
+            "-map", "[full]", "-f", "image2pipe", "-c:v", "png", "pipe:1",
+            "-map", "[thumb]", "-f", "rawvideo", "-pix_fmt", "rgb24", str(thumbnails),
+        ]
+    cmd = ["ffmpeg", "-hide_banner", *seek, "-i", str(video_path), *outputs, "-y"]
+
+    timestamps: queue.Queue[float] = queue.Queue()
+
+    def on_stderr(line: str) -> bool:
+        match = _SHOWINFO_PTS.search(line)
+        if match:
+            timestamps.put(float(match.group(1)))
+        return bool(match)
+
+    with ToolProcess(cmd, control, on_stderr) as tool:
+        for png in _split_png_stream(tool.stdout):
+            pts_time = _next_timestamp(timestamps, tool)
+            if pts_time is None:
+                break
+            seconds = round(start + pts_time, 3)
+            yield (int(seconds) if seconds.is_integer() else seconds), png
+        tool.stdout.close()
+        tool.check("extracting frames")
+
+
+def _next_timestamp(timestamps: queue.Queue, tool: ToolProcess) -> float | None:
+    """The next showinfo timestamp, or None once ffmpeg's stderr has ended."""
+    while True:
+        try:
+            return timestamps.get(timeout=0.1)
+        except queue.Empty:
+            if tool.stderr_done.is_set() and timestamps.empty():
+                return None
+
+
+def _split_png_stream(stream) -> Iterator[bytes]:
+    """Yield complete PNG files from a concatenated PNG byte stream.
+
+    Raises VidwiseError if the stream ends inside a PNG.
+    """
+    while True:
+        signature = stream.read(8)
+        if not signature:
+            return
+        if signature != PNG_SIGNATURE:
+            raise VidwiseError("unexpected data in ffmpeg PNG stream")
+        parts = [signature]
+        while True:
+            header = _read_exactly(stream, 8)
+            length, chunk_type = struct.unpack(">I4s", header)
+            parts.append(header)
+            parts.append(_read_exactly(stream, length + 4))  # data + CRC
+            if chunk_type == b"IEND":
+                break
+        yield b"".join(parts)
+
+
+def _read_exactly(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise VidwiseError("ffmpeg PNG stream ended in the middle of a frame")
+    return data
 
 
 def extract_all(
-    video_path: Path, output_dir: Path, interval: int = 2
+    video_path: Path,
+    output_dir: Path,
+    interval: float = 2,
+    frame_store: bool = False,
+    workers: int = 1,
+    audio_control: StageControl | None = None,
+    frames_control: StageControl | None = None,
 ) -> tuple[Path, list[Path]]:
     """Run audio and frame extraction in parallel.
 
+    With frame_store=True, frames go into a compact FrameStore and are
+    returned as StoredFrames instead of loose PNG paths. workers > 1 splits
+    loose frame extraction across that many ffmpeg processes. The controls
+    report progress and allow cancelling each half.
+
     Returns (audio_path, list_of_frame_paths).
     """
     with ThreadPoolExecutor(max_workers=2) as pool:
-        audio_future = pool.submit(extract_audio, video_path, output_dir)
-        frames_future = pool.submit(extract_frames, video_path, output_dir, interval)
+        audio_future = pool.submit(extract_audio, video_path, output_dir, audio_control)
+        if frame_store:
+            from vidwise.framestore import extract_frames_to_store
+
+            frames_future = pool.submit(
+                extract_frames_to_store, video_path, output_dir, interval, frames_control
+            )
+        else:
+            frames_future = pool.submit(
+                extract_frames, video_path, output_dir, interval, workers, frames_control
+            )
         return audio_future.result(), frames_future.result()
@@ -2,10 +2,23 @@
 
 from __future__ import annotations
 
+import struct
+from collections.abc import Callable
 from pathlib import Path
 
+from vidwise.extractor import THUMB_SIZE
 from vidwise.utils import seconds_from_label
 
+# Rough token accounting used by the batch planner. Text is estimated at ~4
+# characters per token; every batch pays a fixed prompt overhead, and the
+# response needs room for a short description per frame.
+CHARS_PER_TOKEN = 4
+BATCH_PROMPT_TOKENS = 600
+FILENAME_TOKENS = 8
+OUTPUT_BASE_TOKENS = 250
+OUTPUT_TOKENS_PER_FRAME = 60
+SENTENCE_ENDINGS = (".", "!", "?", "…")
+
 
 def compute_frame_difference(frame_a: Path, frame_b: Path) -> float:
     """Compute normalized pixel difference between two frames.
@@ -13,19 +26,35 @@ def compute_frame_difference(frame_a: Path, frame_b: Path) -> float:
     Returns a value between 0.0 (identical) and 1.0 (completely different).
     Uses small thumbnails for fast comparison.
     """
+    return _difference(frame_thumbnail(frame_a), frame_thumbnail(frame_b))
+
+
+def frame_thumbnail(frame: Path):
+    """A frame's THUMB_SIZE RGB thumbnail, as a uint8 array.
+
+    Frames from a FrameStore use its stored thumbnails instead of decoding.
+    """
+    from vidwise.framestore import StoredFrame
+
+    if isinstance(frame, StoredFrame):
+        return frame.store.thumbnails[frame.index]
+
     from PIL import Image
     import numpy as np
 
-    size = (128, 72)  # Small thumbnail for speed
-    img_a = np.array(Image.open(frame_a).convert("RGB").resize(size), dtype=np.float32)
-    img_b = np.array(Image.open(frame_b).convert("RGB").resize(size), dtype=np.float32)
+    with Image.open(frame) as image:
+        return np.asarray(image.convert("RGB").resize(THUMB_SIZE))
+
+
+def _difference(thumb_a, thumb_b) -> float:
+    import numpy as np
 
-    diff = np.abs(img_a - img_b).mean() / 255.0
+    diff = np.abs(thumb_a.astype(np.float32) - thumb_b.astype(np.float32)).mean() / 255.0
     return float(diff)
 
 
 def select_key_frames(
-    frame_paths: list[Path], threshold: float = 0.05
+    frame_paths: list[Path], threshold: float = 0.05, thumbnails: dict | None = None
 ) -> list[Path]:
     """Select frames that show meaningful visual changes.
 
@@ -33,9 +62,11 @@ def select_key_frames(
     exceeds the threshold. Always keeps first and last frame.
 
     Args:
-        frame_paths: Sorted list of all frame paths.
+        frame_paths: Sorted list of all frame paths (or StoredFrames).
         threshold: Minimum pixel difference (0.0-1.0) to consider a frame "new".
                    Default 0.05 (5%) works well for most content.
+        thumbnails: If given, filled with the thumbnail of each key frame,
+                    keyed by name, so callers can reuse the decoded pixels.
 
     Returns:
         Filtered list of key frame paths.
@@ -43,14 +74,18 @@ def select_key_frames(
     if len(frame_paths) <= 2:
         return list(frame_paths)
 
+    # Every frame is decoded once; the last key frame's thumbnail is kept
+    last = frame_thumbnail(frame_paths[0])
     key_frames = [frame_paths[0]]
-    for frame in frame_paths[1:]:
-        diff = compute_frame_difference(key_frames[-1], frame)
-        if diff > threshold:
+    if thumbnails is not None:
+        thumbnails[frame_paths[0].name] = last
+    for i, frame in enumerate(frame_paths[1:], start=1):
+        thumb = frame_thumbnail(frame)
+        if _difference(last, thumb) > threshold or i == len(frame_paths) - 1:
             key_frames.append(frame)
-
-    if frame_paths[-1] not in key_frames:
-        key_frames.append(frame_paths[-1])
+            last = thumb
+            if thumbnails is not None:
+                thumbnails[frame.name] = thumb
 
     return key_frames
 
@@ -66,15 +101,194 @@ def batch_frames(key_frames: list[Path], max_per_batch: int = 10) -> list[list[P
     ]
 
 
-def time_range_for_batch(batch: list[Path], interval: int = 2) -> str:
-    """Get a human-readable time range for a batch of frames."""
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the token count of a piece of text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Estimate the token cost of an image (Anthropic's sizing rules).
+
+    Images are scaled down to fit 1568px on the long edge and ~1.15 megapixels,
+    then cost roughly width * height / 750 tokens. Degenerate sizes (a zero
+    or negative side) cost the minimum of 1 token.
+    """
+    if width <= 0 or height <= 0:
+        return 1
+    scale = min(1.0, 1568 / max(width, height), (1_150_000 / (width * height)) ** 0.5)
+    return max(1, int(width * scale) * int(height * scale) // 750)
+
+
+def png_size(frame: Path) -> tuple[int, int] | None:
+    """Read (width, height) from a PNG header without decoding the image."""
+    try:
+        with frame.open("rb") as f:
+            header = f.read(24)
+    except OSError:
+        return None
+    if len(header) < 24 or header[:8] != b"\x89PNG\r\n\x1a\n":
+        return None
+    return struct.unpack(">II", header[16:24])
+
+
+def plan_batches(
+    key_frames: list[Path],
+    segments: list[dict],
+    token_budget: int = 24000,
+    max_output_tokens: int = 2048,
+    image_tokens: Callable[[int, int], int] = estimate_image_tokens,
+    interval: float = 2,
+    frame_text: dict[str, str] | None = None,
+) -> list[list[Path]]:
+    """Group key frames into batches that fit a per-request token budget.
+
+    Each frame is charged for its image plus the transcript spoken between it
+    and the next key frame. Frames are packed until either the input budget or
+    the response budget (``max_output_tokens``) would overflow. When a batch has
+    to be closed, the cut is moved back to the nearest sentence or scene
+    boundary in the second half of the batch, so narration isn't split mid-way.
+
+    Args:
+        key_frames: Sorted list of key frame paths.
+        segments: Transcript segments (dicts with start, end, text).
+        token_budget: Maximum estimated input tokens per batch.
+        max_output_tokens: Response token limit of the provider.
+        image_tokens: Function mapping (width, height) to image token cost.
+        interval: Seconds between frame captures.
+        frame_text: On-screen text of frames sent as text instead of images,
+                    by filename; these are charged for the text only.
+
+    Returns:
+        List of batches, each a contiguous run of key frames.
+    """
+    if not key_frames:
+        return []
+
+    times = [seconds_from_label(f.stem) or 0 for f in key_frames]
+    costs = _frame_costs(key_frames, times, segments, image_tokens, interval, frame_text or {})
+    max_frames = max(1, (max_output_tokens - OUTPUT_BASE_TOKENS) // OUTPUT_TOKENS_PER_FRAME)
+
+    batches = []
+    start = 0
+    while start < len(key_frames):
+        used = BATCH_PROMPT_TOKENS
+        end = start
+        while end < len(key_frames) and end - start < max_frames:
+            if end > start and used + costs[end] > token_budget:
+                break
+            used += costs[end]
+            end += 1
+
+        if end < len(key_frames):
+            end = _best_cut(start, end, times, segments)
+        batches.append(key_frames[start:end])
+        start = end
+
+    return batches
+
+
+def _frame_costs(
+    key_frames: list[Path],
+    times: list[float],
+    segments: list[dict],
+    image_tokens: Callable[[int, int], int],
+    interval: float,
+    frame_text: dict[str, str],
+) -> list[int]:
+    """Estimate the input tokens each key frame adds to a batch."""
+    size = None
+    costs = []
+    seg_idx = 0
+    for i, frame in enumerate(key_frames):
+        if frame.name in frame_text:
+            cost = estimate_text_tokens(frame_text[frame.name])
+        else:
+            # Frames of one video share dimensions; only re-read if the first read failed
+            size = size or png_size(frame)
+            cost = image_tokens(*size) if size else image_tokens(1280, 720)
+        cost += FILENAME_TOKENS
+
+        # Charge each segment to the frame on screen when it starts
+        span_end = times[i + 1] if i + 1 < len(times) else times[i] + interval
+        while seg_idx < len(segments) and segments[seg_idx]["start"] < span_end:
+            cost += estimate_text_tokens(segments[seg_idx]["text"])
+            seg_idx += 1
+        costs.append(cost)
+
+    # Transcript after the last key frame belongs to the last batch
+    for seg in segments[seg_idx:]:
+        costs[-1] += estimate_text_tokens(seg["text"])
+    return costs
+
+
+def _best_cut(start: int, end: int, times: list[float], segments: list[dict]) -> int:
+    """Pick where to close the batch [start, end), preferring natural boundaries.
+
+    Candidates are cut points in the second half of the batch. A cut at a
+    sentence end beats one between segments, which beats one mid-segment;
+    ties go to the longest pause on screen, then to the fuller batch.
+    """
+    lowest = start + max(1, (end - start + 1) // 2)
+    best, best_score = end, None
+    for cut in range(lowest, end + 1):
+        t = times[cut]
+        score = (_sentence_score(segments, t), t - times[cut - 1], cut)
+        if best_score is None or score > best_score:
+            best, best_score = cut, score
+    return best
+
+
+def _sentence_score(segments: list[dict], t: float) -> int:
+    """Score how cleanly the transcript breaks at time t (0-2)."""
+    previous = None
+    for seg in segments:
+        if seg["start"] < t < seg["end"]:
+            return 0
+        if seg["end"] <= t:
+            previous = seg
+        else:
+            break
+    if previous is None or previous["text"].strip().endswith(SENTENCE_ENDINGS):
+        return 2
+    return 1
+
+
+def batch_bounds(
+    batches: list[list[Path]], interval: float = 2
+) -> list[tuple[float, float]]:
+    """Get the (start, end) seconds covered by each batch.
+
+    A batch runs until the next batch's first frame, so transcript spoken
+    between sparse key frames is never dropped. The last batch ends one
+    interval after its last frame.
+    """
+    starts = [seconds_from_label(batch[0].stem) or 0 for batch in batches]
+    bounds = []
+    for i, batch in enumerate(batches):
+        if i + 1 < len(batches):
+            end_s = starts[i + 1]
+        else:
+            end_s = (seconds_from_label(batch[-1].stem) or 0) + interval
+        bounds.append((starts[i], end_s))
+    return bounds
+
+
+def time_range_for_batch(
+    batch: list[Path], interval: float = 2, end_s: float | None = None
+) -> str:
+    """Get a human-readable time range for a batch of frames.
+
+    ``end_s`` overrides the default end of last frame plus one interval.
+    """
     if not batch:
         return "0:00 - 0:00"
 
     start_s = seconds_from_label(batch[0].stem)
-    end_s = seconds_from_label(batch[-1].stem) + interval
+    if end_s is None:
+        end_s = seconds_from_label(batch[-1].stem) + interval
 
-    def fmt(s: int) -> str:
+    def fmt(s: float) -> str:
+        s = int(s)
         return f"{s // 60}:{s % 60:02d}"
 
     return f"{fmt(start_s)} - {fmt(end_s)}"
@@ -0,0 +1,168 @@
+"""Compact frame store — one indexed pack file instead of thousands of PNGs.
+
+Layout inside the output directory:
+
+- ``frames.pack``        encoded PNG frames, back to back
+- ``frames.thumbs``      raw 128x72 RGB thumbnails, memory-mapped for key frame selection
+- ``frames.index.json``  label, timestamp, offset and length of every frame
+
+ffmpeg writes both streams in a single pass (full frames to a pipe, thumbnails
+straight to disk), so no loose files are created. Labels and timestamps come
+from ffmpeg's presentation timestamps, as for loose frames. Loose PNGs are exported
+only for frames that end up in the guide.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import mmap
+import threading
+from pathlib import Path
+
+from vidwise.extractor import THUMB_SIZE, probe_duration, stream_frames
+from vidwise.progress import StageControl
+from vidwise.utils import timestamp_label
+
+logger = logging.getLogger(__name__)
+
+PACK_NAME = "frames.pack"
+THUMBS_NAME = "frames.thumbs"
+INDEX_NAME = "frames.index.json"
+
+
+class StoredFrame:
+    """A frame inside a FrameStore, usable where frame paths are expected.
+
+    Provides the subset of the Path API the pipeline uses: ``name``,
+    ``stem``, ``read_bytes()`` and ``open()``.
+    """
+
+    __slots__ = ("store", "index", "name")
+
+    def __init__(self, store: FrameStore, index: int, name: str):
+        self.store = store
+        self.index = index
+        self.name = name
+
+    @property
+    def stem(self) -> str:
+        return self.name.rsplit(".", 1)[0]
+
+    def read_bytes(self) -> bytes:
+        return self.store.read(self.index)
+
+    def open(self, mode: str = "rb") -> io.BytesIO:
+        return io.BytesIO(self.read_bytes())
+
+    def export(self, directory: Path) -> Path:
+        """Write this frame as a loose PNG into directory (skipped if present)."""
+        path = directory / self.name
+        if not path.exists():
+            path.write_bytes(self.read_bytes())
+        return path
+
+    def __repr__(self) -> str:
+        return f"StoredFrame({self.name!r})"
+
+
+class FrameStore:
+    """Read access to a frame pack, its thumbnails and index.
+
+    The pack is memory-mapped on the first read and unmapped by close() (or
+    on leaving a ``with`` block); reading after close() maps it again.
+    """
+
+    def __init__(self, output_dir: Path):
+        import numpy as np
+
+        self.output_dir = output_dir
+        index = json.loads((output_dir / INDEX_NAME).read_text())
+        self.interval = index["interval"]
+        self._entries = index["frames"]
+        self.frames = [
+            StoredFrame(self, i, f"frame_{entry['label']}.png")
+            for i, entry in enumerate(self._entries)
+        ]
+
+        width, height = index["thumb_size"]
+        shape = (len(self._entries), height, width, 3)
+        if self._entries:
+            self.thumbnails = np.memmap(
+                output_dir / THUMBS_NAME, dtype=np.uint8, mode="r", shape=shape
+            )
+        else:
+            # Empty files can't be memory-mapped
+            self.thumbnails = np.zeros(shape, dtype=np.uint8)
+        self._pack: mmap.mmap | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> FrameStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def read(self, index: int) -> bytes:
+        """Encoded PNG bytes of frame ``index``."""
+        entry = self._entries[index]
+        with self._lock:
+            if self._pack is None:
+                with open(self.output_dir / PACK_NAME, "rb") as f:
+                    self._pack = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return self._pack[entry["offset"] : entry["offset"] + entry["length"]]
+
+    def export(self, frames: list[StoredFrame], directory: Path | None = None) -> list[Path]:
+        """Export frames as loose PNGs (default: the output's frames/ directory)."""
+        directory = directory or self.output_dir / "frames"
+        directory.mkdir(exist_ok=True)
+        return [frame.export(directory) for frame in frames]
+
+    def close(self) -> None:
+        """Unmap the pack; frames stay readable and map it again if read."""
+        with self._lock:
+            if self._pack is not None:
+                self._pack.close()
+                self._pack = None
+
+
+def extract_frames_to_store(
+    video_path: Path,
+    output_dir: Path,
+    interval: float = 2,
+    control: StageControl | None = None,
+) -> list[StoredFrame]:
+    """Extract frames into a FrameStore in one ffmpeg pass.
+
+    Returns the stored frames in timestamp order; close their store
+    (``frames[0].store``) once done reading them.
+    """
+    logger.info(f"Extracting frames into {PACK_NAME} (every {interval}s)...")
+    duration = probe_duration(video_path) if control else None
+    entries = []
+    offset = 0
+    with open(output_dir / PACK_NAME, "wb") as pack:
+        stream = stream_frames(video_path, interval, output_dir / THUMBS_NAME, control=control)
+        for seconds, png in stream:
+            if control:
+                control.update(min(seconds + interval, duration or seconds), duration)
+            pack.write(png)
+            entries.append({
+                "label": timestamp_label(seconds),
+                "seconds": seconds,
+                "offset": offset,
+                "length": len(png),
+            })
+            offset += len(png)
+
+    index = {
+        "version": 1,
+        "interval": interval,
+        "thumb_size": list(THUMB_SIZE),
+        "frames": entries,
+    }
+    (output_dir / INDEX_NAME).write_text(json.dumps(index))
+
+    logger.info(f"  Extracted {len(entries)} frames")
+    return FrameStore(output_dir).frames
@@ -2,19 +2,44 @@
 
 from __future__ import annotations
 
+import logging
 import os
-import sys
 from pathlib import Path
 
-from vidwise.frames import batch_frames, select_key_frames, time_range_for_batch
+from vidwise.frames import (
+    batch_bounds,
+    estimate_text_tokens,
+    plan_batches,
+    select_key_frames,
+    time_range_for_batch,
+)
+from vidwise.htmlguide import write_html_guide
+from vidwise.incremental import (
+    batch_record,
+    load_batches,
+    perceptual_hash,
+    plan_with_previous,
+    reuse_result,
+    save_batches,
+)
+from vidwise.ocr import ocr_context, ocr_frames
+from vidwise.overview import build_overview
+from vidwise.progress import StageControl
 from vidwise.providers.base import GuideProvider
-from vidwise.transcriber import segments_for_timerange, segments_to_text
-from vidwise.utils import seconds_from_label
+from vidwise.transcriber import (
+    segments_for_timerange,
+    segments_to_text,
+    transcript_for_timerange,
+    word_segments,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def detect_provider(preferred: str = "auto") -> GuideProvider | None:
     """Detect available AI provider based on env vars and preference.
 
+    In auto mode, API keys take precedence over a local server (VIDWISE_LOCAL_URL).
     Returns None if no provider is available.
     """
     anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -22,7 +47,7 @@ def detect_provider(preferred: str = "auto") -> GuideProvider | None:
 
     if preferred == "claude" or (preferred == "auto" and anthropic_key):
         if not anthropic_key:
-            print("Error: ANTHROPIC_API_KEY not set.", file=sys.stderr)
+            logger.error("ANTHROPIC_API_KEY not set.")
             return None
         from vidwise.providers.claude import ClaudeGuideProvider
 
@@ -30,12 +55,17 @@ def detect_provider(preferred: str = "auto") -> GuideProvider | None:
 
     if preferred == "openai" or (preferred == "auto" and openai_key):
         if not openai_key:
-            print("Error: OPENAI_API_KEY not set.", file=sys.stderr)
+            logger.error("OPENAI_API_KEY not set.")
             return None
         from vidwise.providers.openai import OpenAIGuideProvider
 
         return OpenAIGuideProvider()
 
+    if preferred == "local" or (preferred == "auto" and os.environ.get("VIDWISE_LOCAL_URL")):
+        from vidwise.providers.local import LocalGuideProvider
+
+        return LocalGuideProvider()
+
     return None
 
 
@@ -45,60 +75,168 @@ def generate_guide(
     transcript_result: dict,
     output_dir: Path,
     frame_threshold: float = 0.05,
+    frame_interval: float = 2,
+    batch_tokens: int = 24000,
+    previous_dir: Path | None = None,
+    ocr: bool = False,
+    control: StageControl | None = None,
+    record_batches: bool = True,
 ) -> Path:
     """Generate a visual markdown guide from frames and transcript.
 
-    1. Select key frames (skip near-identical ones)
-    2. Batch key frames for efficient API calls
-    3. Analyze each batch with the AI provider
+    1. Select key frames (skip near-identical ones), optionally OCR them
+    2. Batch key frames to fit the per-request token budget
+    3. Analyze each batch with the AI provider, or reuse the result of a
+       matching batch from previous_dir (see vidwise.incremental)
     4. Generate overview
     5. Assemble and write guide.md
 
+    With ocr, on-screen text is added to each batch's context, and frames
+    fully covered by their text are sent as text instead of images.
+
+    If the transcript has word timestamps, each batch gets exactly the words
+    spoken in its time window instead of every overlapping segment, and the
+    token reduction is reported.
+
+    With record_batches, batch records are saved to batches.json so later
+    runs can reuse them. Perceptual hashes of the key frames are only
+    computed for these records or to match previous_dir.
+    control, if given, gets progress per batch and is checked between
+    provider requests.
+
     Returns path to the generated guide.md.
     """
     segments = transcript_result.get("segments", [])
     full_text = transcript_result.get("text", "")
 
-    # Step 1: Key frame selection
-    print("Selecting key frames...")
-    key_frames = select_key_frames(frame_paths, threshold=frame_threshold)
-    print(f"  {len(key_frames)} key frames selected from {len(frame_paths)} total")
+    previous = load_batches(previous_dir) if previous_dir else []
+
+    # Step 1: Key frame selection, keeping thumbnails if frames will be hashed
+    logger.info("Selecting key frames...")
+    thumbnails = {} if previous or record_batches else None
+    key_frames = select_key_frames(
+        frame_paths, threshold=frame_threshold, thumbnails=thumbnails
+    )
+    logger.info(f"  {len(key_frames)} key frames selected from {len(frame_paths)} total")
+
+    frame_text = ocr_frames(key_frames) if ocr else {}
+    text_only = {name: t.text for name, t in frame_text.items() if t.covered}
+
+    # Step 2: Batch, reusing unchanged spans of a previous run if given
+    hashes = None
+    if thumbnails is not None:
+        hashes = [perceptual_hash(f, thumbnails.get(f.name)) for f in key_frames]
+
+    def plan(frames: list[Path], span_segments: list) -> list[list[Path]]:
+        return plan_batches(
+            frames,
+            word_segments(span_segments),
+            token_budget=batch_tokens,
+            max_output_tokens=provider.max_output_tokens,
+            image_tokens=provider.estimate_image_tokens,
+            interval=frame_interval,
+            frame_text=text_only,
+        )
 
-    # Step 2: Batch
-    batches = batch_frames(key_frames, max_per_batch=10)
+    if previous:
+        planned = plan_with_previous(
+            previous, key_frames, hashes, segments, plan, interval=frame_interval
+        )
+    else:
+        planned = [(batch, None) for batch in plan(key_frames, segments)]
+    batches = [batch for batch, _ in planned]
+    bounds = batch_bounds(batches, interval=frame_interval)
+    sliced_by_words = any(seg.get("words") is not None for seg in segments)
+    if sliced_by_words and bounds:
+        # Words are cut exactly at the bounds, so the last batch takes the rest
+        start_s, end_s = bounds[-1]
+        bounds[-1] = (start_s, max(end_s, max(seg["end"] for seg in segments)))
 
     # Step 3: Analyze each batch
-    print(f"Analyzing {len(batches)} segment(s)...")
+    reused = sum(record is not None for _, record in planned)
+    logger.info(f"Analyzing {len(batches) - reused} segment(s), reusing {reused}...")
     batch_results = []
-    for i, batch in enumerate(batches):
-        time_range = time_range_for_batch(batch)
-        start_s = seconds_from_label(batch[0].stem)
-        end_s = seconds_from_label(batch[-1].stem) + 2
-        transcript_text = segments_to_text(
-            segments_for_timerange(segments, start_s, end_s)
+    batch_transcripts = []
+    segment_level_tokens = 0
+    records = []
+    offset = 0
+    for i, ((batch, record), (start_s, end_s)) in enumerate(zip(planned, bounds)):
+        if control:
+            control.update(i, len(batches) + 1, f"segment {i + 1}/{len(batches)}")
+        time_range = time_range_for_batch(batch, interval=frame_interval, end_s=end_s)
+        transcript_text = transcript_for_timerange(segments, start_s, end_s)
+        segment_level_tokens += estimate_text_tokens(
+            segments_to_text(segments_for_timerange(segments, start_s, end_s))
         )
-        print(f"  Analyzing segment {i + 1}/{len(batches)}: {time_range}")
-        result = provider.analyze_batch(batch, transcript_text, time_range)
+        if record is not None:
+            logger.info(f"  Reusing segment {i + 1}/{len(batches)}: {time_range} (unchanged)")
+            result = reuse_result(record, batch)
+        else:
+            logger.info(f"  Analyzing segment {i + 1}/{len(batches)}: {time_range}")
+            images = [f for f in batch if f.name not in text_only]
+            context = "\n\n".join(
+                part for part in (transcript_text, ocr_context(batch, frame_text)) if part
+            )
+            result = provider.analyze_batch(images, context, time_range)
         batch_results.append(result)
-
-    # Step 4: Generate overview
-    print("Generating overview...")
-    overview = provider.generate_overview(batch_results, full_text)
+        batch_transcripts.append(transcript_text)
+        if record_batches:
+            batch_hashes = hashes[offset : offset + len(batch)]
+            records.append(batch_record(batch, batch_hashes, time_range, transcript_text, result))
+        offset += len(batch)
+
+    if record_batches:
+        save_batches(output_dir, records)
+    if sliced_by_words:
+        _report_word_slicing(segment_level_tokens, batch_transcripts)
+
+    # Frames kept in a FrameStore are only written out if the guide shows them
+    _export_referenced_frames(key_frames, batch_results, output_dir / "frames")
+
+    # Step 4: Generate overview (condensed hierarchically for long videos)
+    if control:
+        control.update(len(batches), len(batches) + 1, "overview")
+    logger.info("Generating overview...")
+    overview = build_overview(provider, batch_results, batch_transcripts, full_text)
 
     # Step 5: Assemble markdown and HTML
     guide_content = _assemble_markdown(overview, batch_results)
     guide_path = output_dir / "guide.md"
     guide_path.write_text(guide_content)
 
-    html_content = _assemble_html(overview, batch_results)
-    html_path = output_dir / "guide.html"
-    html_path.write_text(html_content)
+    html_path = write_html_guide(overview, batch_results, output_dir)
 
-    print(f"  Guide written to {guide_path}")
-    print(f"  HTML guide written to {html_path}")
+    logger.info(f"  Guide written to {guide_path}")
+    logger.info(f"  HTML guide written to {html_path}")
+    logger.info(f"  Token usage: {provider.usage.summary()}")
     return guide_path
 
 
+def _report_word_slicing(segment_level_tokens: int, batch_transcripts: list[str]) -> None:
+    """Log how many transcript tokens word-level slicing saved."""
+    word_level_tokens = sum(estimate_text_tokens(text) for text in batch_transcripts)
+    saved = segment_level_tokens - word_level_tokens
+    share = saved / segment_level_tokens if segment_level_tokens else 0
+    logger.info(
+        f"  Word timestamps: {word_level_tokens} transcript tokens instead of "
+        f"{segment_level_tokens} ({saved} fewer, {share:.0%})"
+    )
+
+
+def _export_referenced_frames(
+    key_frames: list[Path], batch_results: list[dict], frames_dir: Path
+) -> None:
+    """Write loose PNGs for stored frames that the batch results reference."""
+    from vidwise.framestore import StoredFrame
+
+    referenced = {
+        kf.get("filename") for result in batch_results for kf in result.get("key_frames", [])
+    }
+    stored = [f for f in key_frames if isinstance(f, StoredFrame) and f.name in referenced]
+    if stored:
+        stored[0].store.export(stored, frames_dir)
+
+
 def _assemble_markdown(overview: dict, batch_results: list[dict]) -> str:
     """Build the final markdown guide string."""
     lines = []
@@ -143,77 +281,3 @@ def _assemble_markdown(overview: dict, batch_results: list[dict]) -> str:
         lines.append("")
 
     return "\n".join(lines)
-
-
-def _html_escape(text: str) -> str:
-    """Escape HTML special characters."""
-    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-
-def _assemble_html(overview: dict, batch_results: list[dict]) -> str:
-    """Build a self-contained HTML guide with embedded dark theme."""
-    title = _html_escape(overview.get("title", "Video Guide"))
-    overview_text = _html_escape(overview.get("overview", ""))
-
-    parts = []
-    parts.append(f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{title}</title>
-<style>
-  body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 860px; margin: 0 auto; padding: 40px 24px; background: #0d1117; color: #e6edf3; line-height: 1.6; }}
-  h1 {{ color: #58a6ff; border-bottom: 1px solid #30363d; padding-bottom: 12px; font-size: 28px; }}
-  h2 {{ color: #79c0ff; margin-top: 32px; font-size: 20px; }}
-  h3 {{ color: #d2a8ff; margin-top: 24px; font-size: 17px; }}
-  img {{ max-width: 100%; border-radius: 8px; margin: 12px 0; border: 1px solid #30363d; }}
-  hr {{ border: none; border-top: 1px solid #21262d; margin: 28px 0; }}
-  ul {{ padding-left: 24px; }}
-  li {{ margin: 4px 0; }}
-  p {{ margin: 8px 0; }}
-  .badge {{ display: inline-block; background: #1f6feb; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-bottom: 16px; }}
-</style>
-</head>
-<body>
-
-<h1>{title}</h1>
-<span class="badge">Generated by vidwise</span>
-
-<h2>Overview</h2>
-<p>{overview_text}</p>
-<hr>
-""")
-
-    for result in batch_results:
-        summary = result.get("summary", "")
-        narrative = result.get("narrative", "")
-        key_frames = result.get("key_frames", [])
-
-        if summary:
-            parts.append(f"<h3>{_html_escape(summary)}</h3>")
-
-        for kf in key_frames:
-            filename = kf.get("filename", "")
-            description = kf.get("description", "")
-            if filename:
-                alt = _html_escape(description) if description else ""
-                parts.append(f'<img src="frames/{filename}" alt="{alt}">')
-            if description:
-                parts.append(f"<p>{_html_escape(description)}</p>")
-
-        if narrative:
-            parts.append(f"<p>{_html_escape(narrative)}</p>")
-
-        parts.append("<hr>")
-
-    takeaways = overview.get("key_takeaways", [])
-    if takeaways:
-        parts.append("<h2>Key Takeaways</h2>\n<ul>")
-        for t in takeaways:
-            parts.append(f"  <li>{_html_escape(t)}</li>")
-        parts.append("</ul>")
-
-    parts.append("\n</body>\n</html>")
-
-    return "\n".join(parts)
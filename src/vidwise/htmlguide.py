@@ -0,0 +1,256 @@
+"""HTML guide — lazy-loaded thumbnails, split into chapter pages when long.
+
+Every frame in the guide is shown as a WebP thumbnail as wide as the page
+body, with ``loading="lazy"``; its ``srcset`` also lists the full-size PNG,
+so the browser only downloads full frames on high-density screens or when
+a frame is clicked. Thumbnails are written to ``thumbs/`` and named by the
+SHA-256 of the frame, so re-assembling a guide reuses them.
+
+Guides with more than SECTIONS_PER_PAGE sections are split into chapter
+pages (guide-01.html, ...) linked from a table of contents in guide.html.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from vidwise.frames import png_size
+
+logger = logging.getLogger(__name__)
+
+THUMBS_DIR = "thumbs"
+CONTENT_WIDTH = 860  # max-width of the page body, in CSS pixels
+THUMB_WIDTH = CONTENT_WIDTH  # narrower thumbnails lose to the PNG in srcset
+THUMB_QUALITY = 75
+SECTIONS_PER_PAGE = 20
+
+_STYLE = """\
+  body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 860px; margin: 0 auto; padding: 40px 24px; background: #0d1117; color: #e6edf3; line-height: 1.6; }
+  h1 { color: #58a6ff; border-bottom: 1px solid #30363d; padding-bottom: 12px; font-size: 28px; }
+  h2 { color: #79c0ff; margin-top: 32px; font-size: 20px; }
+  h3 { color: #d2a8ff; margin-top: 24px; font-size: 17px; }
+  a { color: #58a6ff; }
+  img { width: 100%; height: auto; border-radius: 8px; margin: 12px 0; border: 1px solid #30363d; }
+  hr { border: none; border-top: 1px solid #21262d; margin: 28px 0; }
+  ul { padding-left: 24px; }
+  li { margin: 4px 0; }
+  p { margin: 8px 0; }
+  nav { display: flex; justify-content: space-between; margin: 16px 0; }
+  .badge { display: inline-block; background: #1f6feb; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px; margin-bottom: 16px; }"""
+
+
+@dataclass
+class Thumbnail:
+    """A frame's thumbnail path (relative to the output dir) and sizes."""
+
+    path: str
+    width: int
+    height: int
+    full_width: int
+
+
+def make_thumbnails(
+    frames_dir: Path, filenames: list[str], output_dir: Path, max_workers: int = 4
+) -> dict[str, Thumbnail]:
+    """Write WebP thumbnails for frames, skipping ones already generated.
+
+    Returns a Thumbnail per filename; frames that don't exist or can't be
+    thumbnailed are left out, and the guide shows their full PNG instead.
+    """
+    thumbs_dir = output_dir / THUMBS_DIR
+    thumbs_dir.mkdir(exist_ok=True)
+    existing = [name for name in dict.fromkeys(filenames) if (frames_dir / name).exists()]
+
+    def thumbnail(name: str) -> tuple[str, Thumbnail | None]:
+        return name, _thumbnail(frames_dir / name, thumbs_dir)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return {name: thumb for name, thumb in pool.map(thumbnail, existing) if thumb}
+
+
+def _thumbnail(frame: Path, thumbs_dir: Path) -> Thumbnail | None:
+    size = png_size(frame)
+    if size is None:
+        return None
+    full_width, full_height = size
+    width = min(THUMB_WIDTH, full_width)
+    height = max(1, round(full_height * width / full_width))
+
+    digest = hashlib.sha256(frame.read_bytes()).hexdigest()
+    path = thumbs_dir / f"{digest}.webp"
+    if not path.exists():
+        from PIL import Image
+
+        tmp = path.with_suffix(".tmp")
+        try:
+            with Image.open(frame) as image:
+                image.convert("RGB").resize((width, height), Image.LANCZOS).save(
+                    tmp, "WEBP", quality=THUMB_QUALITY, method=4
+                )
+        except (OSError, KeyError, ValueError) as e:  # Unreadable frame, or no WebP support
+            tmp.unlink(missing_ok=True)
+            logger.warning(f"  No thumbnail for {frame.name}: {e}")
+            return None
+        tmp.replace(path)
+    return Thumbnail(f"{THUMBS_DIR}/{path.name}", width, height, full_width)
+
+
+def write_html_guide(overview: dict, batch_results: list[dict], output_dir: Path) -> Path:
+    """Write guide.html (plus chapter pages for long guides).
+
+    Chapter pages left over from a previous, longer guide are removed.
+    Returns the path of guide.html.
+    """
+    filenames = [
+        kf["filename"]
+        for result in batch_results
+        for kf in result.get("key_frames", [])
+        if kf.get("filename")
+    ]
+    thumbs = make_thumbnails(output_dir / "frames", filenames, output_dir)
+
+    sections = batch_results
+    chapters = [
+        sections[i : i + SECTIONS_PER_PAGE] for i in range(0, len(sections), SECTIONS_PER_PAGE)
+    ]
+    title = overview.get("title", "Video Guide")
+    index_path = output_dir / "guide.html"
+    pages = [f"guide-{n:02d}.html" for n in range(1, len(chapters) + 1)]
+    if len(pages) == 1:
+        pages = []
+    for stale in output_dir.glob("guide-[0-9][0-9]*.html"):
+        if stale.name not in pages:
+            stale.unlink()
+
+    if len(chapters) <= 1:
+        body = [_header(overview), _toc([(None, sections)])]
+        body += [_section(result, i, thumbs) for i, result in enumerate(sections)]
+        body.append(_takeaways(overview))
+        index_path.write_text(_page(title, body))
+        return index_path
+
+    body = [_header(overview), _toc(list(zip(pages, chapters))), _takeaways(overview)]
+    index_path.write_text(_page(title, body))
+
+    first = 0
+    for n, (page, chapter) in enumerate(zip(pages, chapters)):
+        nav = _nav(pages[n - 1] if n else None, pages[n + 1] if n + 1 < len(pages) else None)
+        body = [f"<h1>{_escape(title)}</h1>", f"<h2>Part {n + 1} of {len(pages)}</h2>", nav]
+        body += [_section(result, first + i, thumbs) for i, result in enumerate(chapter)]
+        body.append(nav)
+        (output_dir / page).write_text(_page(f"{title} — Part {n + 1}", body))
+        first += len(chapter)
+    return index_path
+
+
+def _escape(text: str) -> str:
+    return html.escape(text, quote=True)
+
+
+def _page(title: str, body: list[str]) -> str:
+    content = "\n".join(part for part in body if part)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{_escape(title)}</title>
+<style>
+{_STYLE}
+</style>
+</head>
+<body>
+
+{content}
+
+</body>
+</html>
+"""
+
+
+def _header(overview: dict) -> str:
+    title = _escape(overview.get("title", "Video Guide"))
+    return (
+        f"<h1>{title}</h1>\n"
+        '<span class="badge">Generated by vidwise</span>\n\n'
+        f"<h2>Overview</h2>\n<p>{_escape(overview.get('overview', ''))}</p>\n<hr>"
+    )
+
+
+def _toc(chapters: list[tuple[str | None, list[dict]]]) -> str:
+    """Table of contents; page is None when sections are on this page."""
+    if sum(len(sections) for _, sections in chapters) < 2:
+        return ""
+    parts = ["<h2>Contents</h2>"]
+    first = 0
+    for n, (page, sections) in enumerate(chapters):
+        href = page or ""
+        if page:
+            parts.append(f'<h3><a href="{href}">Part {n + 1}</a></h3>')
+        parts.append("<ul>")
+        for i, result in enumerate(sections, first):
+            label = _escape(result.get("summary") or f"Section {i + 1}")
+            parts.append(f'  <li><a href="{href}#section-{i + 1}">{label}</a></li>')
+        parts.append("</ul>")
+        first += len(sections)
+    parts.append("<hr>")
+    return "\n".join(parts)
+
+
+def _section(result: dict, index: int, thumbs: dict[str, Thumbnail]) -> str:
+    parts = []
+    summary = result.get("summary", "")
+    if summary:
+        parts.append(f'<h3 id="section-{index + 1}">{_escape(summary)}</h3>')
+    else:
+        parts.append(f'<a id="section-{index + 1}"></a>')
+
+    for kf in result.get("key_frames", []):
+        filename = kf.get("filename", "")
+        description = kf.get("description", "")
+        if filename:
+            parts.append(_image(filename, description, thumbs.get(filename)))
+        if description:
+            parts.append(f"<p>{_escape(description)}</p>")
+
+    narrative = result.get("narrative", "")
+    if narrative:
+        parts.append(f"<p>{_escape(narrative)}</p>")
+    parts.append("<hr>")
+    return "\n".join(parts)
+
+
+def _image(filename: str, description: str, thumb: Thumbnail | None) -> str:
+    full = _escape(f"frames/{filename}")
+    alt = _escape(description)
+    if thumb is None:
+        return f'<img src="{full}" alt="{alt}" loading="lazy">'
+    return (
+        f'<a href="{full}"><img src="{thumb.path}" '
+        f'srcset="{thumb.path} {thumb.width}w, {full} {thumb.full_width}w" '
+        f'sizes="(max-width: {CONTENT_WIDTH}px) 100vw, {CONTENT_WIDTH}px" '
+        f'width="{thumb.width}" height="{thumb.height}" '
+        f'loading="lazy" decoding="async" alt="{alt}"></a>'
+    )
+
+
+def _nav(previous: str | None, following: str | None) -> str:
+    links = ['<a href="guide.html">Contents</a>']
+    if previous:
+        links.insert(0, f'<a href="{previous}">← Previous</a>')
+    if following:
+        links.append(f'<a href="{following}">Next →</a>')
+    return "<nav>" + " ".join(links) + "</nav>"
+
+
+def _takeaways(overview: dict) -> str:
+    takeaways = overview.get("key_takeaways", [])
+    if not takeaways:
+        return ""
+    items = "\n".join(f"  <li>{_escape(t)}</li>" for t in takeaways)
+    return f"<h2>Key Takeaways</h2>\n<ul>\n{items}\n</ul>"
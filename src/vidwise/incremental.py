@@ -0,0 +1,199 @@
+"""Incremental re-analysis — reuse batch results from a previous run.
+
+generate_guide records every batch it analyzes in batches.json: the
+perceptual hash of each frame, the transcript it was analyzed with, and the
+provider's result. When a video is re-recorded with only a few changes, new
+key frames are aligned against those records. A run of new frames that
+matches a previous batch frame by frame (within a Hamming distance), with a
+similar transcript, reuses that batch's result; only the remaining spans are
+sent to the provider.
+"""
+
+from __future__ import annotations
+
+import difflib
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+from vidwise.utils import seconds_from_label
+
+BATCHES_NAME = "batches.json"
+HASH_DISTANCE = 6  # Max differing bits (of 64) for two frames to count as the same
+TEXT_SIMILARITY = 0.9
+
+
+def perceptual_hash(frame: Path, thumbnail=None) -> int:
+    """64-bit difference hash (dHash) of a frame.
+
+    Robust to re-encoding and small rendering differences, unlike a byte hash.
+    Computed from the frame's key-frame selection thumbnail; pass it as
+    thumbnail (see select_key_frames) to skip decoding the frame again.
+    """
+    from PIL import Image
+
+    if thumbnail is None:
+        from vidwise.frames import frame_thumbnail
+
+        thumbnail = frame_thumbnail(frame)
+    pixels = Image.fromarray(thumbnail).convert("L").resize((9, 8)).tobytes()
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            bits = (bits << 1) | (left > pixels[row * 9 + col + 1])
+    return bits
+
+
+def hash_distance(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return (a ^ b).bit_count()
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Word-level similarity ratio of two transcript snippets (0.0-1.0)."""
+    if a == b:
+        return 1.0
+    matcher = difflib.SequenceMatcher(None, a.split(), b.split(), autojunk=False)
+    bound = matcher.real_quick_ratio()
+    if bound < TEXT_SIMILARITY:
+        return bound
+    return matcher.ratio()
+
+
+def load_batches(output_dir: Path) -> list[dict]:
+    """Load recorded batches from a previous output directory (empty if none)."""
+    path = output_dir / BATCHES_NAME
+    if not path.exists():
+        return []
+    records = json.loads(path.read_text())["batches"]
+    for record in records:
+        record["hashes"] = [int(frame["hash"], 16) for frame in record["frames"]]
+    return records
+
+
+def save_batches(output_dir: Path, records: list[dict]) -> None:
+    """Write batch records: frames with hashes, transcript, and result."""
+    (output_dir / BATCHES_NAME).write_text(json.dumps({"version": 1, "batches": records}))
+
+
+def batch_record(
+    batch: list[Path], hashes: list[int], time_range: str, transcript_text: str, result: dict
+) -> dict:
+    """Build the batches.json record for one analyzed batch."""
+    return {
+        "time_range": time_range,
+        "frames": [{"name": f.name, "hash": f"{h:016x}"} for f, h in zip(batch, hashes)],
+        "transcript": transcript_text,
+        "result": result,
+    }
+
+
+def align(
+    previous: list[dict],
+    hashes: list[int],
+    span_text: Callable[[int, int], str],
+    max_distance: int = HASH_DISTANCE,
+    min_similarity: float = TEXT_SIMILARITY,
+) -> list[tuple[int, int, dict | None]]:
+    """Split new key frames into reusable and changed spans.
+
+    Args:
+        previous: Batch records from load_batches.
+        hashes: Perceptual hashes of the new key frames, in order.
+        span_text: Returns the new transcript for key frames [start, end).
+        max_distance: Max Hamming distance per frame pair.
+        min_similarity: Min transcript similarity for a span to be reused.
+
+    Returns:
+        Contiguous (start, end, record) spans covering all key frames, where
+        record is the matching previous batch, or None if the span changed.
+    """
+    spans: list[tuple[int, int, dict | None]] = []
+    changed_start = None
+    i = 0
+    while i < len(hashes):
+        match = _match_at(previous, hashes, i, span_text, max_distance, min_similarity)
+        if match is None:
+            if changed_start is None:
+                changed_start = i
+            i += 1
+            continue
+        if changed_start is not None:
+            spans.append((changed_start, i, None))
+            changed_start = None
+        end = i + len(match["hashes"])
+        spans.append((i, end, match))
+        i = end
+    if changed_start is not None:
+        spans.append((changed_start, len(hashes), None))
+    return spans
+
+
+def _match_at(
+    previous: list[dict],
+    hashes: list[int],
+    start: int,
+    span_text: Callable[[int, int], str],
+    max_distance: int,
+    min_similarity: float,
+) -> dict | None:
+    """Find a previous batch whose frames match the new frames starting at start."""
+    for record in previous:
+        old = record["hashes"]
+        end = start + len(old)
+        if not old or end > len(hashes):
+            continue
+        if any(hash_distance(a, b) > max_distance for a, b in zip(old, hashes[start:end])):
+            continue
+        if text_similarity(record["transcript"], span_text(start, end)) >= min_similarity:
+            return record
+    return None
+
+
+def reuse_result(record: dict, batch: list[Path]) -> dict:
+    """Copy a previous batch result, renaming its frames to the new batch's names."""
+    renames = {frame["name"]: new.name for frame, new in zip(record["frames"], batch)}
+    result = dict(record["result"])
+    result["key_frames"] = [
+        {**kf, "filename": renames[kf.get("filename")]}
+        for kf in result.get("key_frames", [])
+        if kf.get("filename") in renames
+    ]
+    return result
+
+
+def plan_with_previous(
+    previous: list[dict],
+    key_frames: list[Path],
+    hashes: list[int],
+    segments: list,
+    plan: Callable[[list[Path], list], list[list[Path]]],
+    interval: float = 2,
+) -> list[tuple[list[Path], dict | None]]:
+    """Batch key frames, reusing previous batches for unchanged spans.
+
+    Changed spans are batched with ``plan(frames, segments)``, given only the
+    transcript segments of that span.
+
+    Returns (batch, previous_record_or_None) pairs in video order.
+    """
+    from vidwise.transcriber import segments_for_timerange, transcript_for_timerange
+
+    times = [seconds_from_label(f.stem) or 0 for f in key_frames]
+
+    def span_seconds(start: int, end: int) -> tuple[float, float]:
+        end_s = times[end] if end < len(times) else times[-1] + interval
+        return times[start], end_s
+
+    def span_text(start: int, end: int) -> str:
+        return transcript_for_timerange(segments, *span_seconds(start, end))
+
+    planned: list[tuple[list[Path], dict | None]] = []
+    for start, end, record in align(previous, hashes, span_text):
+        if record is not None:
+            planned.append((key_frames[start:end], record))
+            continue
+        span_segments = segments_for_timerange(segments, *span_seconds(start, end))
+        planned.extend((batch, None) for batch in plan(key_frames[start:end], span_segments))
+    return planned
@@ -0,0 +1,269 @@
+"""Full-text index across processed videos (SQLite FTS5).
+
+Every indexed output directory contributes:
+
+- transcript segments from ``transcript.json``
+- section summaries, narratives and frame descriptions from ``batches.json``
+
+Each entry carries its timestamp and the nearest frame, so a hit points
+straight at a moment in a video. Outputs are fingerprinted by the size and
+mtime of their source files; re-indexing skips unchanged outputs, replaces
+changed ones and drops outputs that no longer exist.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from vidwise.utils import seconds_from_label
+
+INDEX_ENV = "VIDWISE_INDEX"
+SOURCE_FILES = ("transcript.json", "batches.json", "guide.md")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    title TEXT NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    output_id INTEGER NOT NULL REFERENCES outputs(id),
+    kind TEXT NOT NULL,
+    start REAL NOT NULL,
+    "end" REAL,
+    frame TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_output ON entries(output_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    text, tokenize = 'porter unicode61'
+);
+"""
+
+
+@dataclass
+class Hit:
+    """One search result: a moment in an indexed video."""
+
+    output: str
+    title: str
+    kind: str
+    start: float
+    end: float | None
+    frame: str | None
+    snippet: str
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+
+def default_index_path() -> Path:
+    """Index location: $VIDWISE_INDEX, or ~/.vidwise/index.db."""
+    return Path(os.environ.get(INDEX_ENV) or Path.home() / ".vidwise" / "index.db")
+
+
+def connect(index_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the index database."""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(index_path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def find_outputs(roots: list[Path]) -> list[Path]:
+    """Output directories (containing transcript.json or batches.json) under roots."""
+    found = set()
+    for root in roots:
+        for name in SOURCE_FILES[:2]:
+            found.update(p.parent.resolve() for p in root.rglob(name))
+    return sorted(found)
+
+
+def update_index(conn: sqlite3.Connection, roots: list[Path]) -> dict[str, int]:
+    """Index all outputs under roots, re-reading only the changed ones.
+
+    Outputs previously indexed under these roots that no longer exist are
+    removed. Returns counts of added, updated, unchanged and removed outputs.
+    """
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+    outputs = find_outputs(roots)
+    known = {path: (id_, fp) for id_, path, fp in conn.execute(
+        "SELECT id, path, fingerprint FROM outputs"
+    )}
+
+    with conn:
+        for output_dir in outputs:
+            path = str(output_dir)
+            fingerprint = _fingerprint(output_dir)
+            if path in known:
+                output_id, old = known[path]
+                if old == fingerprint:
+                    counts["unchanged"] += 1
+                    continue
+                _delete_entries(conn, output_id)
+                counts["updated"] += 1
+            else:
+                output_id = None
+                counts["added"] += 1
+            _index_output(conn, output_dir, fingerprint, output_id)
+
+        present = {str(p) for p in outputs}
+        resolved_roots = [str(root.resolve()) for root in roots]
+        for path, (output_id, _) in known.items():
+            in_roots = any(path == r or path.startswith(r + os.sep) for r in resolved_roots)
+            if in_roots and path not in present:
+                _delete_entries(conn, output_id)
+                conn.execute("DELETE FROM outputs WHERE id = ?", (output_id,))
+                counts["removed"] += 1
+    return counts
+
+
+def search(conn: sqlite3.Connection, query: str, limit: int = 20) -> list[Hit]:
+    """Best-matching moments for an FTS5 query, most relevant first.
+
+    Queries that aren't valid FTS5 syntax are retried as plain words.
+    """
+    sql = """
+        SELECT o.path, o.title, e.kind, e.start, e."end", e.frame,
+               snippet(entries_fts, 0, '[', ']', '…', 16)
+        FROM entries_fts
+        JOIN entries e ON e.id = entries_fts.rowid
+        JOIN outputs o ON o.id = e.output_id
+        WHERE entries_fts MATCH ?
+        ORDER BY bm25(entries_fts)
+        LIMIT ?
+    """
+    try:
+        rows = conn.execute(sql, (query, limit)).fetchall()
+    except sqlite3.OperationalError:
+        words = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+        rows = conn.execute(sql, (words, limit)).fetchall() if words else []
+    return [Hit(*row) for row in rows]
+
+
+def _fingerprint(output_dir: Path) -> str:
+    parts = []
+    for name in SOURCE_FILES:
+        path = output_dir / name
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return ";".join(parts)
+
+
+def _delete_entries(conn: sqlite3.Connection, output_id: int) -> None:
+    conn.execute(
+        "DELETE FROM entries_fts WHERE rowid IN (SELECT id FROM entries WHERE output_id = ?)",
+        (output_id,),
+    )
+    conn.execute("DELETE FROM entries WHERE output_id = ?", (output_id,))
+
+
+def _index_output(
+    conn: sqlite3.Connection, output_dir: Path, fingerprint: str, output_id: int | None
+) -> None:
+    title = _title(output_dir)
+    if output_id is None:
+        output_id = conn.execute(
+            "INSERT INTO outputs (path, title, fingerprint) VALUES (?, ?, ?)",
+            (str(output_dir), title, fingerprint),
+        ).lastrowid
+    else:
+        conn.execute(
+            "UPDATE outputs SET title = ?, fingerprint = ? WHERE id = ?",
+            (title, fingerprint, output_id),
+        )
+
+    entries = _read_entries(output_dir)
+    for kind, start, end, frame, text in entries:
+        entry_id = conn.execute(
+            'INSERT INTO entries (output_id, kind, start, "end", frame) VALUES (?, ?, ?, ?, ?)',
+            (output_id, kind, start, end, frame),
+        ).lastrowid
+        conn.execute("INSERT INTO entries_fts (rowid, text) VALUES (?, ?)", (entry_id, text))
+
+
+def _title(output_dir: Path) -> str:
+    """The guide's heading, or the output directory name."""
+    guide = output_dir / "guide.md"
+    if guide.exists():
+        with guide.open() as f:
+            first = f.readline().strip()
+        if first.startswith("# "):
+            return first[2:].strip()
+    return output_dir.name
+
+
+def _read_entries(output_dir: Path) -> list[tuple[str, float, float | None, str | None, str]]:
+    """(kind, start, end, frame, text) rows for one output directory."""
+    entries = []
+    frame_times: list[float] = []
+    frame_names: list[str] = []
+
+    batches_path = output_dir / "batches.json"
+    if batches_path.exists():
+        for record in json.loads(batches_path.read_text())["batches"]:
+            result = record.get("result", {})
+            key_frames = result.get("key_frames", [])
+            start = _frame_seconds(record["frames"][0]["name"]) if record["frames"] else 0
+            text = " — ".join(
+                part for part in (result.get("summary"), result.get("narrative")) if part
+            )
+            first = key_frames[0]["filename"] if key_frames else None
+            if text:
+                entries.append(("section", start, None, _frame_ref(first), text))
+            for kf in key_frames:
+                name = kf.get("filename")
+                seconds = _frame_seconds(name)
+                if name and kf.get("description"):
+                    entries.append(("frame", seconds, None, _frame_ref(name), kf["description"]))
+                    frame_times.append(seconds)
+                    frame_names.append(name)
+
+    if not frame_names:
+        frame_times, frame_names = _all_frames(output_dir)
+    if frame_names:
+        order = sorted(range(len(frame_times)), key=frame_times.__getitem__)
+        frame_times = [frame_times[i] for i in order]
+        frame_names = [frame_names[i] for i in order]
+
+    transcript_path = output_dir / "transcript.json"
+    if transcript_path.exists():
+        for seg in json.loads(transcript_path.read_text()).get("segments", []):
+            text = seg["text"].strip()
+            if not text:
+                continue
+            i = bisect.bisect_right(frame_times, seg["start"]) - 1
+            frame = _frame_ref(frame_names[max(i, 0)]) if frame_names else None
+            entries.append(("transcript", seg["start"], seg["end"], frame, text))
+    return entries
+
+
+def _all_frames(output_dir: Path) -> tuple[list[float], list[str]]:
+    """Timestamps and names of every extracted frame, when no guide exists."""
+    from vidwise.extractor import MANIFEST_NAME
+    from vidwise.framestore import INDEX_NAME
+
+    manifest = output_dir / MANIFEST_NAME
+    if manifest.exists():
+        frames = json.loads(manifest.read_text())["frames"]
+        return [f["seconds"] for f in frames], [f["file"] for f in frames]
+    store_index = output_dir / INDEX_NAME
+    if store_index.exists():
+        frames = json.loads(store_index.read_text())["frames"]
+        return [f["seconds"] for f in frames], [f"frame_{f['label']}.png" for f in frames]
+    return [], []
+
+
+def _frame_seconds(name: str | None) -> float:
+    return (seconds_from_label(name) or 0) if name else 0
+
+
+def _frame_ref(name: str | None) -> str | None:
+    return f"frames/{name}" if name else None
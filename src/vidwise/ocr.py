@@ -0,0 +1,159 @@
+"""Local OCR on key frames — on-screen text without paying for vision tokens.
+
+Slides and code screenshots are mostly text. Tesseract reads each key frame
+in a process pool; the text is added to its batch's transcript context. A
+frame whose visual detail (edge pixels) lies almost entirely inside
+recognized words is "covered": its text is sent instead of the image.
+
+Results are cached by the SHA-256 of the frame's PNG bytes, so re-processing
+a video (or another video sharing the same slides) skips OCR entirely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from vidwise.errors import DependencyError
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENV = "VIDWISE_OCR_CACHE"
+COVERAGE_THRESHOLD = 0.9  # Share of edge pixels inside words for a frame to be covered
+MIN_CONFIDENCE = 60  # Tesseract word confidence (0-100) for a word to count
+EDGE_THRESHOLD = 48  # Edge filter response (0-255) counted as visual detail
+
+
+@dataclass
+class FrameText:
+    """OCR result for one frame."""
+
+    text: str
+    coverage: float  # Share of the frame's visual detail inside recognized words
+
+    @property
+    def covered(self) -> bool:
+        """True if the text carries the frame's information on its own."""
+        return bool(self.text) and self.coverage >= COVERAGE_THRESHOLD
+
+
+def default_cache_dir() -> Path:
+    """OCR cache location: $VIDWISE_OCR_CACHE, or ~/.vidwise/ocr."""
+    return Path(os.environ.get(CACHE_ENV) or Path.home() / ".vidwise" / "ocr")
+
+
+def ocr_frames(
+    frames: list[Path], workers: int | None = None, cache_dir: Path | None = None
+) -> dict[str, FrameText]:
+    """OCR frames in a process pool, reusing cached results.
+
+    Returns a FrameText per frame name.
+    """
+    try:
+        import pytesseract  # noqa: F401
+    except ImportError:
+        raise DependencyError(
+            "OCR needs pytesseract. Install it: pip install 'vidwise[ocr]'"
+        ) from None
+    if shutil.which("tesseract") is None:
+        raise DependencyError("'tesseract' not found. Install it: brew install tesseract")
+
+    cache_dir = cache_dir or default_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    results: dict[str, FrameText] = {}
+    pending = []
+    for frame in frames:
+        png = frame.read_bytes()
+        digest = hashlib.sha256(png).hexdigest()
+        cached = cache_dir / f"{digest}.json"
+        if cached.exists():
+            results[frame.name] = FrameText(**json.loads(cached.read_text()))
+        else:
+            pending.append((frame.name, cached, png))
+
+    logger.info(
+        f"Reading on-screen text of {len(frames)} key frames "
+        f"({len(frames) - len(pending)} cached)..."
+    )
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            texts = pool.map(_ocr_png, [png for _, _, png in pending])
+            for (name, cached, _), frame_text in zip(pending, texts):
+                cached.write_text(json.dumps(frame_text.__dict__))
+                results[name] = frame_text
+
+    covered = sum(t.covered for t in results.values())
+    logger.info(f"  {covered} frame(s) fully covered by text")
+    return results
+
+
+def _ocr_png(png: bytes) -> FrameText:
+    """Recognize the text of one PNG (runs in a worker process)."""
+    import io
+
+    import pytesseract
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png)).convert("L")
+    words = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+    return frame_text_from_words(image, words)
+
+
+def frame_text_from_words(image, words: dict[str, list]) -> FrameText:
+    """Join Tesseract's word table into lines and measure its frame coverage.
+
+    Args:
+        image: The grayscale PIL image the words were recognized in.
+        words: pytesseract.image_to_data output (Output.DICT).
+    """
+    import numpy as np
+    from PIL import ImageFilter
+
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    edges = np.asarray(image.filter(ImageFilter.FIND_EDGES)) > EDGE_THRESHOLD
+    edges[[0, -1], :] = edges[:, [0, -1]] = False  # The filter leaves border pixels as-is
+    inside = np.zeros_like(edges)
+    for i, word in enumerate(words["text"]):
+        word = word.strip()
+        if not word or float(words["conf"][i]) < MIN_CONFIDENCE:
+            continue
+        key = (words["block_num"][i], words["par_num"][i], words["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        left, top = words["left"][i], words["top"][i]
+        inside[top : top + words["height"][i], left : left + words["width"][i]] = True
+
+    detail = int(edges.sum())
+    coverage = float((edges & inside).sum() / detail) if detail else 1.0
+    text = "\n".join(" ".join(line) for line in lines.values())
+    return FrameText(text=text, coverage=round(coverage, 3))
+
+
+def ocr_context(batch: list[Path], frame_text: dict[str, FrameText]) -> str:
+    """On-screen text of a batch's frames, formatted for the transcript context.
+
+    Frames sent as text only get their own block naming them, so they stay
+    referenceable in key_frames even though no image is attached.
+    """
+    text_only, attached = [], []
+    for frame in batch:
+        result = frame_text.get(frame.name)
+        if result and result.text:
+            (text_only if result.covered else attached).append(
+                f"[{frame.name}]\n{result.text}"
+            )
+    parts = []
+    if text_only:
+        parts.append(
+            "Text-only frames (image not attached; list them in key_frames by filename "
+            "like any other frame):\n" + "\n\n".join(text_only)
+        )
+    if attached:
+        parts.append("On-screen text of attached frames (OCR):\n" + "\n\n".join(attached))
+    return "\n\n".join(parts)
@@ -0,0 +1,121 @@
+"""Hierarchical overview generation — map-reduce over batch results.
+
+Long videos produce more batch results than fit in one overview prompt.
+Results are grouped, each group is condensed in parallel (together with the
+transcript it covers), and the condensed summaries are grouped again until a
+single bounded call can produce the final overview. The number of levels grows
+logarithmically with video length, and every call stays under a fixed size.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from vidwise.providers.base import GuideProvider
+from vidwise.transcriber import transcript_excerpt
+
+logger = logging.getLogger(__name__)
+
+FAN_IN = 8
+CHAR_BUDGET = 24000
+
+
+def build_overview(
+    provider: GuideProvider,
+    batch_results: list[dict],
+    batch_transcripts: list[str],
+    full_text: str,
+    fan_in: int = FAN_IN,
+    char_budget: int = CHAR_BUDGET,
+    max_workers: int = 4,
+) -> dict:
+    """Generate the video overview, condensing batch results level by level.
+
+    Args:
+        provider: AI provider used for every summarization call.
+        batch_results: Results of analyze_batch, in video order.
+        batch_transcripts: Transcript text each batch was analyzed with.
+        full_text: Whole transcript, sent with the final call (sampled if it
+                   doesn't fit the budget next to the summaries).
+        fan_in: Maximum number of summaries condensed per call.
+        char_budget: Maximum prompt characters (summaries + transcript) per call.
+        max_workers: Parallel summarization calls per level.
+
+    Returns:
+        {"title": str, "overview": str, "key_takeaways": [str]}
+    """
+    items = list(zip(batch_results, batch_transcripts))
+    level = 0
+    while len(items) > 1 and (len(items) > fan_in or _total_size(items) > char_budget):
+        groups = _group(items, fan_in, char_budget)
+        level += 1
+        logger.info(f"  Condensing {len(items)} summaries into {len(groups)} (level {level})...")
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            items = list(pool.map(lambda g: _condense(provider, g, char_budget), groups))
+
+    results = [result for result, _ in items]
+    return provider.generate_overview(results, _fit_transcript(results, full_text, char_budget))
+
+
+def _size(item: tuple[dict, str]) -> int:
+    result, transcript = item
+    return len(json.dumps(result, separators=(",", ":"))) + len(transcript)
+
+
+def _total_size(items: list[tuple[dict, str]]) -> int:
+    return sum(_size(item) for item in items)
+
+
+def _group(
+    items: list[tuple[dict, str]], fan_in: int, char_budget: int
+) -> list[list[tuple[dict, str]]]:
+    """Split items into contiguous groups bounded by count and size.
+
+    Groups always hold at least two items so each level makes progress.
+    """
+    groups: list[list[tuple[dict, str]]] = []
+    current: list[tuple[dict, str]] = []
+    current_size = 0
+    for item in items:
+        size = _size(item)
+        full = len(current) >= fan_in or current_size + size > char_budget
+        if current and full and len(current) >= 2:
+            groups.append(current)
+            current, current_size = [], 0
+        current.append(item)
+        current_size += size
+    if len(current) == 1 and groups and len(groups[-1]) < fan_in:
+        groups[-1].extend(current)
+    elif current:
+        groups.append(current)
+    return groups
+
+
+def _condense(
+    provider: GuideProvider, group: list[tuple[dict, str]], char_budget: int
+) -> tuple[dict, str]:
+    """Summarize a group into a single batch-shaped result.
+
+    The group's transcript is folded into the summary, so higher levels only
+    carry the condensed text forward.
+    """
+    results = [result for result, _ in group]
+    transcript = " ".join(t for _, t in group if t)
+    overview = provider.generate_overview(
+        results, _fit_transcript(results, transcript, char_budget)
+    )
+    return {
+        "summary": overview.get("title", ""),
+        "narrative": overview.get("overview", ""),
+        "key_takeaways": overview.get("key_takeaways", []),
+    }, ""
+
+
+def _fit_transcript(results: list[dict], transcript: str, char_budget: int) -> str:
+    """The transcript, or an excerpt of it, that fits the budget next to results."""
+    room = char_budget - len(json.dumps(results, separators=(",", ":")))
+    if room <= 0:
+        return ""
+    return transcript_excerpt(transcript, room)
@@ -0,0 +1,243 @@
+"""Programmatic pipeline API.
+
+Runs the same stages as the ``vidwise`` command, but reports structured
+progress, can be cancelled from another thread, enforces per-stage time
+limits and raises VidwiseError subclasses instead of exiting::
+
+    pipeline = Pipeline("talk.mp4", "out/", whisper_model="small", on_progress=print,
+                        timeouts={"transcribe": 1800})
+    result = pipeline.run()        # pipeline.cancel() from another thread stops it
+
+Stages, in order: acquire, audio and frames (in parallel), transcribe, guide.
+Progress messages go to the ``vidwise`` logger rather than stdout; the CLI
+prints them.
+"""
+
+from __future__ import annotations
+
+import logging
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from vidwise.errors import DependencyError
+from vidwise.progress import ProgressCallback, StageControl
+from vidwise.providers.base import GuideProvider
+from vidwise.transcriber import WhisperOptions
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("acquire", "audio", "frames", "transcribe", "guide")
+
+
+@dataclass
+class PipelineResult:
+    """Paths and data produced by one pipeline run."""
+
+    output_dir: Path
+    video: Path
+    audio: Path
+    frames: list[Path]
+    transcript: dict
+    guide: Path | None
+
+
+class Pipeline:
+    """One video processing job.
+
+    Args:
+        source: Local file path or URL.
+        output_dir: Output directory (default: vidwise-<name>-<date> in the cwd).
+        whisper_model: Whisper model size.
+        whisper_options: Whisper compute type, threads and batching.
+        word_timestamps: Transcribe with word-level timestamps, so guide
+                         batches get exactly the words in their time window.
+        provider: A GuideProvider, a provider name for detect_provider
+                  ("auto", "claude", "openai", "local"), or None to skip the guide.
+        on_progress: Called with a ProgressEvent as stages advance; may be
+                     called from worker threads.
+        timeouts: Per-stage time limits in seconds, keyed by stage name.
+                  With openai-whisper (no faster-whisper installed), the
+                  transcribe limit is only checked once transcription ends.
+        frame_interval, frame_threshold, workers, frame_store, full_json,
+        batch_tokens, previous_dir, ocr: As for the ``vidwise`` command.
+        record_batches: Save batches.json, so a later run can reuse this
+                        one's analysis with previous_dir.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        output_dir: Path | str | None = None,
+        *,
+        whisper_model: str = "medium",
+        whisper_options: WhisperOptions | None = None,
+        word_timestamps: bool = False,
+        provider: GuideProvider | str | None = "auto",
+        on_progress: ProgressCallback | None = None,
+        timeouts: dict[str, float] | None = None,
+        frame_interval: float = 2,
+        frame_threshold: float = 0.05,
+        workers: int = 1,
+        frame_store: bool = False,
+        full_json: bool = False,
+        batch_tokens: int = 24000,
+        previous_dir: Path | None = None,
+        ocr: bool = False,
+        record_batches: bool = True,
+    ):
+        unknown = set(timeouts or {}) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stage(s) in timeouts: {', '.join(sorted(unknown))}")
+        self.source = source
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.whisper_model = whisper_model
+        self.whisper_options = whisper_options
+        self.word_timestamps = word_timestamps
+        self.provider = provider
+        self.on_progress = on_progress
+        self.timeouts = timeouts or {}
+        self.frame_interval = frame_interval
+        self.frame_threshold = frame_threshold
+        self.workers = workers
+        self.frame_store = frame_store
+        self.full_json = full_json
+        self.batch_tokens = batch_tokens
+        self.previous_dir = previous_dir
+        self.ocr = ocr
+        self.record_batches = record_batches
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        """Ask the running job to stop; run() raises Cancelled at the next safe point."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def control(self, stage: str) -> StageControl:
+        """A StageControl for one stage of this job."""
+        return StageControl(stage, self.on_progress, self._cancel, self.timeouts.get(stage))
+
+    def run(self) -> PipelineResult:
+        """Run every stage; raises VidwiseError on failure, cancellation or timeout."""
+        out = self.prepare_output()
+        video_path, audio_path, frame_paths = self.extract(out)
+        transcript = self.transcribe(out, audio_path)
+        guide_path = self.guide(out, frame_paths, transcript)
+        return PipelineResult(out, video_path, audio_path, frame_paths, transcript, guide_path)
+
+    # The stages run() chains, also used one by one by distributed workers
+
+    def prepare_output(self) -> Path:
+        """Check external tools and create the output directory."""
+        from vidwise.downloader import is_url
+        from vidwise.utils import format_output_dir
+
+        _require("ffmpeg", "brew install ffmpeg")
+        if is_url(self.source):
+            _require("yt-dlp", "brew install yt-dlp  (or)  pip install yt-dlp")
+
+        out = self.output_dir or format_output_dir(self.source)
+        out.mkdir(parents=True, exist_ok=True)
+        (out / "frames").mkdir(exist_ok=True)
+        logger.info(f"Output: {out}")
+        return out
+
+    def extract(self, out: Path) -> tuple[Path, Path, list[Path]]:
+        """Acquire the video, then extract audio and frames in parallel.
+
+        Returns (video_path, audio_path, frame_paths).
+        """
+        from vidwise.downloader import acquire_video
+        from vidwise.extractor import extract_all
+
+        # Step 1: Acquire video
+        control = self.control("acquire")
+        video_path = acquire_video(self.source, out, control=control)
+        control.done(video_path.name)
+        logger.info(f"  Video: {video_path.name}")
+
+        # Step 2: Extract audio + frames (parallel)
+        audio_control, frames_control = self.control("audio"), self.control("frames")
+        audio_path, frame_paths = extract_all(
+            video_path,
+            out,
+            interval=self.frame_interval,
+            frame_store=self.frame_store,
+            workers=self.workers,
+            audio_control=audio_control,
+            frames_control=frames_control,
+        )
+        audio_control.done()
+        frames_control.done(f"{len(frame_paths)} frames")
+        return video_path, audio_path, frame_paths
+
+    def transcribe(self, out: Path, audio_path: Path) -> dict:
+        """Step 3: Transcribe the audio into out."""
+        from vidwise.transcriber import transcribe
+
+        control = self.control("transcribe")
+        transcript = transcribe(
+            audio_path, out, model_size=self.whisper_model, full_json=self.full_json,
+            control=control, options=self.whisper_options, word_timestamps=self.word_timestamps,
+        )
+        control.done(f"{len(transcript['segments'])} segments")
+        return transcript
+
+    def guide(self, out: Path, frame_paths: list[Path], transcript: dict) -> Path | None:
+        """Step 4: Generate the guide, if a provider is available.
+
+        Closes the frames' FrameStore afterwards, if they came from one.
+        Returns the guide path, or None without a provider.
+        """
+        try:
+            return self._guide(out, frame_paths, transcript)
+        finally:
+            if self.frame_store and frame_paths:
+                frame_paths[0].store.close()
+
+    def _guide(self, out: Path, frame_paths: list[Path], transcript: dict) -> Path | None:
+        guide_path = None
+        provider = self._resolve_provider()
+        if provider is not None:
+            from vidwise.guide import generate_guide
+
+            control = self.control("guide")
+            guide_path = generate_guide(
+                provider,
+                frame_paths,
+                transcript,
+                out,
+                frame_threshold=self.frame_threshold,
+                frame_interval=self.frame_interval,
+                batch_tokens=self.batch_tokens,
+                previous_dir=self.previous_dir,
+                ocr=self.ocr,
+                record_batches=self.record_batches,
+                control=control,
+            )
+            control.done()
+
+        # Without a guide, export the key frames so frames/ is still browsable
+        if self.frame_store and frame_paths and guide_path is None:
+            from vidwise.frames import select_key_frames
+
+            key_frames = select_key_frames(frame_paths, threshold=self.frame_threshold)
+            frame_paths[0].store.export(key_frames)
+            logger.info(f"Exported {len(key_frames)} key frames to frames/")
+        return guide_path
+
+    def _resolve_provider(self) -> GuideProvider | None:
+        if isinstance(self.provider, str):
+            from vidwise.guide import detect_provider
+
+            return detect_provider(self.provider)
+        return self.provider
+
+
+def _require(name: str, install_hint: str) -> None:
+    if shutil.which(name) is None:
+        raise DependencyError(f"'{name}' not found. Install it: {install_hint}")
@@ -0,0 +1,82 @@
+"""Progress events and cooperative cancellation for pipeline stages.
+
+Long-running stage functions accept an optional ``StageControl``. They call
+``control.update(done, total)`` as work completes (seconds of media
+processed, for example) and ``control.check()`` at safe points, which raises
+Cancelled or StageTimeout when the job should stop.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from vidwise.errors import Cancelled, StageTimeout
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Progress of one pipeline stage.
+
+    percent and eta (seconds remaining) are None while unknown.
+    """
+
+    stage: str
+    percent: float | None
+    eta: float | None
+    message: str = ""
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+class StageControl:
+    """Progress reporting, cancellation and time limit for one stage."""
+
+    def __init__(
+        self,
+        stage: str,
+        on_progress: ProgressCallback | None = None,
+        cancel: threading.Event | None = None,
+        timeout: float | None = None,
+    ):
+        self.stage = stage
+        self.on_progress = on_progress
+        self.cancel = cancel or threading.Event()
+        self.timeout = timeout
+        self.started = time.monotonic()
+
+    @property
+    def remaining(self) -> float | None:
+        """Seconds left before the stage times out (None if unlimited)."""
+        if self.timeout is None:
+            return None
+        return max(0.0, self.timeout - (time.monotonic() - self.started))
+
+    def check(self) -> None:
+        """Raise Cancelled or StageTimeout if the stage should stop now."""
+        if self.cancel.is_set():
+            raise Cancelled(self.stage)
+        if self.remaining == 0:
+            raise StageTimeout(self.stage, self.timeout)
+
+    def update(self, done: float, total: float | None, message: str = "") -> None:
+        """Report progress; the ETA extrapolates the rate so far."""
+        self.check()
+        if self.on_progress is None:
+            return
+        percent = eta = None
+        if total:
+            fraction = min(done / total, 1.0)
+            percent = round(fraction * 100, 1)
+            if fraction > 0:
+                elapsed = time.monotonic() - self.started
+                eta = round(elapsed * (1 - fraction) / fraction, 1)
+        self.on_progress(ProgressEvent(self.stage, percent, eta, message))
+
+    def done(self, message: str = "") -> None:
+        """Report the stage as complete."""
+        if self.on_progress is not None:
+            self.on_progress(ProgressEvent(self.stage, 100.0, 0.0, message))
@@ -0,0 +1,138 @@
+"""Async provider interface and a blocking adapter for existing callers.
+
+The async providers are opt-in library API for callers that run their own
+event loop or want streamed partial results; generate_guide and
+detect_provider use the blocking providers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from vidwise.providers.base import GuideProvider, TokenUsage
+
+PartialCallback = Callable[[dict], None]
+
+
+class AsyncGuideProvider(ABC):
+    """Async counterpart of GuideProvider with streamed responses.
+
+    Async clients and semaphores are bound to the event loop they are first
+    used on, so an instance keeps one of each per running loop: its HTTP
+    connection pool is shared by every batch and video analyzed on the same
+    loop, and the instance can still be used from several loops (e.g. one
+    asyncio.run() per video). Responses are streamed and parsed
+    incrementally; ``on_partial`` receives each new partial result as
+    fields complete.
+    """
+
+    max_output_tokens: int = GuideProvider.max_output_tokens
+
+    def __init__(self, max_concurrency: int = 8) -> None:
+        self.usage = TokenUsage()
+        self.max_concurrency = max_concurrency
+        self._loops: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._loops_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The async API client for the running event loop."""
+        return self._loop_state()[0]
+
+    def _new_client(self):
+        """Create an async API client; called once per event loop."""
+        return None
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        """Estimate the input tokens one frame of this size costs."""
+        from vidwise.frames import estimate_image_tokens
+
+        return estimate_image_tokens(width, height)
+
+    @abstractmethod
+    async def analyze_batch(
+        self,
+        frame_paths: list[Path],
+        transcript_text: str,
+        time_range: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        """Analyze a batch of frames. Same result shape as GuideProvider."""
+
+    @abstractmethod
+    async def generate_overview(
+        self,
+        batch_results: list[dict],
+        full_transcript: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        """Generate title and overview. Same result shape as GuideProvider."""
+
+    async def analyze_batches(
+        self, requests: list[tuple[list[Path], str, str]]
+    ) -> list[dict]:
+        """Analyze many (frame_paths, transcript_text, time_range) batches concurrently.
+
+        At most ``max_concurrency`` requests are in flight; results keep input order.
+        """
+        return await asyncio.gather(
+            *(self._limited(self.analyze_batch, *request) for request in requests)
+        )
+
+    async def _limited(self, fn: Callable[..., Awaitable[dict]], *args) -> dict:
+        async with self._loop_state()[1]:
+            return await fn(*args)
+
+    def _loop_state(self) -> tuple[object, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        with self._loops_lock:
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = (
+                    self._new_client(), asyncio.Semaphore(self.max_concurrency)
+                )
+            return state
+
+
+class SyncGuideProvider(GuideProvider):
+    """Expose an AsyncGuideProvider through the blocking GuideProvider API.
+
+    Calls run on a private event loop in a daemon thread, so the async client
+    and its connection pool are reused across calls and the adapter can be
+    used from any thread (e.g. the overview's worker pool).
+    """
+
+    def __init__(self, provider: AsyncGuideProvider):
+        self.provider = provider
+        self.usage = provider.usage
+        self.max_output_tokens = provider.max_output_tokens
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        return self.provider.estimate_image_tokens(width, height)
+
+    def analyze_batch(
+        self,
+        frame_paths: list[Path],
+        transcript_text: str,
+        time_range: str,
+    ) -> dict:
+        return self._run(self.provider.analyze_batch(frame_paths, transcript_text, time_range))
+
+    def generate_overview(self, batch_results: list[dict], full_transcript: str) -> dict:
+        return self._run(self.provider.generate_overview(batch_results, full_transcript))
+
+    def close(self) -> None:
+        """Stop the background event loop."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _run(self, coro: Awaitable[dict]) -> dict:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
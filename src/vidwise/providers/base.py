@@ -2,13 +2,72 @@
 
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
+@dataclass
+class TokenUsage:
+    """Running token totals for one provider, safe to update from threads."""
+
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    requests: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(
+        self,
+        input_tokens: int = 0,
+        cached_input_tokens: int = 0,
+        cache_write_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """Record one request. input_tokens includes cached and cache-write tokens."""
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.cached_input_tokens += cached_input_tokens
+            self.cache_write_tokens += cache_write_tokens
+            self.output_tokens += output_tokens
+            self.requests += 1
+
+    def summary(self) -> str:
+        """One-line human-readable report."""
+        uncached = self.input_tokens - self.cached_input_tokens
+        return (
+            f"{self.requests} request(s), {self.input_tokens} input tokens "
+            f"({self.cached_input_tokens} cached, {uncached} uncached), "
+            f"{self.output_tokens} output tokens"
+        )
+
+
 class GuideProvider(ABC):
     """Abstract base for AI providers that analyze frames and generate guides."""
 
+    #: Response token limit per request; also bounds how many frames a batch may hold.
+    max_output_tokens: int = 2048
+
+    @property
+    def usage(self) -> TokenUsage:
+        """Token totals, created on first use so subclasses needn't call __init__."""
+        usage = self.__dict__.get("_usage")
+        if usage is None:
+            usage = self.__dict__.setdefault("_usage", TokenUsage())
+        return usage
+
+    @usage.setter
+    def usage(self, usage: TokenUsage) -> None:
+        self._usage = usage
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        """Estimate the input tokens one frame of this size costs."""
+        from vidwise.frames import estimate_image_tokens
+
+        return estimate_image_tokens(width, height)
+
     @abstractmethod
     def analyze_batch(
         self,
@@ -35,7 +94,10 @@ class GuideProvider(ABC):
 
     @abstractmethod
     def generate_overview(self, batch_results: list[dict], full_transcript: str) -> dict:
-        """Generate title and overview from all batch results.
+        """Generate title and overview from batch results.
+
+        Also used to condense a group of results when overviewing long videos,
+        so the transcript may be an excerpt covering only those results.
 
         Returns:
             {
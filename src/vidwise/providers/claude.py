@@ -2,50 +2,39 @@
 
 from __future__ import annotations
 
-import base64
-import json
+import os
 from pathlib import Path
 
-from vidwise.providers.base import GuideProvider
-
-SYSTEM_PROMPT = """You are a video analysis expert. You receive frames from a video segment \
-alongside the transcript text for that segment. Your job is to:
-
-1. Describe what is visible in the key frames (UI, text, navigation, diagrams, people, etc.)
-2. Correlate visual content with the narration/transcript
-3. Identify which frames show meaningful visual changes
-
-Return your analysis as JSON with this structure:
-{
-  "summary": "Brief 1-sentence summary of what happens in this segment",
-  "key_frames": [
-    {"filename": "frame_Xm00s.png", "description": "What this frame shows"}
-  ],
-  "narrative": "2-3 sentence description correlating visuals with transcript"
-}
-
-Only include the most informative frames — skip frames that show the same thing."""
-
-OVERVIEW_PROMPT = """Based on the following segment analyses of a video, generate:
-1. A descriptive title for the video content
-2. A 2-3 sentence overview
-3. 3-5 key takeaways as bullet points
-
-Return as JSON:
-{
-  "title": "Descriptive Title",
-  "overview": "2-3 sentence summary of the entire video",
-  "key_takeaways": ["takeaway 1", "takeaway 2", "takeaway 3"]
-}"""
+from vidwise.providers.async_base import AsyncGuideProvider, PartialCallback
+from vidwise.providers.base import GuideProvider, TokenUsage
+from vidwise.providers.runtime import (
+    OVERVIEW_PROMPT,
+    SYSTEM_PROMPT,
+    batch_text,
+    frame_base64,
+    overview_content,
+    parse_json_response,
+    pooled_client,
+)
+from vidwise.providers.streaming import StreamingJSONParser
 
 
 class ClaudeGuideProvider(GuideProvider):
-    """Generate guides using the Anthropic Claude API."""
+    """Generate guides using the Anthropic Claude API.
+
+    Instances with the same credentials share one pooled client.
+    """
 
     def __init__(self, model: str = "claude-sonnet-4-20250514"):
         import anthropic
 
-        self.client = anthropic.Anthropic()
+        super().__init__()
+        self.client = pooled_client(
+            "anthropic",
+            anthropic.Anthropic,
+            os.environ.get("ANTHROPIC_API_KEY"),
+            os.environ.get("ANTHROPIC_BASE_URL"),
+        )
         self.model = model
 
     def analyze_batch(
@@ -54,69 +43,107 @@ class ClaudeGuideProvider(GuideProvider):
         transcript_text: str,
         time_range: str,
     ) -> dict:
-        content = []
-
-        # Add frames as images
-        for frame in frame_paths:
-            data = base64.standard_b64encode(frame.read_bytes()).decode("utf-8")
-            content.append({
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": "image/png",
-                    "data": data,
-                },
-            })
-
-        # Add transcript text
-        content.append({
-            "type": "text",
-            "text": (
-                f"Time range: {time_range}\n\n"
-                f"Transcript:\n{transcript_text}\n\n"
-                f"Frame filenames: {', '.join(f.name for f in frame_paths)}\n\n"
-                "Analyze these frames and transcript. Return JSON only."
-            ),
-        })
-
         response = self.client.messages.create(
             model=self.model,
-            max_tokens=1024,
+            max_tokens=self.max_output_tokens,
             system=SYSTEM_PROMPT,
-            messages=[{"role": "user", "content": content}],
+            messages=[{
+                "role": "user",
+                "content": _batch_content(frame_paths, transcript_text, time_range),
+            }],
         )
 
-        return _parse_json_response(response.content[0].text)
+        _record_usage(self.usage, response.usage)
+        return parse_json_response(response.content[0].text)
 
     def generate_overview(self, batch_results: list[dict], full_transcript: str) -> dict:
-        segments_summary = json.dumps(batch_results, indent=2)
-
         response = self.client.messages.create(
             model=self.model,
-            max_tokens=1024,
+            max_tokens=self.max_output_tokens,
             system=OVERVIEW_PROMPT,
             messages=[{
                 "role": "user",
-                "content": (
-                    f"Segment analyses:\n{segments_summary}\n\n"
-                    f"Full transcript:\n{full_transcript[:3000]}\n\n"
-                    "Generate overview JSON."
-                ),
+                "content": overview_content(batch_results, full_transcript),
             }],
         )
 
-        return _parse_json_response(response.content[0].text)
-
-
-def _parse_json_response(text: str) -> dict:
-    """Parse JSON from an LLM response, handling markdown code fences."""
-    text = text.strip()
-    if text.startswith("```"):
-        lines = text.split("\n")
-        # Remove first and last lines (code fences)
-        lines = [line for line in lines if not line.strip().startswith("```")]
-        text = "\n".join(lines)
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        return {"summary": text, "key_frames": [], "narrative": text}
+        _record_usage(self.usage, response.usage)
+        return parse_json_response(response.content[0].text)
+
+
+class AsyncClaudeGuideProvider(AsyncGuideProvider):
+    """Generate guides with AsyncAnthropic, streaming each response."""
+
+    def __init__(self, model: str = "claude-sonnet-4-20250514", max_concurrency: int = 8):
+        import anthropic  # noqa: F401
+
+        super().__init__(max_concurrency=max_concurrency)
+        self.model = model
+
+    def _new_client(self):
+        import anthropic
+
+        return anthropic.AsyncAnthropic()
+
+    async def analyze_batch(
+        self,
+        frame_paths: list[Path],
+        transcript_text: str,
+        time_range: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        content = _batch_content(frame_paths, transcript_text, time_range)
+        return await self._stream(SYSTEM_PROMPT, content, on_partial)
+
+    async def generate_overview(
+        self,
+        batch_results: list[dict],
+        full_transcript: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        content = overview_content(batch_results, full_transcript)
+        return await self._stream(OVERVIEW_PROMPT, content, on_partial)
+
+    async def _stream(
+        self, system: str, content: str | list[dict], on_partial: PartialCallback | None
+    ) -> dict:
+        parser = StreamingJSONParser()
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=self.max_output_tokens,
+            system=system,
+            messages=[{"role": "user", "content": content}],
+        ) as stream:
+            async for text in stream.text_stream:
+                parser.feed(text)
+                if on_partial is not None and (partial := parser.poll()) is not None:
+                    on_partial(partial)
+            message = await stream.get_final_message()
+
+        _record_usage(self.usage, message.usage)
+        return parser.result()
+
+
+def _batch_content(frame_paths: list[Path], transcript_text: str, time_range: str) -> list[dict]:
+    """Build the user message content for one batch: frames, then transcript."""
+    content = [
+        {
+            "type": "image",
+            "source": {"type": "base64", "media_type": "image/png", "data": frame_base64(frame)},
+        }
+        for frame in frame_paths
+    ]
+    content.append({"type": "text", "text": batch_text(frame_paths, transcript_text, time_range)})
+    return content
+
+
+def _record_usage(usage: TokenUsage, response_usage) -> None:
+    """Add an Anthropic usage block, counting cache reads and writes as input."""
+    cache_read = getattr(response_usage, "cache_read_input_tokens", None) or 0
+    cache_write = getattr(response_usage, "cache_creation_input_tokens", None) or 0
+    usage.add(
+        input_tokens=response_usage.input_tokens + cache_read + cache_write,
+        cached_input_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        output_tokens=response_usage.output_tokens,
+    )
@@ -0,0 +1,54 @@
+"""Local provider — any OpenAI-compatible server (Ollama, llama.cpp, vLLM, LM Studio).
+
+Frames and transcripts never leave the machine or network the server runs on.
+"""
+
+from __future__ import annotations
+
+import os
+
+from vidwise.providers.openai import AsyncOpenAIGuideProvider, OpenAIGuideProvider
+
+DEFAULT_BASE_URL = "http://localhost:11434/v1"
+DEFAULT_MODEL = "llava"
+
+
+def local_settings(
+    base_url: str | None = None, model: str | None = None
+) -> tuple[str, str, str]:
+    """Resolve (base_url, model, api_key), falling back to VIDWISE_LOCAL_* env vars.
+
+    Local servers usually ignore the API key, but the client requires one.
+    """
+    return (
+        base_url or os.environ.get("VIDWISE_LOCAL_URL", DEFAULT_BASE_URL),
+        model or os.environ.get("VIDWISE_LOCAL_MODEL", DEFAULT_MODEL),
+        os.environ.get("VIDWISE_LOCAL_API_KEY", "local"),
+    )
+
+
+class LocalGuideProvider(OpenAIGuideProvider):
+    """Generate guides with a vision model served from an OpenAI-compatible endpoint."""
+
+    def __init__(self, base_url: str | None = None, model: str | None = None):
+        base_url, model, api_key = local_settings(base_url, model)
+        super().__init__(model=model, base_url=base_url, api_key=api_key)
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        # Local servers don't honor detail "low"; budget for the full image
+        return super(OpenAIGuideProvider, self).estimate_image_tokens(width, height)
+
+
+class AsyncLocalGuideProvider(AsyncOpenAIGuideProvider):
+    """Async, streaming variant of LocalGuideProvider."""
+
+    def __init__(
+        self, base_url: str | None = None, model: str | None = None, max_concurrency: int = 4
+    ):
+        base_url, model, api_key = local_settings(base_url, model)
+        super().__init__(
+            model=model, base_url=base_url, api_key=api_key, max_concurrency=max_concurrency
+        )
+
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        return super(AsyncOpenAIGuideProvider, self).estimate_image_tokens(width, height)
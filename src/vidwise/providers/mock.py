@@ -0,0 +1,79 @@
+"""Deterministic offline provider for tests and benchmarks — no network."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from vidwise.frames import estimate_text_tokens
+from vidwise.providers.async_base import AsyncGuideProvider, PartialCallback
+from vidwise.providers.streaming import StreamingJSONParser
+
+
+class MockGuideProvider(AsyncGuideProvider):
+    """Answer every request from its inputs, streamed like a real model.
+
+    Responses are derived only from the frame names, transcript and time range,
+    so the same inputs always produce the same guide. ``chunk_size`` and
+    ``latency`` control how the response is streamed, to exercise partial
+    parsing and concurrency without an API.
+    """
+
+    def __init__(self, chunk_size: int = 16, latency: float = 0.0, max_concurrency: int = 8):
+        super().__init__(max_concurrency=max_concurrency)
+        self.chunk_size = chunk_size
+        self.latency = latency
+        self.calls: list[str] = []
+
+    async def analyze_batch(
+        self,
+        frame_paths: list[Path],
+        transcript_text: str,
+        time_range: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        self.calls.append("analyze_batch")
+        words = transcript_text.split()
+        response = {
+            "summary": f"Segment {time_range}: " + " ".join(words[:8]),
+            "key_frames": [
+                {"filename": f.name, "description": f"Frame {f.stem}"} for f in frame_paths
+            ],
+            "narrative": " ".join(words[:40]),
+        }
+        prompt = transcript_text + " ".join(f.name for f in frame_paths)
+        return await self._stream(response, prompt, on_partial)
+
+    async def generate_overview(
+        self,
+        batch_results: list[dict],
+        full_transcript: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        self.calls.append("generate_overview")
+        summaries = [r.get("summary", "") for r in batch_results]
+        response = {
+            "title": summaries[0] if summaries else "Video Guide",
+            "overview": f"{len(batch_results)} segments. " + full_transcript[:200],
+            "key_takeaways": summaries[:5],
+        }
+        prompt = json.dumps(batch_results) + full_transcript
+        return await self._stream(response, prompt, on_partial)
+
+    async def _stream(
+        self, response: dict, prompt: str, on_partial: PartialCallback | None
+    ) -> dict:
+        text = json.dumps(response)
+        parser = StreamingJSONParser()
+        for i in range(0, len(text), self.chunk_size):
+            await asyncio.sleep(self.latency)
+            parser.feed(text[i : i + self.chunk_size])
+            if on_partial is not None and (partial := parser.poll()) is not None:
+                on_partial(partial)
+
+        self.usage.add(
+            input_tokens=estimate_text_tokens(prompt),
+            output_tokens=estimate_text_tokens(text),
+        )
+        return parser.result()
@@ -2,123 +2,175 @@
 
 from __future__ import annotations
 
-import base64
-import json
+import os
 from pathlib import Path
 
-from vidwise.providers.base import GuideProvider
-
-SYSTEM_PROMPT = """You are a video analysis expert. You receive frames from a video segment \
-alongside the transcript text for that segment. Your job is to:
-
-1. Describe what is visible in the key frames (UI, text, navigation, diagrams, people, etc.)
-2. Correlate visual content with the narration/transcript
-3. Identify which frames show meaningful visual changes
-
-Return your analysis as JSON with this structure:
-{
-  "summary": "Brief 1-sentence summary of what happens in this segment",
-  "key_frames": [
-    {"filename": "frame_Xm00s.png", "description": "What this frame shows"}
-  ],
-  "narrative": "2-3 sentence description correlating visuals with transcript"
-}
-
-Only include the most informative frames — skip frames that show the same thing."""
-
-OVERVIEW_PROMPT = """Based on the following segment analyses of a video, generate:
-1. A descriptive title for the video content
-2. A 2-3 sentence overview
-3. 3-5 key takeaways as bullet points
-
-Return as JSON:
-{
-  "title": "Descriptive Title",
-  "overview": "2-3 sentence summary of the entire video",
-  "key_takeaways": ["takeaway 1", "takeaway 2", "takeaway 3"]
-}"""
+from vidwise.providers.async_base import AsyncGuideProvider, PartialCallback
+from vidwise.providers.base import GuideProvider, TokenUsage
+from vidwise.providers.runtime import (
+    OVERVIEW_PROMPT,
+    SYSTEM_PROMPT,
+    batch_text,
+    frame_base64,
+    overview_content,
+    parse_json_response,
+    pooled_client,
+)
+from vidwise.providers.streaming import StreamingJSONParser
 
 
 class OpenAIGuideProvider(GuideProvider):
-    """Generate guides using the OpenAI API."""
+    """Generate guides using the OpenAI API.
+
+    Instances with the same endpoint and key share one pooled client.
+    """
 
-    def __init__(self, model: str = "gpt-4o"):
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        base_url: str | None = None,
+        api_key: str | None = None,
+    ):
         import openai
 
-        self.client = openai.OpenAI()
+        super().__init__()
+        self.client = pooled_client(
+            "openai",
+            lambda: openai.OpenAI(base_url=base_url, api_key=api_key),
+            base_url or os.environ.get("OPENAI_BASE_URL"),
+            api_key or os.environ.get("OPENAI_API_KEY"),
+        )
         self.model = model
 
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        # Frames are sent with detail "low", which is a flat cost
+        return 85
+
     def analyze_batch(
         self,
         frame_paths: list[Path],
         transcript_text: str,
         time_range: str,
     ) -> dict:
-        content = []
-
-        # Add frames as images
-        for frame in frame_paths:
-            data = base64.standard_b64encode(frame.read_bytes()).decode("utf-8")
-            content.append({
-                "type": "image_url",
-                "image_url": {
-                    "url": f"data:image/png;base64,{data}",
-                    "detail": "low",
-                },
-            })
-
-        # Add transcript text
-        content.append({
-            "type": "text",
-            "text": (
-                f"Time range: {time_range}\n\n"
-                f"Transcript:\n{transcript_text}\n\n"
-                f"Frame filenames: {', '.join(f.name for f in frame_paths)}\n\n"
-                "Analyze these frames and transcript. Return JSON only."
-            ),
-        })
-
         response = self.client.chat.completions.create(
             model=self.model,
-            max_tokens=1024,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": content},
-            ],
+            max_tokens=self.max_output_tokens,
+            messages=_messages(
+                SYSTEM_PROMPT, _batch_content(frame_paths, transcript_text, time_range)
+            ),
         )
 
-        return _parse_json_response(response.choices[0].message.content)
+        _record_usage(self.usage, response.usage)
+        return parse_json_response(response.choices[0].message.content)
 
     def generate_overview(self, batch_results: list[dict], full_transcript: str) -> dict:
-        segments_summary = json.dumps(batch_results, indent=2)
-
         response = self.client.chat.completions.create(
             model=self.model,
-            max_tokens=1024,
-            messages=[
-                {"role": "system", "content": OVERVIEW_PROMPT},
-                {
-                    "role": "user",
-                    "content": (
-                        f"Segment analyses:\n{segments_summary}\n\n"
-                        f"Full transcript:\n{full_transcript[:3000]}\n\n"
-                        "Generate overview JSON."
-                    ),
-                },
-            ],
+            max_tokens=self.max_output_tokens,
+            messages=_messages(
+                OVERVIEW_PROMPT, overview_content(batch_results, full_transcript)
+            ),
         )
 
-        return _parse_json_response(response.choices[0].message.content)
+        _record_usage(self.usage, response.usage)
+        return parse_json_response(response.choices[0].message.content)
+
+
+class AsyncOpenAIGuideProvider(AsyncGuideProvider):
+    """Generate guides with AsyncOpenAI, streaming each response."""
 
+    def __init__(
+        self,
+        model: str = "gpt-4o",
+        base_url: str | None = None,
+        api_key: str | None = None,
+        max_concurrency: int = 8,
+    ):
+        import openai  # noqa: F401
+
+        super().__init__(max_concurrency=max_concurrency)
+        self.model = model
+        self.base_url = base_url
+        self.api_key = api_key
+
+    def _new_client(self):
+        import openai
+
+        return openai.AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
 
-def _parse_json_response(text: str) -> dict:
-    """Parse JSON from an LLM response, handling markdown code fences."""
-    text = text.strip()
-    if text.startswith("```"):
-        lines = text.split("\n")
-        lines = [line for line in lines if not line.strip().startswith("```")]
-        text = "\n".join(lines)
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        return {"summary": text, "key_frames": [], "narrative": text}
+    def estimate_image_tokens(self, width: int, height: int) -> int:
+        # Frames are sent with detail "low", which is a flat cost
+        return 85
+
+    async def analyze_batch(
+        self,
+        frame_paths: list[Path],
+        transcript_text: str,
+        time_range: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        content = _batch_content(frame_paths, transcript_text, time_range)
+        return await self._stream(_messages(SYSTEM_PROMPT, content), on_partial)
+
+    async def generate_overview(
+        self,
+        batch_results: list[dict],
+        full_transcript: str,
+        on_partial: PartialCallback | None = None,
+    ) -> dict:
+        content = overview_content(batch_results, full_transcript)
+        return await self._stream(_messages(OVERVIEW_PROMPT, content), on_partial)
+
+    async def _stream(self, messages: list[dict], on_partial: PartialCallback | None) -> dict:
+        parser = StreamingJSONParser()
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            max_tokens=self.max_output_tokens,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                _record_usage(self.usage, chunk.usage)
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            parser.feed(chunk.choices[0].delta.content)
+            if on_partial is not None and (partial := parser.poll()) is not None:
+                on_partial(partial)
+
+        return parser.result()
+
+
+def _messages(system: str, content: str | list[dict]) -> list[dict]:
+    """The system prompt followed by one user message."""
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": content},
+    ]
+
+
+def _batch_content(frame_paths: list[Path], transcript_text: str, time_range: str) -> list[dict]:
+    """Build the user message content for one batch: frames, then transcript."""
+    content = [
+        {
+            "type": "image_url",
+            "image_url": {"url": f"data:image/png;base64,{frame_base64(frame)}", "detail": "low"},
+        }
+        for frame in frame_paths
+    ]
+    content.append({"type": "text", "text": batch_text(frame_paths, transcript_text, time_range)})
+    return content
+
+
+def _record_usage(usage: TokenUsage, response_usage) -> None:
+    """Add an OpenAI usage block, including any prompt tokens served from cache."""
+    if response_usage is None:
+        return
+    details = getattr(response_usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    usage.add(
+        input_tokens=response_usage.prompt_tokens,
+        cached_input_tokens=cached,
+        output_tokens=response_usage.completion_tokens,
+    )
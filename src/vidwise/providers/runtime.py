@@ -0,0 +1,182 @@
+"""Shared provider runtime — prompts, frame payloads, clients and parsing.
+
+Every provider builds the same requests: the same prompts, frames as
+base64 PNGs, and a JSON answer that may come wrapped in a code fence. This
+module does that work once for all of them:
+
+- Frame payloads are memoized by path, modification time and size, so a
+  frame sent again (retries, overview passes, a batch re-planned by
+  ``--previous``) is not re-read or re-encoded.
+- Blocking API clients are pooled per endpoint and credentials, so every
+  provider instance in a process (one per video with the Pipeline API)
+  shares one keep-alive HTTP connection pool.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import TypeVar
+
+SYSTEM_PROMPT = """You are a video analysis expert. You receive frames from a video segment \
+alongside the transcript text for that segment. Your job is to:
+
+1. Describe what is visible in the key frames (UI, text, navigation, diagrams, people, etc.)
+2. Correlate visual content with the narration/transcript
+3. Identify which frames show meaningful visual changes
+
+Return your analysis as JSON with this structure:
+{
+  "summary": "Brief 1-sentence summary of what happens in this segment",
+  "key_frames": [
+    {"filename": "frame_Xm00s.png", "description": "What this frame shows"}
+  ],
+  "narrative": "2-3 sentence description correlating visuals with transcript"
+}
+
+Only include the most informative frames — skip frames that show the same thing."""
+
+OVERVIEW_PROMPT = """Based on the following segment analyses of a video, generate:
+1. A descriptive title for the video content
+2. A 2-3 sentence overview
+3. 3-5 key takeaways as bullet points
+
+Return as JSON:
+{
+  "title": "Descriptive Title",
+  "overview": "2-3 sentence summary of the entire video",
+  "key_takeaways": ["takeaway 1", "takeaway 2", "takeaway 3"]
+}"""
+
+PAYLOAD_CACHE_BYTES = 64 * 1024 * 1024  # Encoded frames kept in memory, per process
+
+T = TypeVar("T")
+
+
+class PayloadCache:
+    """Base64 frame payloads, keyed by path, mtime and size, evicted LRU by size.
+
+    Frames inside a FrameStore are keyed by the pack file's path, mtime and
+    size plus the frame's index.
+    """
+
+    def __init__(self, max_bytes: int = PAYLOAD_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, frame: Path) -> str:
+        """The frame's PNG bytes, base64-encoded."""
+        key = _payload_key(frame)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = base64.standard_b64encode(frame.read_bytes()).decode("ascii")
+        with self._lock:
+            if key not in self._entries and len(data) <= self.max_bytes:
+                self._entries[key] = data
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = 0
+
+
+def _payload_key(frame: Path) -> tuple:
+    from vidwise.framestore import PACK_NAME, StoredFrame
+
+    if isinstance(frame, StoredFrame):
+        pack = frame.store.output_dir / PACK_NAME
+        stat = os.stat(pack)
+        return (os.fspath(pack), stat.st_mtime_ns, stat.st_size, frame.index)
+    stat = os.stat(frame)
+    return (os.fspath(frame), stat.st_mtime_ns, stat.st_size)
+
+
+payloads = PayloadCache()
+
+
+def frame_base64(frame: Path) -> str:
+    """Base64 of a frame's PNG bytes, from the shared payload cache."""
+    return payloads.get(frame)
+
+
+_clients: dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def pooled_client(kind: str, factory: Callable[[], T], *settings: Hashable) -> T:
+    """Return the process-wide client for (kind, settings), creating it once.
+
+    Only for blocking clients: async clients hold connections bound to one
+    event loop, so each AsyncGuideProvider keeps one per loop.
+    Credentials in settings are hashed, not kept in the key.
+    """
+    key = (kind, *(_fingerprint(s) for s in settings))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = factory()
+        return client
+
+
+def _fingerprint(value: Hashable) -> Hashable:
+    if isinstance(value, str):
+        return hashlib.sha256(value.encode()).hexdigest()
+    return value
+
+
+def batch_text(frame_paths: list[Path], transcript_text: str, time_range: str) -> str:
+    """The text part of a batch request, sent after the frames."""
+    return (
+        f"Time range: {time_range}\n\n"
+        f"Transcript:\n{transcript_text}\n\n"
+        f"Frame filenames: {', '.join(f.name for f in frame_paths)}\n\n"
+        "Analyze these frames and transcript. Return JSON only."
+    )
+
+
+def overview_content(batch_results: list[dict], full_transcript: str) -> str:
+    """Build the user message for an overview request."""
+    segments_summary = json.dumps(batch_results, separators=(",", ":"))
+    return (
+        f"Segment analyses:\n{segments_summary}\n\n"
+        f"Transcript:\n{full_transcript}\n\n"
+        "Generate overview JSON."
+    )
+
+
+def parse_json_response(text: str) -> dict:
+    """Parse JSON from an LLM response, handling markdown code fences.
+
+    Falls back to the raw text as the summary and narrative.
+    """
+    text = text.strip()
+    if text.startswith("```"):
+        lines = text.split("\n")
+        # Remove the code fence lines
+        lines = [line for line in lines if not line.strip().startswith("```")]
+        text = "\n".join(lines)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return {"summary": text, "key_frames": [], "narrative": text}
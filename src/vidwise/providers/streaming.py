@@ -0,0 +1,130 @@
+"""Incremental parsing of JSON responses streamed from an LLM."""
+
+from __future__ import annotations
+
+import json
+
+from vidwise.providers.runtime import parse_json_response
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class StreamingJSONParser:
+    """Parse a JSON object as it arrives in text chunks.
+
+    Each chunk is scanned once. The parser remembers the last point where the
+    document could be cut and closed cleanly, so ``partial()`` can return every
+    value completed so far without re-scanning the whole buffer. Text before
+    the first ``{`` or ``[`` (e.g. a markdown code fence) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._length = 0
+        self._start: int | None = None
+        self._end: int | None = None
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        # Cut point and open brackets at that point
+        self._safe = 0
+        self._safe_stack: list[str] = []
+        self._polled: tuple[int, bool] | None = None
+
+    def feed(self, chunk: str) -> None:
+        """Consume the next chunk of response text."""
+        offset = self._length
+        self._buffer.append(chunk)
+        self._length += len(chunk)
+        if self._end is not None:
+            return
+
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            if self._start is None:
+                if ch in _CLOSERS:
+                    self._start = pos
+                    self._stack.append(ch)
+                    self._mark_safe(pos + 1)
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    # A closed string inside an array is a complete value
+                    if self._stack[-1] == "[":
+                        self._mark_safe(pos + 1)
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+                self._mark_safe(pos + 1)
+            elif ch in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._end = pos + 1
+                    return
+                self._mark_safe(pos + 1)
+            elif ch == ",":
+                self._mark_safe(pos)
+
+    def _mark_safe(self, pos: int) -> None:
+        self._safe = pos
+        self._safe_stack = list(self._stack)
+
+    @property
+    def text(self) -> str:
+        """All text received so far."""
+        if len(self._buffer) > 1:
+            self._buffer = ["".join(self._buffer)]
+        return self._buffer[0] if self._buffer else ""
+
+    @property
+    def done(self) -> bool:
+        """Whether the top-level JSON value has been closed."""
+        return self._end is not None
+
+    def partial(self) -> dict | list | None:
+        """Best-effort value of everything completed so far.
+
+        Returns None before the first complete value is available.
+        """
+        if self._start is None:
+            return None
+        if self._end is not None:
+            return self.result()
+
+        head = self.text[self._start : self._safe].rstrip()
+        if head.endswith(","):
+            head = head[:-1]
+        closing = "".join(_CLOSERS[ch] for ch in reversed(self._safe_stack))
+        try:
+            return json.loads(head + closing)
+        except json.JSONDecodeError:
+            # A completed value sits after a dangling key (e.g. '{"a": {'); skip it
+            return None
+
+    def poll(self) -> dict | None:
+        """Return the partial object if fields completed since the last poll, else None."""
+        state = (self._safe, self.done)
+        if state == self._polled:
+            return None
+        self._polled = state
+        partial = self.partial()
+        if isinstance(partial, dict) and partial:
+            return partial
+        return None
+
+    def result(self) -> dict:
+        """Final parsed object, falling back to the raw text as a summary."""
+        text = self.text
+        if self._start is not None and self._end is not None:
+            try:
+                return json.loads(text[self._start : self._end])
+            except json.JSONDecodeError:
+                pass
+        return parse_json_response(text)
@@ -0,0 +1,192 @@
+"""Shared runner for external tools (ffmpeg, ffprobe, yt-dlp).
+
+Output is streamed instead of buffered: stderr lines go to an optional
+callback and into a bounded tail kept for error messages, and stdout is
+either consumed by the caller or read line by line. A watchdog thread kills
+the tool as soon as its StageControl is cancelled or times out.
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import IO
+
+from vidwise.errors import DependencyError, ToolError, VidwiseError
+from vidwise.progress import StageControl
+
+TAIL_LINES = 50
+MAX_LINE_CHARS = 1000
+WATCH_INTERVAL = 0.1  # Seconds between cancellation/timeout checks
+_DURATION = re.compile(r"^\s*Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+LineCallback = Callable[[str], bool | None]
+
+
+class ToolProcess:
+    """A running external tool.
+
+    Args:
+        cmd: Command line; cmd[0] names the tool in error messages.
+        control: Checked by a watchdog; the tool is killed when it raises.
+        on_stderr: Called with each stderr line. Lines it returns True for
+                   are consumed; all others go to the stderr tail.
+        stdout: PIPE to read stdout (``.stdout``), or DEVNULL.
+
+    Use as a context manager so the tool is killed if the caller fails, and
+    finish with wait() or check().
+    """
+
+    def __init__(
+        self,
+        cmd: list[str],
+        control: StageControl | None = None,
+        on_stderr: LineCallback | None = None,
+        stdout: int = subprocess.PIPE,
+    ):
+        self.cmd = cmd
+        self.control = control
+        self.on_stderr = on_stderr
+        self.tail: deque[str] = deque(maxlen=TAIL_LINES)
+        self.stderr_done = threading.Event()
+        self._stopped_by: VidwiseError | None = None
+        try:
+            self.proc = subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=stdout, stderr=subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise DependencyError(f"'{cmd[0]}' not found.") from None
+        self._threads = [threading.Thread(target=self._read_stderr, daemon=True)]
+        if control is not None:
+            self._threads.append(threading.Thread(target=self._watch, daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    @property
+    def stdout(self) -> IO[bytes]:
+        return self.proc.stdout
+
+    @property
+    def stderr_text(self) -> str:
+        return "\n".join(self.tail)
+
+    def kill(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.kill()
+
+    def wait(self) -> int:
+        """Wait for the tool to exit; raises Cancelled/StageTimeout if it was stopped."""
+        returncode = self.proc.wait()
+        for thread in self._threads:
+            thread.join()
+        if self.proc.stdout:
+            self.proc.stdout.close()
+        if self._stopped_by is not None:
+            raise self._stopped_by
+        return returncode
+
+    def check(self, what: str) -> None:
+        """Wait, raising ToolError with the stderr tail if the tool failed."""
+        if self.wait() != 0:
+            raise ToolError(f"{what} failed", self.stderr_text)
+
+    def __enter__(self) -> ToolProcess:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.kill()
+            self.proc.wait()
+
+    def _read_stderr(self) -> None:
+        for raw in self.proc.stderr:
+            line = raw.decode(errors="replace").rstrip()[:MAX_LINE_CHARS]
+            if self.on_stderr is None or not self.on_stderr(line):
+                self.tail.append(line)
+        self.proc.stderr.close()
+        self.stderr_done.set()
+
+    def _watch(self) -> None:
+        while True:
+            try:
+                self.proc.wait(timeout=WATCH_INTERVAL)
+                return
+            except subprocess.TimeoutExpired:
+                pass
+            try:
+                self.control.check()
+            except VidwiseError as e:
+                self._stopped_by = e
+                self.kill()
+                return
+
+
+def run_tool(
+    cmd: list[str],
+    what: str,
+    control: StageControl | None = None,
+    on_stdout: LineCallback | None = None,
+    on_stderr: LineCallback | None = None,
+) -> str:
+    """Run a tool to completion, streaming its output.
+
+    stdout lines go to on_stdout if given, and are otherwise collected and
+    returned. Raises ToolError (with the stderr tail) if the tool fails.
+    """
+    collected: list[str] = []
+    with ToolProcess(cmd, control, on_stderr) as tool:
+        for raw in tool.stdout:
+            line = raw.decode(errors="replace").rstrip("\n")
+            if on_stdout is not None:
+                on_stdout(line)
+            else:
+                collected.append(line)
+        tool.check(what)
+    return "\n".join(collected)
+
+
+class FfmpegProgress:
+    """Turns ``ffmpeg -progress pipe:1`` output into StageControl updates.
+
+    The total comes from the ``Duration:`` line ffmpeg prints for its input
+    (or from ``duration`` if known in advance). Pass ``stdout_line`` and
+    ``stderr_line`` as run_tool's on_stdout and on_stderr.
+    """
+
+    ARGS = ["-progress", "pipe:1", "-nostats"]
+
+    def __init__(self, control: StageControl | None, duration: float | None = None):
+        self.control = control
+        self.duration = duration
+        self._block: dict[str, str] = {}
+
+    def stdout_line(self, line: str) -> None:
+        key, _, value = line.partition("=")
+        self._block[key.strip()] = value.strip()
+        if key == "progress":
+            self._report(self._block)
+            self._block = {}
+
+    def stderr_line(self, line: str) -> bool:
+        if self.duration is None:
+            match = _DURATION.match(line)
+            if match:
+                hours, minutes, seconds = match.groups()
+                self.duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        return False
+
+    def _report(self, block: dict[str, str]) -> None:
+        if self.control is None:
+            return
+        # Older ffmpeg only has out_time_ms, which (despite its name) is in microseconds
+        micros = block.get("out_time_us") or block.get("out_time_ms")
+        try:
+            done = max(0.0, int(micros) / 1_000_000)
+        except (TypeError, ValueError):
+            return
+        if self.duration:
+            done = min(done, self.duration)
+        self.control.update(done, self.duration)
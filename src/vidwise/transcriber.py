@@ -7,8 +7,42 @@ Supports two backends:
 
 from __future__ import annotations
 
+import functools
 import json
+import logging
+from array import array
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TextIO
+
+from vidwise.progress import StageControl
+
+logger = logging.getLogger(__name__)
+
+COMPUTE_TYPES = (
+    "auto", "default", "int8", "int8_float16", "int8_float32", "float16", "float32"
+)
+
+
+@dataclass(frozen=True)
+class WhisperOptions:
+    """Inference settings for the Whisper backends.
+
+    compute_type: CTranslate2 compute type for faster-whisper ("int8",
+        "int8_float16", ...). With openai-whisper on CPU, "int8" applies
+        dynamic int8 quantization to the linear layers; other values keep
+        fp32. "auto" benchmarks the choices once per host (see vidwise.tuning).
+    cpu_threads: Threads per model (0 = backend default).
+    num_workers: faster-whisper workers, for transcribing several files
+        concurrently with one loaded model.
+    batch_size: Use faster-whisper's batched pipeline with this batch size
+        (0 = sequential decoding).
+    """
+
+    compute_type: str = "default"
+    cpu_threads: int = 0
+    num_workers: int = 1
+    batch_size: int = 0
 
 
 def _use_faster_whisper() -> bool:
@@ -21,83 +55,428 @@ def _use_faster_whisper() -> bool:
         return False
 
 
-def transcribe(audio_path: Path, output_dir: Path, model_size: str = "medium") -> dict:
+class Words:
+    """Word-level timestamps of one segment, stored compactly.
+
+    Start and end times share one float32 array and the words one tuple,
+    instead of a dict per word. Iterating yields (start, end, word) tuples;
+    words keep Whisper's leading space, so joining them gives the text.
+    """
+
+    __slots__ = ("times", "words")
+
+    def __init__(self, items):
+        self.times = array("f")
+        words = []
+        for start, end, word in items:
+            self.times.extend((start, end))
+            words.append(word)
+        self.words = tuple(words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self):
+        for i, word in enumerate(self.words):
+            yield self.times[2 * i], self.times[2 * i + 1], word
+
+    def to_list(self) -> list[list]:
+        """[start, end, word] triples, with times rounded to centiseconds."""
+        return [[round(start, 2), round(end, 2), word] for start, end, word in self]
+
+
+class Segment:
+    """One transcript segment, holding only start, end, text and, if
+    requested, its word timestamps.
+
+    Whisper's own segment dicts also carry tokens, log-probabilities and
+    other per-segment arrays; dropping them keeps multi-hour transcripts
+    small. Item access (``seg["start"]``) works like the original dicts.
+    """
+
+    __slots__ = ("start", "end", "text", "words")
+
+    def __init__(self, start: float, end: float, text: str, words: Words | None = None):
+        self.start = start
+        self.end = end
+        self.text = text
+        self.words = words
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        d = {"start": self.start, "end": self.end, "text": self.text}
+        if self.words is not None:
+            d["words"] = self.words.to_list()
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> Segment:
+        words = d.get("words")
+        return cls(d["start"], d["end"], d["text"], Words(words) if words is not None else None)
+
+    def shifted(self, offset: float) -> Segment:
+        """This segment moved later by offset seconds."""
+        words = None
+        if self.words is not None:
+            words = Words((s + offset, e + offset, w) for s, e, w in self.words)
+        return Segment(self.start + offset, self.end + offset, self.text, words)
+
+    def __repr__(self) -> str:
+        return f"Segment({self.start!r}, {self.end!r}, {self.text!r})"
+
+
+def transcribe(
+    audio_path: Path,
+    output_dir: Path,
+    model_size: str = "medium",
+    full_json: bool = False,
+    control: StageControl | None = None,
+    options: WhisperOptions | None = None,
+    word_timestamps: bool = False,
+) -> dict:
     """Run Whisper transcription on an audio file.
 
-    Saves .txt, .srt, and .json outputs to output_dir.
-    Returns a result dict with 'segments' list and 'text' string.
+    Saves .txt, .srt, and .json outputs to output_dir. transcript.json holds
+    only start, end and text per segment unless full_json is set, in which
+    case the backend's complete output is saved.
+    Returns a result dict with a compact 'segments' list (of Segment) and
+    'text' string.
+
+    With word_timestamps, each segment also gets its words with their start
+    and end times (Segment.words, and "words" in transcript.json), so the
+    guide can slice the transcript at exact frame times.
+
+    control, if given, gets progress from each segment's end time with
+    faster-whisper, which can also be cancelled between segments.
+    openai-whisper transcribes in one call that can't be interrupted:
+    cancellation and the time limit are only checked before and after it,
+    so a transcribe timeout doesn't stop a running openai-whisper call.
+
+    Loaded models stay resident, so later calls with the same model and
+    options skip loading.
     """
-    if _use_faster_whisper():
-        result = _transcribe_faster(audio_path, model_size)
+    result, full = _run_backend(
+        audio_path, model_size, full_json, control, options, word_timestamps
+    )
+    write_transcript(result, output_dir, full)
+    return result
+
+
+def _run_backend(
+    audio_path: Path,
+    model_size: str,
+    full_json: bool,
+    control: StageControl | None,
+    options: WhisperOptions | None,
+    word_timestamps: bool,
+) -> tuple[dict, dict | None]:
+    if control:
+        control.check()
+    options = options or WhisperOptions()
+    faster = _use_faster_whisper()
+    if options.compute_type == "auto":
+        from vidwise.tuning import tuned_options
+
+        options = tuned_options(model_size, audio_path, options, faster)
+    if faster:
+        result, full = _transcribe_faster(
+            audio_path, model_size, full_json, control, options, word_timestamps
+        )
     else:
-        result = _transcribe_openai(audio_path, model_size)
+        result, full = _transcribe_openai(
+            audio_path, model_size, full_json, options, word_timestamps
+        )
+    if control:
+        control.check()
+    return result, full
 
+
+def write_transcript(result: dict, output_dir: Path, full: dict | None = None) -> None:
+    """Save transcript.txt, .srt and .json (the full backend output, if given)."""
     # Save plain text
     txt_path = output_dir / "transcript.txt"
     txt_path.write_text(result["text"].strip() + "\n")
 
     # Save SRT
     srt_path = output_dir / "transcript.srt"
-    srt_path.write_text(_format_srt(result["segments"]))
+    with open(srt_path, "w") as f:
+        _write_srt(f, result["segments"])
 
-    # Save JSON (full result)
+    # Save JSON, streamed to disk rather than built as one string
     json_path = output_dir / "transcript.json"
-    json_path.write_text(json.dumps(result, indent=2, default=str))
+    with open(json_path, "w") as f:
+        if full is not None:
+            json.dump(full, f, indent=2, default=str)
+        else:
+            _write_compact_json(f, result)
+    del full
 
     segment_count = len(result.get("segments", []))
-    print(f"  Transcription complete: {segment_count} segments")
-    return result
+    logger.info(f"  Transcription complete: {segment_count} segments")
 
 
-def _transcribe_openai(audio_path: Path, model_size: str) -> dict:
-    """Transcribe using openai-whisper (PyTorch backend)."""
-    import whisper
+def transcribe_chunk(
+    audio_path: Path,
+    start_s: float,
+    end_s: float,
+    work_dir: Path,
+    model_size: str = "medium",
+    control: StageControl | None = None,
+    options: WhisperOptions | None = None,
+    word_timestamps: bool = False,
+) -> dict:
+    """Transcribe [start_s, end_s) of an audio file, with times in the full file.
 
-    print(f"Loading Whisper model '{model_size}' (openai-whisper)...")
-    model = whisper.load_model(model_size)
+    The range is cut to a temporary WAV in work_dir first. Chunks are cut at
+    fixed times, so a word spoken across a cut may be split or lost.
+    Returns a compact result dict like transcribe(); nothing else is saved.
+    """
+    from vidwise.runner import run_tool
 
-    print("Transcribing audio (this may take a while)...")
-    result = model.transcribe(str(audio_path), language="en")
+    chunk_path = work_dir / f"chunk-{start_s:09.3f}.wav"
+    cmd = [
+        "ffmpeg",
+        "-ss", f"{start_s:.3f}",
+        "-t", f"{end_s - start_s:.3f}",
+        "-i", str(audio_path),
+        "-acodec", "pcm_s16le",
+        "-ar", "16000",
+        "-ac", "1",
+        str(chunk_path),
+        "-y",
+    ]
+    run_tool(cmd, "cutting audio chunk", control)
+    try:
+        result, _ = _run_backend(chunk_path, model_size, False, control, options, word_timestamps)
+    finally:
+        chunk_path.unlink(missing_ok=True)
+    result["segments"] = [seg.shifted(start_s) for seg in result["segments"]]
     return result
 
 
-def _transcribe_faster(audio_path: Path, model_size: str) -> dict:
-    """Transcribe using faster-whisper (CTranslate2 backend)."""
-    from faster_whisper import WhisperModel
+def merge_chunks(chunks: list[dict]) -> dict:
+    """Join chunk results (in time order) into one transcript result."""
+    segments = [seg for chunk in chunks for seg in chunk["segments"]]
+    text = " ".join(chunk["text"].strip() for chunk in chunks if chunk["text"].strip())
+    language = next((chunk.get("language") for chunk in chunks if chunk.get("language")), None)
+    return {"text": text, "segments": segments, "language": language}
+
+
+def load_transcript(path: Path) -> dict:
+    """Read a compact transcript JSON back into a result dict of Segments."""
+    data = json.loads(path.read_text())
+    data["segments"] = [Segment.from_dict(seg) for seg in data.get("segments", [])]
+    return data
+
+
+def _transcribe_openai(
+    audio_path: Path,
+    model_size: str,
+    full_json: bool = False,
+    options: WhisperOptions = WhisperOptions(),
+    word_timestamps: bool = False,
+) -> tuple[dict, dict | None]:
+    """Transcribe using openai-whisper (PyTorch backend).
 
-    print(f"Loading Whisper model '{model_size}' (faster-whisper)...")
-    model = WhisperModel(model_size, device="auto", compute_type="default")
+    Returns (compact_result, full_result_or_None).
+    """
+    model = load_openai_model(model_size, options)
+
+    logger.info("Transcribing audio (this may take a while)...")
+    full = model.transcribe(
+        str(audio_path),
+        language="en",
+        fp16=model.device.type != "cpu",
+        word_timestamps=word_timestamps,
+    )
+    result = {
+        "text": full["text"],
+        "segments": [
+            Segment(seg["start"], seg["end"], seg["text"], _openai_words(seg, word_timestamps))
+            for seg in full["segments"]
+        ],
+        "language": full.get("language"),
+    }
+    return result, full if full_json else None
+
+
+def _transcribe_faster(
+    audio_path: Path,
+    model_size: str,
+    full_json: bool = False,
+    control: StageControl | None = None,
+    options: WhisperOptions = WhisperOptions(),
+    word_timestamps: bool = False,
+) -> tuple[dict, dict | None]:
+    """Transcribe using faster-whisper (CTranslate2 backend).
+
+    Returns (compact_result, full_result_or_None).
+    """
+    model = load_faster_model(model_size, options)
 
-    print("Transcribing audio (this may take a while)...")
-    segments_iter, info = model.transcribe(str(audio_path), language="en")
+    logger.info("Transcribing audio (this may take a while)...")
+    segments_iter, info = _faster_transcribe(model, str(audio_path), options, word_timestamps)
 
-    # Convert faster-whisper segments to the same format as openai-whisper
+    # Segments are generated lazily; keep only the compact fields
     segments = []
+    full_segments = [] if full_json else None
     full_text_parts = []
     for seg in segments_iter:
-        segments.append({
-            "start": seg.start,
-            "end": seg.end,
-            "text": seg.text,
-        })
+        words = None
+        if word_timestamps and seg.words is not None:
+            words = Words((w.start, w.end, w.word) for w in seg.words)
+        segments.append(Segment(seg.start, seg.end, seg.text, words))
+        if full_segments is not None:
+            full_segments.append(_segment_fields(seg))
         full_text_parts.append(seg.text.strip())
+        if control:
+            control.update(seg.end, info.duration)
 
-    return {
+    result = {
         "text": " ".join(full_text_parts),
         "segments": segments,
         "language": info.language,
     }
+    full = None
+    if full_segments is not None:
+        full = {**result, "segments": full_segments}
+    return result, full
+
+
+def load_faster_model(model_size: str, options: WhisperOptions = WhisperOptions()):
+    """Load (or reuse) a faster-whisper model with the given options."""
+    return _load_faster_model(
+        model_size, options.compute_type, options.cpu_threads, options.num_workers
+    )
+
+
+def load_openai_model(model_size: str, options: WhisperOptions = WhisperOptions()):
+    """Load (or reuse) an openai-whisper model, int8-quantized on CPU if asked."""
+    return _load_openai_model(model_size, options.compute_type, options.cpu_threads)
+
+
+# Cached on the settings that affect loading only, so e.g. a new batch size
+# reuses the loaded model
+@functools.lru_cache(maxsize=2)
+def _load_faster_model(model_size: str, compute_type: str, cpu_threads: int, num_workers: int):
+    from faster_whisper import WhisperModel
+
+    logger.info(f"Loading Whisper model '{model_size}' (faster-whisper, {compute_type})...")
+    return WhisperModel(
+        model_size,
+        device="auto",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers,
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def _load_openai_model(model_size: str, compute_type: str, cpu_threads: int):
+    import torch
+    import whisper
+
+    if cpu_threads:
+        torch.set_num_threads(cpu_threads)
+    logger.info(f"Loading Whisper model '{model_size}' (openai-whisper)...")
+    model = whisper.load_model(model_size)
+    if compute_type == "int8" and model.device.type == "cpu":
+        model = quantize_int8(model)
+    return model
+
+
+def quantize_int8(model):
+    """Dynamic int8 quantization of an openai-whisper model's linear layers.
+
+    quantize_dynamic matches module types exactly, and whisper's layers are
+    its own torch.nn.Linear subclass, so they are swapped for plain
+    torch.nn.Linear layers (sharing the weights) first.
+    """
+    import torch
+    from whisper.model import Linear as WhisperLinear
 
+    for parent in list(model.modules()):
+        for name, child in list(parent.named_children()):
+            if type(child) is WhisperLinear:
+                plain = torch.nn.Linear(
+                    child.in_features, child.out_features, bias=child.bias is not None,
+                    device="meta",
+                )
+                plain.weight, plain.bias = child.weight, child.bias
+                setattr(parent, name, plain)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
 
-def _format_srt(segments: list[dict]) -> str:
-    """Convert Whisper segments to SRT subtitle format."""
-    lines = []
+
+def _faster_transcribe(model, audio, options: WhisperOptions, word_timestamps: bool = False):
+    """Transcribe with faster-whisper, batched if options.batch_size is set."""
+    if options.batch_size:
+        try:
+            from faster_whisper import BatchedInferencePipeline
+        except ImportError:  # faster-whisper < 1.1
+            logger.warning("  Batched inference needs faster-whisper>=1.1; decoding sequentially")
+        else:
+            pipeline = BatchedInferencePipeline(model=model)
+            return pipeline.transcribe(
+                audio,
+                language="en",
+                batch_size=options.batch_size,
+                word_timestamps=word_timestamps,
+            )
+    return model.transcribe(audio, language="en", word_timestamps=word_timestamps)
+
+
+def _openai_words(seg: dict, word_timestamps: bool) -> Words | None:
+    if not word_timestamps or "words" not in seg:
+        return None
+    return Words((w["start"], w["end"], w["word"]) for w in seg["words"])
+
+
+def _segment_fields(seg) -> dict:
+    """All fields of a faster-whisper segment (a dataclass or namedtuple)."""
+    import dataclasses
+
+    if dataclasses.is_dataclass(seg):
+        return dataclasses.asdict(seg)
+    return seg._asdict()
+
+
+def _write_compact_json(f: TextIO, result: dict) -> None:
+    """Write a compact transcript, one segment per line."""
+    f.write('{"text": ' + json.dumps(result["text"]))
+    f.write(', "language": ' + json.dumps(result.get("language")))
+    f.write(', "segments": [')
+    for i, seg in enumerate(result["segments"]):
+        f.write(",\n" if i else "\n")
+        f.write(json.dumps(_as_dict(seg)))
+    f.write("\n]}\n")
+
+
+def _as_dict(seg: Segment | dict) -> dict:
+    if isinstance(seg, Segment):
+        return seg.to_dict()
+    d = {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+    if seg.get("words") is not None:
+        d["words"] = seg["words"]
+    return d
+
+
+def _write_srt(f: TextIO, segments: list[Segment]) -> None:
+    """Write Whisper segments in SRT subtitle format, one cue at a time."""
     for i, seg in enumerate(segments, 1):
         start = _format_timestamp_srt(seg["start"])
         end = _format_timestamp_srt(seg["end"])
         text = seg["text"].strip()
-        lines.append(f"{i}\n{start} --> {end}\n{text}\n")
-    return "\n".join(lines)
+        if i > 1:
+            f.write("\n")
+        f.write(f"{i}\n{start} --> {end}\n{text}\n")
 
 
 def _format_timestamp_srt(seconds: float) -> str:
@@ -110,8 +489,8 @@ def _format_timestamp_srt(seconds: float) -> str:
 
 
 def segments_for_timerange(
-    segments: list[dict], start_s: float, end_s: float
-) -> list[dict]:
+    segments: list[Segment], start_s: float, end_s: float
+) -> list[Segment]:
     """Filter transcript segments that overlap with a time range."""
     return [
         seg for seg in segments
@@ -119,6 +498,55 @@ def segments_for_timerange(
     ]
 
 
-def segments_to_text(segments: list[dict]) -> str:
+def segments_to_text(segments: list[Segment]) -> str:
     """Join a list of segments into plain text."""
     return " ".join(seg["text"].strip() for seg in segments)
+
+
+def transcript_for_timerange(segments: list[Segment], start_s: float, end_s: float) -> str:
+    """Text spoken between start_s and end_s.
+
+    Segments with word timestamps contribute only the words whose midpoint
+    falls in [start_s, end_s), so adjacent ranges never share a word.
+    Segments without them are included whole if they overlap the range.
+    """
+    parts = []
+    for seg in segments_for_timerange(segments, start_s, end_s):
+        words = seg.get("words")
+        if words is None:
+            text = seg["text"].strip()
+        else:
+            text = "".join(w for s, e, w in words if start_s <= (s + e) / 2 < end_s).strip()
+        if text:
+            parts.append(text)
+    return " ".join(parts)
+
+
+def word_segments(segments: list[Segment]) -> list[Segment]:
+    """Split segments with word timestamps into one Segment per word.
+
+    Used for batch planning, so token costs and cut points follow the words.
+    """
+    split = []
+    for seg in segments:
+        words = seg.get("words")
+        if words is None:
+            split.append(seg)
+        else:
+            split.extend(Segment(s, e, w) for s, e, w in words)
+    return split
+
+
+def transcript_excerpt(text: str, max_chars: int, windows: int = 6) -> str:
+    """Shorten text to max_chars by sampling evenly spaced windows.
+
+    Unlike a plain prefix, the excerpt covers the start, middle and end.
+    """
+    if len(text) <= max_chars:
+        return text
+    sep = " … "
+    if max_chars < windows * (len(sep) + 1):
+        return text[:max_chars]  # Too short to sample
+    width = max(1, (max_chars - len(sep) * (windows - 1)) // windows)
+    step = (len(text) - width) / max(1, windows - 1)
+    return sep.join(text[int(i * step) : int(i * step) + width].strip() for i in range(windows))
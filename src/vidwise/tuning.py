@@ -0,0 +1,129 @@
+"""Pick the fastest Whisper settings for this host, once.
+
+With ``compute_type="auto"``, the first transcription on a host times each
+candidate configuration (compute type, batching) on a short sample of the
+audio and remembers the winner in ~/.vidwise/whisper-tuning.json (override
+with $VIDWISE_TUNING). Later runs with the same model reuse that choice.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+
+from vidwise.transcriber import (
+    WhisperOptions,
+    _faster_transcribe,
+    load_faster_model,
+    load_openai_model,
+)
+
+logger = logging.getLogger(__name__)
+
+TUNING_ENV = "VIDWISE_TUNING"
+SAMPLE_SECONDS = 30
+SAMPLE_RATE = 16000
+
+
+def tuning_path() -> Path:
+    """Where tuning results are stored: $VIDWISE_TUNING or ~/.vidwise/whisper-tuning.json."""
+    return Path(os.environ.get(TUNING_ENV) or Path.home() / ".vidwise" / "whisper-tuning.json")
+
+
+def host_key(model_size: str, faster: bool) -> str:
+    """Identify a host, backend and model; tuning results are stored per key."""
+    backend = "faster-whisper" if faster else "openai-whisper"
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()} cpus|{backend}|{model_size}"
+
+
+def tuned_options(
+    model_size: str, audio_path: Path, base: WhisperOptions, faster: bool
+) -> WhisperOptions:
+    """Return the remembered fastest options, benchmarking them if needed.
+
+    Explicit cpu_threads and num_workers from base are kept.
+    """
+    path = tuning_path()
+    key = host_key(model_size, faster)
+    results = json.loads(path.read_text()) if path.exists() else {}
+    if key in results:
+        return replace(base, **results[key]["options"])
+
+    logger.info(f"Benchmarking Whisper settings for this host (once, model '{model_size}')...")
+    timings = benchmark(model_size, audio_path, candidates(base, faster), faster)
+    best = min(timings, key=lambda t: t[1])[0]
+    for options, seconds in timings:
+        marker = "  <- fastest" if options is best else ""
+        logger.info(f"  {_describe(options):<32} {seconds:7.2f}s{marker}")
+
+    chosen = {"compute_type": best.compute_type, "batch_size": best.batch_size}
+    results[key] = {
+        "options": chosen,
+        "timings": [{**asdict(o), "seconds": round(s, 3)} for o, s in timings],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return replace(base, **chosen)
+
+
+def candidates(base: WhisperOptions, faster: bool) -> list[WhisperOptions]:
+    """Configurations worth timing on this host."""
+    if not faster:
+        return [replace(base, compute_type=c, batch_size=0) for c in ("float32", "int8")]
+
+    import ctranslate2
+
+    device = "cuda" if ctranslate2.get_cuda_device_count() else "cpu"
+    supported = ctranslate2.get_supported_compute_types(device)
+    preferred = ("int8_float16", "float16", "int8") if device == "cuda" else ("int8", "float32")
+    compute_types = [c for c in preferred if c in supported] or ["default"]
+    return [
+        replace(base, compute_type=c, batch_size=b) for c in compute_types for b in (0, 8)
+    ]
+
+
+def benchmark(
+    model_size: str, audio_path: Path, options: list[WhisperOptions], faster: bool
+) -> list[tuple[WhisperOptions, float]]:
+    """Time transcription of the first SAMPLE_SECONDS of audio with each option set.
+
+    Model loading is not timed.
+    """
+    if faster:
+        from faster_whisper import decode_audio
+
+        sample = decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+    else:
+        import whisper
+
+        sample = whisper.load_audio(str(audio_path))
+    sample = sample[: SAMPLE_SECONDS * SAMPLE_RATE]
+
+    timings = []
+    for opts in options:
+        if faster:
+            model = load_faster_model(model_size, opts)
+        else:
+            model = load_openai_model(model_size, opts)
+        start = time.perf_counter()
+        _run(model, sample, opts, faster)
+        timings.append((opts, time.perf_counter() - start))
+    return timings
+
+
+def _run(model, sample, options: WhisperOptions, faster: bool) -> None:
+    if faster:
+        segments, _ = _faster_transcribe(model, sample, options)
+        list(segments)  # Segments are decoded lazily
+    else:
+        model.transcribe(sample, language="en", fp16=model.device.type != "cpu")
+
+
+def _describe(options: WhisperOptions) -> str:
+    batching = f"batch {options.batch_size}" if options.batch_size else "sequential"
+    return f"{options.compute_type}, {batching}"
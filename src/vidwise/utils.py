@@ -15,21 +15,29 @@ def check_dependency(name: str, install_hint: str) -> bool:
     return True
 
 
-def timestamp_label(seconds: int) -> str:
-    """Convert seconds to a human-readable timestamp label like '2m30s'."""
-    mins = seconds // 60
-    secs = seconds % 60
-    return f"{mins}m{secs:02d}s"
+def timestamp_label(seconds: float) -> str:
+    """Convert seconds to a human-readable timestamp label like '2m30s'.
 
+    Fractional seconds keep millisecond precision: '2m30.500s'.
+    """
+    mins = int(seconds // 60)
+    secs = seconds - mins * 60
+    if secs == int(secs):
+        return f"{mins}m{int(secs):02d}s"
+    return f"{mins}m{secs:06.3f}s"
 
-def seconds_from_label(label: str) -> int | None:
-    """Parse a timestamp label like '2m30s' back to seconds."""
+
+def seconds_from_label(label: str) -> int | float | None:
+    """Parse a timestamp label like '2m30s' or '2m30.500s' back to seconds."""
     import re
 
-    match = re.search(r"(\d+)m(\d+)s", label)
+    match = re.search(r"(\d+)m(\d+)(\.\d+)?s", label)
     if not match:
         return None
-    return int(match.group(1)) * 60 + int(match.group(2))
+    seconds = int(match.group(1)) * 60 + int(match.group(2))
+    if match.group(3):
+        return seconds + float(match.group(3))
+    return seconds
 
 
 def derive_output_name(source: str) -> str:
@@ -0,0 +1,368 @@
+"""Work queue on shared storage (SQLite) with leases, heartbeats and retries.
+
+Many worker processes, on one or many machines, open the same queue file.
+A worker claims a task by taking a lease on it, keeps the lease alive with
+heartbeats while it works, and then completes or fails the task:
+
+- A task whose lease expires (its worker crashed or lost the network) can be
+  claimed again by any worker.
+- A failed task is retried after a delay that grows with each attempt, until
+  it has used up max_attempts; then it and every task waiting on it fail.
+- A task can wait on other tasks (``after``), and is only claimed once they
+  are all done.
+- Tasks with a key are added once; adding the same key again returns the
+  existing task, so re-running a coordinator or a retried task is safe.
+  requeue_failed() gives failed tasks a fresh set of attempts.
+
+The queue uses SQLite's rollback journal rather than WAL, which needs shared
+memory and does not work across machines. Put the file on storage with
+working file locks (a local disk, or NFSv4/SMB with locking enabled), and
+keep worker clocks roughly in sync, since leases are wall-clock times.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 120
+RETRY_DELAY = 30  # Seconds before a failed task's first retry; grows linearly
+MAX_ATTEMPTS = 3
+BUSY_TIMEOUT = 60  # Seconds to wait for another worker's write lock
+
+STATUSES = ("pending", "running", "done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    worker TEXT,
+    lease_until REAL,
+    error TEXT,
+    result TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks(status, available_at);
+CREATE TABLE IF NOT EXISTS deps (
+    task_id INTEGER NOT NULL REFERENCES tasks(id),
+    needs_id INTEGER NOT NULL REFERENCES tasks(id),
+    PRIMARY KEY (task_id, needs_id)
+);
+CREATE INDEX IF NOT EXISTS deps_needs ON deps(needs_id);
+"""
+
+# Claimable: pending and due, or running with an expired lease; all dependencies done
+_CLAIMABLE = """
+SELECT id, attempts, max_attempts, status FROM tasks
+WHERE ((status = 'pending' AND available_at <= :now)
+       OR (status = 'running' AND lease_until < :now))
+  AND NOT EXISTS (
+      SELECT 1 FROM deps JOIN tasks AS needed ON needed.id = deps.needs_id
+      WHERE deps.task_id = tasks.id AND needed.status != 'done')
+ORDER BY id
+LIMIT 1
+"""
+
+
+@dataclass
+class Task:
+    """A claimed task."""
+
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    worker: str
+
+
+class WorkQueue:
+    """One connection to a queue file. Not shared between threads."""
+
+    def __init__(self, path: Path, retry_delay: float = RETRY_DELAY):
+        self.path = path
+        self.retry_delay = retry_delay
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> WorkQueue:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(
+        self,
+        kind: str,
+        payload: dict,
+        key: str | None = None,
+        after: Iterable[int] = (),
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> int:
+        """Queue a task, to run once the tasks in ``after`` are done.
+
+        If a task with this key exists, nothing is added and its id is returned.
+        A task waiting on one that has already failed is added as failed.
+        """
+        now = time.time()
+        with self._transaction():
+            if key is not None:
+                row = self.conn.execute("SELECT id FROM tasks WHERE key = ?", (key,)).fetchone()
+                if row:
+                    return row[0]
+            task_id = self.conn.execute(
+                "INSERT INTO tasks (key, kind, payload, max_attempts, available_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(payload), max_attempts, now, now),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO deps (task_id, needs_id) VALUES (?, ?)",
+                [(task_id, needed) for needed in after],
+            )
+            self._fail_if_blocked(task_id, now)
+        return task_id
+
+    def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Task | None:
+        """Lease the oldest claimable task to worker, or return None."""
+        while True:
+            now = time.time()
+            with self._transaction():
+                row = self.conn.execute(_CLAIMABLE, {"now": now}).fetchone()
+                if row is None:
+                    return None
+                task_id, attempts, max_attempts, status = row
+                if attempts >= max_attempts:
+                    # Its last worker died holding the lease; there are no attempts left
+                    self._fail_permanently(task_id, "lease expired on the final attempt", now)
+                    continue
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'running', attempts = attempts + 1, worker = ?,"
+                    " lease_until = ?, updated_at = ? WHERE id = ?",
+                    (worker, now + lease, now, task_id),
+                )
+                kind, payload = self.conn.execute(
+                    "SELECT kind, payload FROM tasks WHERE id = ?", (task_id,)
+                ).fetchone()
+            if status == "running":
+                logger.info(f"  Task {task_id} ({kind}): previous lease expired, reclaimed")
+            return Task(task_id, kind, json.loads(payload), attempts + 1, worker)
+
+    def heartbeat(self, task: Task, lease: float = LEASE_SECONDS) -> bool:
+        """Extend the lease; False if the task is no longer this worker's."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE tasks SET lease_until = ?, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = 'running' AND attempts = ?",
+                (now + lease, now, task.id, task.worker, task.attempts),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task: Task, result: dict | None = None) -> bool:
+        """Mark the task done; False if its lease was lost to another worker."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, error = NULL, lease_until = NULL,"
+                " updated_at = ? WHERE id = ? AND worker = ? AND status = 'running'"
+                " AND attempts = ?",
+                (json.dumps(result), now, task.id, task.worker, task.attempts),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, task: Task, error: str, retry: bool = True) -> str:
+        """Record a failure; the task is retried while attempts remain.
+
+        Returns the task's new status ("pending" or "failed"), or "lost" if
+        its lease had already passed to another worker.
+        """
+        now = time.time()
+        with self._transaction():
+            row = self.conn.execute(
+                "SELECT max_attempts FROM tasks"
+                " WHERE id = ? AND worker = ? AND status = 'running' AND attempts = ?",
+                (task.id, task.worker, task.attempts),
+            ).fetchone()
+            if row is None:
+                return "lost"
+            if retry and task.attempts < row[0]:
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'pending', error = ?, lease_until = NULL,"
+                    " available_at = ?, updated_at = ? WHERE id = ?",
+                    (error, now + self.retry_delay * task.attempts, now, task.id),
+                )
+                return "pending"
+            self._fail_permanently(task.id, error, now)
+            return "failed"
+
+    def release(self, task: Task) -> None:
+        """Give a task back without using up an attempt (e.g. on shutdown)."""
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE tasks SET status = 'pending', attempts = attempts - 1,"
+                " lease_until = NULL, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = 'running' AND attempts = ?",
+                (now, task.id, task.worker, task.attempts),
+            )
+
+    def requeue_failed(self, keys: Iterable[str] | None = None) -> int:
+        """Make failed tasks pending again with a fresh set of attempts.
+
+        With keys, only tasks with one of these keys, or a key starting with
+        one of them plus "#" (tasks derived from them), are requeued.
+        Returns how many tasks were requeued.
+        """
+        now = time.time()
+        with self._transaction():
+            failed = self.conn.execute(
+                "SELECT id, key FROM tasks WHERE status = 'failed' ORDER BY id"
+            ).fetchall()
+            if keys is not None:
+                wanted = set(keys)
+                failed = [
+                    (task_id, key) for task_id, key in failed
+                    if key is not None and key.split("#", 1)[0] in wanted
+                ]
+            self.conn.executemany(
+                "UPDATE tasks SET status = 'pending', attempts = 0, error = NULL, worker = NULL,"
+                " available_at = ?, updated_at = ? WHERE id = ?",
+                [(now, now, task_id) for task_id, _ in failed],
+            )
+            for task_id, _ in failed:
+                self._fail_if_blocked(task_id, now)
+        return len(failed)
+
+    def counts(self) -> dict[str, int]:
+        """Number of tasks per status."""
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, n in self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            counts[status] = n
+        return counts
+
+    def tasks(self, ids: list[int] | None = None) -> list[dict]:
+        """All tasks (or those in ids) as dicts, in id order."""
+        query = (
+            "SELECT id, key, kind, status, attempts, max_attempts, worker, error, result"
+            " FROM tasks ORDER BY id"
+        )
+        fields = ("id", "key", "kind", "status", "attempts", "max_attempts", "worker",
+                  "error", "result")
+        rows = [dict(zip(fields, row)) for row in self.conn.execute(query)]
+        for row in rows:
+            row["result"] = json.loads(row["result"]) if row["result"] else None
+        if ids is not None:
+            wanted = set(ids)
+            rows = [row for row in rows if row["id"] in wanted]
+        return rows
+
+    def _fail_permanently(self, task_id: int, error: str, now: float) -> None:
+        """Fail a task and, transitively, every unfinished task waiting on it."""
+        self.conn.execute(
+            "UPDATE tasks SET status = 'failed', error = ?, lease_until = NULL, updated_at = ?"
+            " WHERE id = ?",
+            (error, now, task_id),
+        )
+        waiting = self.conn.execute(
+            "SELECT deps.task_id FROM deps JOIN tasks ON tasks.id = deps.task_id"
+            " WHERE deps.needs_id = ? AND tasks.status IN ('pending', 'running')",
+            (task_id,),
+        ).fetchall()
+        for (dependent,) in waiting:
+            self._fail_permanently(dependent, f"task {task_id} failed", now)
+
+    def _fail_if_blocked(self, task_id: int, now: float) -> None:
+        """Fail a pending task at once if something it waits on has failed."""
+        row = self.conn.execute(
+            "SELECT needed.id FROM deps JOIN tasks AS needed ON needed.id = deps.needs_id"
+            " WHERE deps.task_id = ? AND needed.status = 'failed' LIMIT 1",
+            (task_id,),
+        ).fetchone()
+        if row is not None:
+            self._fail_permanently(task_id, f"task {row[0]} failed", now)
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error.
+
+    Taking the write lock up front keeps two workers from claiming one task.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> None:
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class Heartbeat:
+    """Keeps a task's lease alive from a background thread.
+
+    Calls on_lost (once) if the lease turns out to belong to someone else,
+    e.g. after this worker stalled past its lease. Use as a context manager
+    around the task's work.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        task: Task,
+        lease: float = LEASE_SECONDS,
+        on_lost: Callable[[], None] | None = None,
+    ):
+        self.path = path
+        self.task = task
+        self.lease = lease
+        self.on_lost = on_lost
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, daemon=True)
+
+    def __enter__(self) -> Heartbeat:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _beat(self) -> None:
+        # SQLite connections can't be shared between threads; this one is the thread's own
+        queue = WorkQueue(self.path)
+        try:
+            while not self._stop.wait(self.lease / 3):
+                try:
+                    alive = queue.heartbeat(self.task, self.lease)
+                except sqlite3.Error:
+                    continue  # Storage hiccup; try again before the lease runs out
+                if not alive:
+                    self.lost = True
+                    if self.on_lost is not None:
+                        self.on_lost()
+                    return
+        finally:
+            queue.close()
@@ -0,0 +1,101 @@
+"""Deterministic stand-in for an OpenAI-compatible local model server."""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_completion(messages: list[dict]) -> dict:
+    """Answer a chat request from its contents alone."""
+    system = messages[0]["content"]
+    content = messages[-1]["content"]
+    if isinstance(content, list):
+        text = "".join(part.get("text", "") for part in content if part["type"] == "text")
+    else:
+        text = content
+
+    if "segment analyses" in system:
+        count = len(json.loads(text.split("\n")[1]))
+        return {
+            "title": "Fake Video",
+            "overview": f"Condensed from {count} analyses.",
+            "key_takeaways": ["deterministic"],
+        }
+
+    time_range = re.search(r"Time range: (.*)", text).group(1)
+    filenames = re.search(r"Frame filenames: (.*)", text).group(1).split(", ")
+    return {
+        "summary": f"Segment {time_range}",
+        "key_frames": [{"filename": f, "description": f"Shows {f}"} for f in filenames],
+        "narrative": text.split("Transcript:\n")[1].split("\n\n")[0],
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        answer = json.dumps(fake_completion(body["messages"]))
+        usage = {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i in range(0, len(answer), 8):
+                self._event({"choices": [{"index": 0, "delta": {"content": answer[i : i + 8]}}]})
+            self._event({"choices": [], "usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        payload = json.dumps({
+            "id": "fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _event(self, chunk: dict) -> None:
+        chunk = {"id": "fake", "object": "chat.completion.chunk", "created": 0,
+                 "model": "fake", **chunk}
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOpenAIServer:
+    """Serve /v1/chat/completions on a free localhost port for the `with` block."""
+
+    def __enter__(self) -> FakeOpenAIServer:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.requests = []
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    @property
+    def requests(self) -> list[dict]:
+        return self._server.requests
@@ -0,0 +1,37 @@
+import shutil
+
+import pytest
+
+from vidwise.bench import compare
+
+
+def _report(**stages):
+    return {"cases": {"slides-30s": {"stages": stages}}}
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = _report(extract_all=1.0, guide=0.01, select_key_frames=2.0)
+    current = _report(extract_all=1.5, guide=0.04, select_key_frames=2.2)
+    regressions = compare(current, baseline, tolerance=0.25)
+    # guide is 4x slower but below the noise floor; select_key_frames is within tolerance
+    assert regressions == ["slides-30s extract_all: 1.500s vs 1.000s baseline (+50%)"]
+
+
+def test_compare_ignores_cases_missing_from_baseline():
+    assert compare(_report(extract_all=9.0), {"cases": {}}) == []
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_run_benchmarks_on_synthetic_video(tmp_path):
+    pytest.importorskip("numpy")
+    from vidwise.bench import run_benchmarks
+
+    stale = tmp_path / "slides-6s" / "stale.txt"
+    stale.parent.mkdir()
+    stale.write_text("left over")
+    report = run_benchmarks(tmp_path, ["slides"], [6], whisper_model=None, repeat=2)
+    case = report["cases"]["slides-6s"]
+    assert case["frames"] == 3
+    assert set(case["stages"]) == {"extract_all", "select_key_frames", "batch_frames", "guide"}
+    assert (tmp_path / "slides-6s" / "guide.md").exists()
+    assert not stale.exists()
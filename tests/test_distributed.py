@@ -0,0 +1,101 @@
+import datetime
+import shutil
+import subprocess
+
+import pytest
+
+from vidwise.distributed import enqueue_videos, run_worker
+from vidwise.transcriber import Segment, WhisperOptions
+from vidwise.workqueue import WorkQueue
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg/ffprobe not installed",
+)
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "talk.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=duration=6:size=160x90:rate=5",
+         "-f", "lavfi", "-i", "sine=duration=6", "-shortest",
+         "-pix_fmt", "yuv420p", str(path), "-y"],
+        check=True, capture_output=True,
+    )
+    return path
+
+
+def test_worker_writes_standard_output_layout(tmp_path, video, monkeypatch):
+    def transcribe(audio_path, output_dir, **kwargs):
+        (output_dir / "transcript.txt").write_text("hello\n")
+        return {"text": "hello", "segments": [Segment(0.0, 1.0, " hello")]}
+
+    monkeypatch.setattr("vidwise.transcriber.transcribe", transcribe)
+    queue_path = tmp_path / "queue.db"
+    with WorkQueue(queue_path) as queue:
+        ids = enqueue_videos(
+            queue, [str(video)], tmp_path / "out",
+            {"provider": None, "whisper_options": WhisperOptions(compute_type="int8")},
+        )
+        assert enqueue_videos(queue, [str(video)], tmp_path / "out", {"provider": None}) == ids
+
+    assert run_worker(queue_path, exit_when_idle=True, poll=0.1) == 1
+    (out,) = (tmp_path / "out").iterdir()
+    assert out.name.startswith("vidwise-talk-")
+    assert (out / "audio.wav").exists() and (out / "transcript.txt").exists()
+    assert list((out / "frames").glob("frame_*.png"))
+    with WorkQueue(queue_path) as queue:
+        assert queue.tasks(ids)[0]["status"] == "done"
+
+
+def test_chunked_transcription_is_merged(tmp_path, video, monkeypatch):
+    def transcribe_chunk(audio_path, start_s, end_s, work_dir, **kwargs):
+        seg = Segment(start_s + 0.5, end_s, f" from {start_s:g}")
+        return {"text": seg.text, "segments": [seg], "language": "en"}
+
+    monkeypatch.setattr("vidwise.transcriber.transcribe_chunk", transcribe_chunk)
+    queue_path = tmp_path / "queue.db"
+    with WorkQueue(queue_path) as queue:
+        enqueue_videos(queue, [str(video)], tmp_path / "out", {"provider": None},
+                       chunk_seconds=2.5)
+
+    # video, three chunks (0, 2.5, 5 s) and finish
+    assert run_worker(queue_path, exit_when_idle=True, poll=0.1) == 5
+    (out,) = (tmp_path / "out").iterdir()
+    assert (out / "transcript.txt").read_text() == "from 0 from 2.5 from 5\n"
+    assert "00:00:03,000 --> 00:00:05,000" in (out / "transcript.srt").read_text()
+    assert not (out / "transcript-chunks").exists()
+    with WorkQueue(queue_path) as queue:
+        assert {t["status"] for t in queue.tasks()} == {"done"}
+
+
+def test_failing_task_is_marked_failed(tmp_path, monkeypatch):
+    queue_path = tmp_path / "queue.db"
+    with WorkQueue(queue_path) as queue:
+        (task_id,) = enqueue_videos(queue, [str(tmp_path / "missing.mp4")], tmp_path / "out",
+                                    {"provider": None}, max_attempts=1)
+
+    run_worker(queue_path, exit_when_idle=True, poll=0.1)
+    with WorkQueue(queue_path) as queue:
+        task = queue.tasks([task_id])[0]
+    assert task["status"] == "failed" and task["attempts"] == 1
+    assert "missing.mp4" in task["error"]
+
+
+def test_source_is_keyed_across_days_and_retried_on_request(tmp_path, monkeypatch):
+    source = str(tmp_path / "missing.mp4")
+    with WorkQueue(tmp_path / "queue.db") as queue:
+        (task_id,) = enqueue_videos(queue, [source], tmp_path / "out", max_attempts=1)
+        queue.fail(queue.claim("w1"), "boom")
+        monkeypatch.setattr("datetime.date", _Tomorrow)
+        assert enqueue_videos(queue, [source], tmp_path / "out") == [task_id]
+        assert queue.tasks([task_id])[0]["status"] == "failed"
+        enqueue_videos(queue, [source], tmp_path / "out", retry_failed=True)
+        assert queue.tasks([task_id])[0]["status"] == "pending"
+
+
+class _Tomorrow(datetime.date):
+    @classmethod
+    def today(cls):
+        return super().today() + datetime.timedelta(days=1)
@@ -0,0 +1,54 @@
+import io
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from vidwise.errors import VidwiseError
+from vidwise.extractor import PNG_SIGNATURE, _split_png_stream, split_timeline
+
+
+def test_split_timeline_aligns_to_interval():
+    assert split_timeline(100, 2, 4) == [(0, 26), (26, 26), (52, 26), (78, None)]
+    assert split_timeline(3, 2, 8) == [(0, 2), (2, None)]
+    assert split_timeline(10, 0.5, 2) == [(0, 5.0), (5.0, None)]
+    assert [start for start, _ in split_timeline(30, 0.1, 30)] == [i * 10 * 0.1 for i in range(30)]
+
+
+def test_png_stream_split_rejects_truncated_frames():
+    png = PNG_SIGNATURE + _chunk(b"IHDR", b"\0" * 13) + _chunk(b"IEND", b"")
+    assert list(_split_png_stream(io.BytesIO(png * 2))) == [png, png]
+    for cut in (len(png) + 3, len(png) + 12, len(png) * 2 - 2):
+        with pytest.raises(VidwiseError):
+            list(_split_png_stream(io.BytesIO((png * 2)[:cut])))
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + b"\0" * 4
+
+
+@pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg/ffprobe not installed",
+)
+def test_parallel_extraction_matches_serial(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from vidwise.extractor import extract_frames
+
+    video = tmp_path / "testsrc.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=duration=21:size=320x180:rate=25",
+         "-pix_fmt", "yuv420p", str(video), "-y"],
+        check=True, capture_output=True,
+    )
+    (tmp_path / "serial").mkdir()
+    (tmp_path / "parallel").mkdir()
+
+    serial = extract_frames(video, tmp_path / "serial", interval=2)
+    parallel = extract_frames(video, tmp_path / "parallel", interval=2, workers=3)
+
+    assert [f.name for f in parallel] == [f.name for f in serial]
+    assert len(list((tmp_path / "parallel" / "frames").iterdir())) == len(serial)
+    for a, b in zip(serial, parallel):
+        assert Image.open(a).tobytes() == Image.open(b).tobytes(), a.name
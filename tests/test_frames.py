@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from vidwise.frames import (
+    batch_bounds,
+    estimate_image_tokens,
+    plan_batches,
+    time_range_for_batch,
+)
+
+
+def _frames(*seconds):
+    return [Path(f"frame_{s // 60}m{s % 60:02d}s.png") for s in seconds]
+
+
+def _flat(width, height):
+    return 1000
+
+
+def test_plan_batches_packs_to_budget():
+    frames = _frames(*range(0, 40, 2))
+    batches = plan_batches(frames, [], token_budget=5700, image_tokens=_flat)
+    assert [len(b) for b in batches] == [5, 5, 5, 5]
+    assert [f for b in batches for f in b] == frames
+
+
+def test_plan_batches_sparse_video_uses_one_call():
+    frames = _frames(0, 60, 120, 180, 240, 300, 360, 420, 480, 540, 600, 660)
+    batches = plan_batches(frames, [], token_budget=100000, image_tokens=_flat)
+    assert len(batches) == 1
+
+
+def test_plan_batches_respects_output_limit():
+    frames = _frames(*range(0, 40, 2))
+    batches = plan_batches(
+        frames, [], token_budget=10**6, max_output_tokens=550, image_tokens=_flat
+    )
+    assert max(len(b) for b in batches) == 5
+
+
+def test_plan_batches_prefers_sentence_boundary():
+    frames = _frames(0, 2, 4, 6, 8, 10)
+    segments = [
+        {"start": 0.0, "end": 4.0, "text": "First sentence ends here."},
+        {"start": 4.0, "end": 7.0, "text": "Second one keeps"},
+        {"start": 7.0, "end": 12.0, "text": "going on."},
+    ]
+    batches = plan_batches(frames, segments, token_budget=5100, image_tokens=_flat)
+    # The budget fits four frames, but 0:06 and 0:08 fall mid-sentence
+    assert batches == [frames[:2], frames[2:]]
+
+
+def test_batch_bounds_cover_gaps_between_batches():
+    batches = [_frames(0, 10), _frames(120, 130)]
+    assert batch_bounds(batches, interval=2) == [(0, 120), (120, 132)]
+    assert time_range_for_batch(batches[0], end_s=120) == "0:00 - 2:00"
+
+
+def test_estimate_image_tokens_handles_degenerate_sizes():
+    assert estimate_image_tokens(1280, 720) == 1228
+    assert estimate_image_tokens(0, 720) == estimate_image_tokens(1280, 0) == 1
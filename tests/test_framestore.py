@@ -0,0 +1,81 @@
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip("numpy")
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "testsrc.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=duration=10:size=320x180:rate=10",
+         "-pix_fmt", "yuv420p", str(path), "-y"],
+        check=True, capture_output=True,
+    )
+    return path
+
+
+def test_store_matches_loose_extraction(video, tmp_path):
+    from vidwise.extractor import extract_frames
+    from vidwise.framestore import FrameStore, extract_frames_to_store
+
+    loose_dir = tmp_path / "loose"
+    store_dir = tmp_path / "store"
+    loose_dir.mkdir()
+    store_dir.mkdir()
+
+    loose = extract_frames(video, loose_dir, interval=2)
+    stored = extract_frames_to_store(video, store_dir, interval=2)
+
+    assert [f.name for f in stored] == [f.name for f in loose]
+    assert not list((store_dir / "frames").glob("*.png"))
+    assert stored[0].read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+
+    with FrameStore(store_dir) as reopened:
+        assert reopened.read(2) == stored[2].read_bytes()
+        assert reopened.thumbnails.shape == (len(stored), 72, 128, 3)
+    assert reopened._pack is None
+
+
+def test_closed_store_maps_pack_again_on_read(video, tmp_path):
+    from vidwise.framestore import extract_frames_to_store
+
+    stored = extract_frames_to_store(video, tmp_path, interval=2)
+    store = stored[0].store
+    assert store._pack is None  # nothing is mapped until a frame is read
+    first = stored[0].read_bytes()
+    store.close()
+    assert store._pack is None
+    assert stored[0].read_bytes() == first
+    store.close()
+
+
+def test_subsecond_frames_named_by_timestamp(video, tmp_path):
+    import json
+
+    from vidwise.extractor import MANIFEST_NAME, extract_frames
+
+    frames = extract_frames(video, tmp_path, interval=0.5)
+    assert [f.name for f in frames[:3]] == [
+        "frame_0m00s.png", "frame_0m00.500s.png", "frame_0m01s.png"
+    ]
+    assert len(list((tmp_path / "frames").iterdir())) == len(frames)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert [entry["seconds"] for entry in manifest["frames"][:3]] == [0, 0.5, 1]
+
+
+def test_key_frames_from_store_and_export(video, tmp_path):
+    from vidwise.frames import png_size, select_key_frames
+    from vidwise.framestore import extract_frames_to_store
+
+    stored = extract_frames_to_store(video, tmp_path, interval=1)
+    key_frames = select_key_frames(stored, threshold=0.01)
+    assert key_frames[0] is stored[0] and key_frames[-1] is stored[-1]
+    assert png_size(key_frames[0]) == (320, 180)
+
+    exported = stored[0].store.export(key_frames[:2])
+    assert [p.name for p in exported] == [f.name for f in key_frames[:2]]
+    assert exported[0].read_bytes() == key_frames[0].read_bytes()
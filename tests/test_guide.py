@@ -0,0 +1,36 @@
+import pytest
+
+from vidwise.providers.base import GuideProvider
+from vidwise.transcriber import Segment, Words
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class RecordingProvider(GuideProvider):
+    def __init__(self):
+        self.transcripts = []
+
+    def analyze_batch(self, frame_paths, transcript_text, time_range):
+        self.transcripts.append(transcript_text)
+        return {"summary": "s", "key_frames": [], "narrative": "n"}
+
+    def generate_overview(self, batch_results, full_transcript):
+        return {"title": "t", "overview": "o", "key_takeaways": []}
+
+
+def test_words_after_the_last_frame_go_to_the_last_batch(tmp_path):
+    from vidwise.guide import generate_guide
+
+    (tmp_path / "frames").mkdir()
+    frames = []
+    for i in range(2):
+        path = tmp_path / "frames" / f"frame_0m{i * 2:02d}s.png"
+        Image.new("RGB", (64, 36), (i * 200, 0, 0)).save(path)
+        frames.append(path)
+    words = Words([(0.5, 1.0, " Hello"), (3.0, 3.5, " there"), (9.0, 9.5, " friends.")])
+    segment = Segment(0.5, 9.5, " Hello there friends.", words)
+
+    provider = RecordingProvider()
+    generate_guide(provider, frames, {"text": segment.text, "segments": [segment]}, tmp_path,
+                   record_batches=False)
+    assert " ".join(provider.transcripts).split() == ["Hello", "there", "friends."]
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+features = pytest.importorskip("PIL.features")
+pytestmark = pytest.mark.skipif(not features.check("webp"), reason="Pillow built without WebP")
+
+
+def _output(tmp_path, sections):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    results = []
+    for i in range(sections):
+        name = f"frame_0m{i * 2:02d}s.png"
+        Image.new("RGB", (1280, 720), (i * 10 % 256, 80, 120)).save(frames / name)
+        results.append({
+            "summary": f"Step {i + 1}",
+            "narrative": "Some <narration> & more.",
+            "key_frames": [{"filename": name, "description": f"Screen {i + 1}"}],
+        })
+    return results
+
+
+OVERVIEW = {"title": "Demo", "overview": "An overview.", "key_takeaways": ["One"]}
+
+
+def test_single_page_uses_lazy_thumbnails(tmp_path):
+    from vidwise.htmlguide import write_html_guide
+
+    results = _output(tmp_path, 3)
+    page = write_html_guide(OVERVIEW, results, tmp_path).read_text()
+
+    thumbs = sorted((tmp_path / "thumbs").iterdir())
+    assert len(thumbs) == 3 and all(t.suffix == ".webp" for t in thumbs)
+    assert Image.open(thumbs[0]).size == (860, 484)
+    assert 'loading="lazy"' in page
+    assert re.search(r'srcset="thumbs/[0-9a-f]{64}\.webp 860w, frames/frame_0m00s\.png 1280w"', page)
+    assert '<a href="#section-2">Step 2</a>' in page
+    assert "&lt;narration&gt; &amp; more." in page
+    assert not list(tmp_path.glob("guide-*.html"))
+
+
+def test_thumbnails_are_reused(tmp_path):
+    from vidwise.htmlguide import write_html_guide
+
+    results = _output(tmp_path, 2)
+    write_html_guide(OVERVIEW, results, tmp_path)
+    mtimes = {t: t.stat().st_mtime_ns for t in (tmp_path / "thumbs").iterdir()}
+    write_html_guide(OVERVIEW, results, tmp_path)
+    assert {t: t.stat().st_mtime_ns for t in (tmp_path / "thumbs").iterdir()} == mtimes
+
+
+def test_long_guides_are_split_into_chapters(tmp_path, monkeypatch):
+    from vidwise import htmlguide
+
+    monkeypatch.setattr(htmlguide, "SECTIONS_PER_PAGE", 2)
+    results = _output(tmp_path, 5)
+    index = htmlguide.write_html_guide(OVERVIEW, results, tmp_path).read_text()
+
+    pages = sorted(p.name for p in tmp_path.glob("guide-*.html"))
+    assert pages == ["guide-01.html", "guide-02.html", "guide-03.html"]
+    assert '<a href="guide-02.html#section-3">Step 3</a>' in index
+    assert "<img" not in index
+
+    middle = (tmp_path / "guide-02.html").read_text()
+    assert 'id="section-3"' in middle and 'id="section-4"' in middle
+    assert '<a href="guide-01.html">← Previous</a>' in middle
+    assert '<a href="guide-03.html">Next →</a>' in middle
+
+    monkeypatch.setattr(htmlguide, "SECTIONS_PER_PAGE", 20)
+    htmlguide.write_html_guide(OVERVIEW, results, tmp_path)
+    assert not list(tmp_path.glob("guide-*.html"))
+
+
+def test_unreadable_frame_falls_back_to_full_png(tmp_path):
+    from vidwise.htmlguide import write_html_guide
+
+    results = _output(tmp_path, 2)
+    broken = tmp_path / "frames" / "frame_0m00s.png"
+    broken.write_bytes(broken.read_bytes()[:100])
+    page = write_html_guide(OVERVIEW, results, tmp_path).read_text()
+
+    assert '<img src="frames/frame_0m00s.png"' in page
+    assert 'srcset="thumbs/' in page  # the other frame still gets a thumbnail
+    assert [t.suffix for t in (tmp_path / "thumbs").iterdir()] == [".webp"]
@@ -0,0 +1,148 @@
+from pathlib import Path
+
+import pytest
+
+from vidwise.incremental import (
+    align,
+    batch_record,
+    hash_distance,
+    load_batches,
+    perceptual_hash,
+    plan_with_previous,
+    reuse_result,
+    save_batches,
+    text_similarity,
+)
+
+
+def _frames(*seconds: int) -> list[Path]:
+    return [Path(f"frame_{s // 60}m{s % 60:02d}s.png") for s in seconds]
+
+
+def _record(frames, hashes, transcript):
+    result = {
+        "summary": "Intro",
+        "key_frames": [{"filename": f.name, "description": f"Shows {f.name}"} for f in frames],
+    }
+    return batch_record(frames, hashes, "0:00 - 0:10", transcript, result)
+
+
+def test_hash_distance_and_text_similarity():
+    assert hash_distance(0b1011, 0b0010) == 2
+    assert text_similarity("the same words", "the same words") == 1.0
+    assert text_similarity("open the settings menu now", "open the settings menu today") >= 0.8
+    assert text_similarity("completely different", "nothing alike here at all") < 0.9
+
+
+def test_align_reuses_unchanged_spans_around_an_edit(tmp_path):
+    previous = [
+        _record(_frames(0, 2), [0x00FF, 0xFF00], "intro text"),
+        _record(_frames(4, 6), [0x0F0F, 0xF0F0], "middle text"),
+        _record(_frames(8), [0x3333], "outro text"),
+    ]
+    save_batches(tmp_path, previous)
+    previous = load_batches(tmp_path)
+
+    # Middle batch re-recorded: its frames look different; the outro is shifted
+    hashes = [0x00FF, 0xFF01, 0xAAAA, 0x5555, 0x9999, 0x3333]
+    texts = {(0, 2): "intro text", (5, 6): "outro text"}
+    spans = align(previous, hashes, lambda start, end: texts.get((start, end), ""))
+
+    assert [(start, end, record is not None) for start, end, record in spans] == [
+        (0, 2, True), (2, 5, False), (5, 6, True),
+    ]
+    assert spans[2][2]["transcript"] == "outro text"
+
+
+def test_align_rejects_changed_transcript():
+    previous = [_record(_frames(0, 2), [1, 2], "original narration")]
+    previous[0]["hashes"] = [1, 2]
+    spans = align(previous, [1, 2], lambda start, end: "entirely new voice over")
+    assert spans == [(0, 2, None)]
+
+
+def test_reuse_result_renames_frames_to_new_timestamps():
+    record = _record(_frames(10, 12), [1, 2], "text")
+    result = reuse_result(record, _frames(20, 22))
+    assert [kf["filename"] for kf in result["key_frames"]] == [
+        "frame_0m20s.png", "frame_0m22s.png"
+    ]
+    assert result["summary"] == "Intro"
+    assert record["result"]["key_frames"][0]["filename"] == "frame_0m10s.png"
+
+
+def test_plan_with_previous_batches_only_changed_spans():
+    segments = [
+        {"start": 0.0, "end": 3.0, "text": " Welcome."},
+        {"start": 4.0, "end": 7.0, "text": " Something new."},
+    ]
+    previous = [_record(_frames(0, 2), [1, 2], "Welcome.")]
+    previous[0]["hashes"] = [1, 2]
+    planned_calls = []
+
+    def plan(frames, span_segments):
+        planned_calls.append(([f.name for f in frames], [s["text"] for s in span_segments]))
+        return [frames]
+
+    key_frames = _frames(0, 2, 4, 6)
+    planned = plan_with_previous(previous, key_frames, [1, 2, 50, 60], segments, plan)
+
+    assert [(len(batch), record is not None) for batch, record in planned] == [
+        (2, True), (2, False),
+    ]
+    assert planned_calls == [(["frame_0m04s.png", "frame_0m06s.png"], [" Something new."])]
+
+
+def test_hashes_reuse_key_frame_thumbnails(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    from vidwise import frames as frames_module
+    from vidwise.frames import select_key_frames
+
+    paths = []
+    for i, shade in enumerate((0, 0, 255, 255)):
+        path = tmp_path / f"frame_0m{i * 2:02d}s.png"
+        Image.new("RGB", (320, 180), (shade, 40 + i, 90)).save(path)
+        paths.append(path)
+    expected = {path.name: perceptual_hash(path) for path in paths}
+
+    decoded = []
+    thumbnail = frames_module.frame_thumbnail
+    monkeypatch.setattr(
+        frames_module, "frame_thumbnail", lambda f: decoded.append(f) or thumbnail(f)
+    )
+    thumbnails = {}
+    key_frames = select_key_frames(paths, threshold=0.1, thumbnails=thumbnails)
+
+    assert [f.name for f in key_frames] == ["frame_0m00s.png", "frame_0m04s.png", "frame_0m06s.png"]
+    assert decoded == paths  # each frame decoded once
+    assert {f.name: perceptual_hash(f, thumbnails[f.name]) for f in key_frames} == {
+        f.name: expected[f.name] for f in key_frames
+    }
+
+
+def test_guide_without_records_skips_hashing(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    from vidwise.guide import generate_guide
+    from vidwise.providers.base import GuideProvider
+
+    class Provider(GuideProvider):
+        def analyze_batch(self, frame_paths, transcript_text, time_range):
+            return {"summary": "s", "key_frames": [], "narrative": "n"}
+
+        def generate_overview(self, batch_results, full_transcript):
+            return {"title": "t", "overview": "o", "key_takeaways": []}
+
+    (tmp_path / "frames").mkdir()
+    paths = []
+    for i in range(3):
+        path = tmp_path / "frames" / f"frame_0m{i * 2:02d}s.png"
+        Image.new("RGB", (64, 36), (i * 100, 0, 0)).save(path)
+        paths.append(path)
+
+    def no_hashing(*args):
+        raise AssertionError("hashed without records or a previous run")
+
+    monkeypatch.setattr("vidwise.guide.perceptual_hash", no_hashing)
+    transcript = {"text": "", "segments": []}
+    generate_guide(Provider(), paths, transcript, tmp_path, record_batches=False)
+    assert not (tmp_path / "batches.json").exists()
@@ -0,0 +1,92 @@
+import json
+import shutil
+
+from click.testing import CliRunner
+
+from vidwise.cli import main
+from vidwise.index import connect, search, update_index
+
+
+def _write_output(path, title, segments, key_frames=()):
+    path.mkdir(parents=True)
+    (path / "guide.md").write_text(f"# {title}\n")
+    (path / "transcript.json").write_text(json.dumps({
+        "text": " ".join(text for _, _, text in segments),
+        "segments": [{"start": s, "end": e, "text": text} for s, e, text in segments],
+    }))
+    if key_frames:
+        result = {
+            "summary": f"{title} walkthrough",
+            "narrative": f"Step by step through {title.lower()} for new teams.",
+            "key_frames": [{"filename": name, "description": desc} for name, desc in key_frames],
+        }
+        frames = [{"name": name, "hash": "0" * 16} for name, _ in key_frames]
+        (path / "batches.json").write_text(json.dumps({
+            "version": 1,
+            "batches": [{"frames": frames, "transcript": "", "result": result}],
+        }))
+
+
+def test_search_returns_timestamped_hits_with_frames(tmp_path):
+    _write_output(
+        tmp_path / "outputs" / "sso",
+        "Admin Setup",
+        [(0.0, 5.0, " Welcome to the admin console."),
+         (62.0, 70.0, " Now we configure single sign-on for the team.")],
+        key_frames=[("frame_0m00s.png", "Admin console home page"),
+                    ("frame_1m00s.png", "SAML settings form for SSO")],
+    )
+    _write_output(tmp_path / "outputs" / "other", "Billing", [(3.0, 6.0, " Open invoices.")])
+
+    conn = connect(tmp_path / "index.db")
+    assert update_index(conn, [tmp_path / "outputs"])["added"] == 2
+
+    hits = search(conn, "configure sign-on")
+    assert len(hits) == 1
+    assert (hits[0].title, hits[0].kind, hits[0].start) == ("Admin Setup", "transcript", 62.0)
+    assert hits[0].frame == "frames/frame_1m00s.png"
+    assert "[configure]" in hits[0].snippet
+
+    section_hits = search(conn, "walkthrough")
+    assert [(h.kind, h.start, h.frame) for h in section_hits] == [
+        ("section", 0, "frames/frame_0m00s.png")
+    ]
+    assert [h.kind for h in search(conn, "step by step")] == ["section"]
+
+    frame_hits = search(conn, "SSO")
+    assert [(h.kind, h.frame) for h in frame_hits] == [("frame", "frames/frame_1m00s.png")]
+    assert search(conn, 'unbalanced "quote') == []
+
+
+def test_reindex_updates_only_changed_outputs(tmp_path):
+    roots = [tmp_path / "outputs"]
+    _write_output(roots[0] / "a", "A", [(0.0, 1.0, " alpha")])
+    _write_output(roots[0] / "b", "B", [(0.0, 1.0, " beta")])
+    conn = connect(tmp_path / "index.db")
+    update_index(conn, roots)
+
+    (roots[0] / "a" / "transcript.json").write_text(json.dumps({
+        "text": "gamma", "segments": [{"start": 0.0, "end": 1.0, "text": " gamma"}],
+    }))
+    shutil.rmtree(roots[0] / "b")
+
+    counts = update_index(conn, roots)
+    assert counts == {"added": 0, "updated": 1, "unchanged": 0, "removed": 1}
+    assert search(conn, "alpha") == [] and search(conn, "beta") == []
+    assert [h.title for h in search(conn, "gamma")] == ["A"]
+    assert update_index(conn, roots)["unchanged"] == 1
+
+
+def test_index_and_search_commands(tmp_path):
+    _write_output(tmp_path / "out", "Demo", [(90.5, 92.0, " Deploy to production.")])
+    db = str(tmp_path / "index.db")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["index", str(tmp_path / "out"), "--index", db])
+    assert result.exit_code == 0, result.output
+    assert "1 added" in result.output
+
+    result = runner.invoke(main, ["search", "deploy", "--index", db])
+    assert result.exit_code == 0, result.output
+    assert "Demo @ 1m30.500s [transcript]" in result.output
+    assert "1 hit(s)" in result.output
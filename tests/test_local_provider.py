@@ -0,0 +1,105 @@
+import asyncio
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tests.fake_server import FakeOpenAIServer
+
+pytest.importorskip("openai")
+Image = pytest.importorskip("PIL.Image")
+
+
+def _write_frames(tmp_path: Path, *seconds: int) -> list[Path]:
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    frames = []
+    for s in seconds:
+        frame = frames_dir / f"frame_{s // 60}m{s % 60:02d}s.png"
+        Image.new("RGB", (16, 9), (s * 8 % 256, 0, 0)).save(frame)
+        frames.append(frame)
+    return frames
+
+
+def test_full_guide_pipeline_offline(tmp_path):
+    from vidwise.guide import generate_guide
+    from vidwise.providers.local import LocalGuideProvider
+
+    frames = _write_frames(tmp_path, 0, 30)
+    transcript = {
+        "text": "Hello world. Goodbye.",
+        "segments": [
+            {"start": 0.0, "end": 4.0, "text": " Hello world."},
+            {"start": 30.0, "end": 32.0, "text": " Goodbye."},
+        ],
+    }
+    with FakeOpenAIServer() as server:
+        provider = LocalGuideProvider(base_url=server.base_url, model="fake-vlm")
+        guide_path = generate_guide(provider, frames, transcript, tmp_path)
+
+    guide = guide_path.read_text()
+    assert guide.startswith("# Fake Video")
+    assert "![Shows frame_0m30s.png](frames/frame_0m30s.png)" in guide
+    assert all(r["model"] == "fake-vlm" for r in server.requests)
+    assert provider.usage.requests == len(server.requests) == 2
+
+
+def test_async_local_provider_streams(tmp_path):
+    from vidwise.providers.local import AsyncLocalGuideProvider
+
+    frames = _write_frames(tmp_path, 0)
+    partials = []
+    with FakeOpenAIServer() as server:
+        provider = AsyncLocalGuideProvider(base_url=server.base_url)
+        result = asyncio.run(
+            provider.analyze_batch(frames, "Hi there", "0:00 - 0:02", on_partial=partials.append)
+        )
+
+    assert result["narrative"] == "Hi there"
+    assert partials[0] == {"summary": "Segment 0:00 - 0:02"}
+    assert provider.usage.output_tokens == 20
+
+
+def test_detect_provider_prefers_local_url_without_keys(monkeypatch):
+    from vidwise.guide import detect_provider
+    from vidwise.providers.local import LocalGuideProvider
+
+    monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("VIDWISE_LOCAL_URL", raising=False)
+    assert detect_provider("auto") is None
+
+    monkeypatch.setenv("VIDWISE_LOCAL_URL", "http://127.0.0.1:9/v1")
+    assert isinstance(detect_provider("auto"), LocalGuideProvider)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_local_provider_reads_frame_store(tmp_path):
+    import base64
+
+    pytest.importorskip("numpy")
+    from vidwise.framestore import extract_frames_to_store
+    from vidwise.providers.local import LocalGuideProvider
+
+    video = tmp_path / "testsrc.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=duration=4:size=160x90:rate=10",
+         "-pix_fmt", "yuv420p", str(video), "-y"],
+        check=True, capture_output=True,
+    )
+    stored = extract_frames_to_store(video, tmp_path, interval=2)
+    with FakeOpenAIServer() as server:
+        provider = LocalGuideProvider(base_url=server.base_url, model="fake-vlm")
+        result = provider.analyze_batch(stored[:2], "Hi there", "0:00 - 0:02")
+
+    assert result["narrative"] == "Hi there"
+    images = [
+        part["image_url"]["url"]
+        for message in server.requests[0]["messages"]
+        if isinstance(message["content"], list)
+        for part in message["content"]
+        if part["type"] == "image_url"
+    ]
+    expected = base64.standard_b64encode(stored[1].read_bytes()).decode("ascii")
+    assert images[1] == f"data:image/png;base64,{expected}"
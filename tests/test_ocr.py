@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import pytest
+
+from vidwise.frames import plan_batches
+from vidwise.ocr import FrameText, ocr_context
+
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("numpy")
+
+
+def _words(*boxes):
+    """A pytesseract.image_to_data-style table with one word per box."""
+    table = {k: [] for k in
+             ("text", "conf", "block_num", "par_num", "line_num", "left", "top", "width", "height")}
+    for i, (text, left, top, width, height) in enumerate(boxes):
+        for key, value in zip(table, (text, 95, 1, 1, i, left, top, width, height)):
+            table[key].append(value)
+    return table
+
+
+def _slide_with_picture():
+    from PIL import ImageDraw
+
+    image = Image.new("L", (200, 100), 255)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10, 10, 90, 20), fill=0)  # "text" line
+    draw.ellipse((120, 40, 180, 90), fill=0)  # a diagram
+    return image
+
+
+def test_coverage_counts_detail_inside_words():
+    from vidwise.ocr import frame_text_from_words
+
+    image = _slide_with_picture()
+    text_only = frame_text_from_words(image, _words(("Agenda", 5, 5, 90, 20)))
+    assert text_only.text == "Agenda"
+    assert not text_only.covered
+
+    everything = frame_text_from_words(
+        image, _words(("Agenda", 5, 5, 90, 20), ("Q3", 115, 35, 70, 60))
+    )
+    assert everything.text == "Agenda\nQ3"
+    assert everything.covered
+
+
+def test_ocr_context_marks_text_only_frames():
+    batch = [Path("frame_0m00s.png"), Path("frame_0m02s.png"), Path("frame_0m04s.png")]
+    texts = {
+        "frame_0m00s.png": FrameText("Title slide", 0.97),
+        "frame_0m02s.png": FrameText("Chart legend", 0.4),
+    }
+    context = ocr_context(batch, texts)
+    text_only, attached = context.split("\n\nOn-screen text of attached frames (OCR):\n")
+    assert text_only.startswith("Text-only frames (image not attached;")
+    assert "[frame_0m00s.png]\nTitle slide" in text_only
+    assert attached == "[frame_0m02s.png]\nChart legend"
+    assert "frame_0m04s" not in context
+    assert ocr_context(batch, {}) == ""
+
+
+def test_text_only_frames_are_charged_as_text(tmp_path):
+    frames = [Path(f"frame_0m{s:02d}s.png") for s in range(0, 20, 2)]
+
+    def flat(width, height):
+        return 1000
+
+    as_images = plan_batches(frames, [], token_budget=5700, image_tokens=flat)
+    as_text = plan_batches(
+        frames, [], token_budget=5700, image_tokens=flat,
+        frame_text={f.name: "short slide text" for f in frames},
+    )
+    assert len(as_images) > 1
+    assert as_text == [frames]
+
+
+def test_covered_frames_stay_referenceable(tmp_path, monkeypatch):
+    import re
+
+    from vidwise.guide import generate_guide
+    from vidwise.providers.base import GuideProvider
+
+    frames_dir = tmp_path / "frames"
+    frames_dir.mkdir()
+    frames = []
+    for s, color in ((0, 0), (2, 255)):
+        frames.append(frames_dir / f"frame_0m{s:02d}s.png")
+        Image.new("RGB", (64, 36), (color, color, color)).save(frames[-1])
+
+    class EchoProvider(GuideProvider):
+        def __init__(self):
+            super().__init__()
+            self.images = []
+
+        def analyze_batch(self, frame_paths, transcript_text, time_range):
+            self.images.extend(f.name for f in frame_paths)
+            names = [f.name for f in frame_paths]
+            names += re.findall(r"^\[(frame_\S+\.png)\]$", transcript_text, re.M)
+            return {"summary": "s", "narrative": "n",
+                    "key_frames": [{"filename": n, "description": n} for n in names]}
+
+        def generate_overview(self, batch_results, full_transcript):
+            return {"title": "T", "overview": "o", "key_takeaways": []}
+
+    monkeypatch.setattr(
+        "vidwise.guide.ocr_frames",
+        lambda key_frames: {"frame_0m02s.png": FrameText("Agenda\nQ3 goals", 0.98)},
+    )
+    provider = EchoProvider()
+    guide = generate_guide(provider, frames, {"text": "", "segments": []}, tmp_path, ocr=True)
+
+    assert provider.images == ["frame_0m00s.png"]
+    assert "(frames/frame_0m02s.png)" in guide.read_text()
+    assert "frame_0m02s.png" in (tmp_path / "guide.html").read_text()
+    assert (frames_dir / "frame_0m02s.png").exists()
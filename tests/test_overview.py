@@ -0,0 +1,69 @@
+import json
+
+from vidwise.overview import build_overview
+from vidwise.providers.base import GuideProvider
+from vidwise.transcriber import transcript_excerpt
+
+
+class CountingProvider(GuideProvider):
+    def __init__(self):
+        self.calls = []
+
+    def analyze_batch(self, frame_paths, transcript_text, time_range):
+        raise NotImplementedError
+
+    def generate_overview(self, batch_results, full_transcript):
+        self.calls.append((len(batch_results), full_transcript))
+        return {"title": f"{len(batch_results)} parts", "overview": "o", "key_takeaways": []}
+
+
+def _results(n):
+    return [{"summary": f"s{i}", "key_frames": [], "narrative": "n"} for i in range(n)]
+
+
+def test_short_video_uses_single_call():
+    provider = CountingProvider()
+    build_overview(provider, _results(3), ["a", "b", "c"], "a b c")
+    assert provider.calls == [(3, "a b c")]
+
+
+def test_long_video_reduces_hierarchically():
+    provider = CountingProvider()
+    transcripts = [f"words{i}" for i in range(100)]
+    build_overview(provider, _results(100), transcripts, " ".join(transcripts), fan_in=4)
+    assert all(n <= 4 for n, _ in provider.calls)
+    # 100 -> 25 -> 7 -> 2 -> final
+    assert len(provider.calls) == 25 + 7 + 2 + 1
+    # Every batch transcript is seen by some first-level call
+    seen = " ".join(t for _, t in provider.calls[:25])
+    assert all(t in seen for t in transcripts)
+
+
+def test_final_call_gets_full_transcript_when_it_fits():
+    provider = CountingProvider()
+    text = "word " * 2000
+    build_overview(provider, _results(3), ["a", "b", "c"], text)
+    assert provider.calls == [(3, text)]
+
+
+def test_every_call_stays_within_budget():
+    sizes = []
+
+    class SizingProvider(CountingProvider):
+        def generate_overview(self, batch_results, full_transcript):
+            sizes.append(len(json.dumps(batch_results, separators=(",", ":")))
+                         + len(full_transcript))
+            return super().generate_overview(batch_results, full_transcript)
+
+    results = [{**result, "narrative": "n" * 600} for result in _results(12)]
+    transcripts = ["x" * 3000 for _ in range(12)]
+    build_overview(SizingProvider(), results, transcripts, " ".join(transcripts),
+                   fan_in=4, char_budget=4000)
+    assert len(sizes) > 1 and max(sizes) <= 4000
+
+
+def test_transcript_excerpt_spans_whole_text():
+    text = "".join(chr(ord("a") + i % 26) * 100 for i in range(26))
+    excerpt = transcript_excerpt(text, 600)
+    assert len(excerpt) <= 600
+    assert excerpt.startswith("a") and excerpt.endswith("z")
@@ -0,0 +1,116 @@
+import logging
+import shutil
+import subprocess
+
+import pytest
+from click.testing import CliRunner
+
+from vidwise.cli import main
+from vidwise.errors import Cancelled, SourceError, StageTimeout
+from vidwise.pipeline import Pipeline
+from vidwise.progress import StageControl
+
+needs_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg/ffprobe not installed",
+)
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "testsrc.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "testsrc=duration=20:size=320x180:rate=10",
+         "-f", "lavfi", "-i", "sine=duration=20", "-shortest",
+         "-pix_fmt", "yuv420p", str(path), "-y"],
+        check=True, capture_output=True,
+    )
+    return path
+
+
+@pytest.fixture
+def no_whisper(monkeypatch):
+    def transcribe(audio_path, output_dir, model_size="medium", full_json=False, control=None,
+                   options=None, word_timestamps=False):
+        control.update(5, 10)
+        return {"text": "", "segments": []}
+
+    monkeypatch.setattr("vidwise.transcriber.transcribe", transcribe)
+
+
+def test_stage_control_reports_eta_and_stops():
+    events = []
+    control = StageControl("frames", events.append)
+    control.update(25, 100)
+    assert events[0].stage == "frames"
+    assert events[0].percent == 25.0
+    assert events[0].eta is not None and events[0].eta >= 0
+
+    control.cancel.set()
+    with pytest.raises(Cancelled):
+        control.check()
+    with pytest.raises(StageTimeout, match="transcribe timed out after 0s"):
+        StageControl("transcribe", timeout=0).check()
+
+
+def test_missing_source_raises_instead_of_exiting(tmp_path):
+    with pytest.raises(SourceError):
+        Pipeline(str(tmp_path / "missing.mp4"), tmp_path / "out", provider=None).run()
+
+    result = CliRunner().invoke(main, [str(tmp_path / "missing.mp4"), "-o", str(tmp_path / "o")])
+    assert result.exit_code == 1
+    assert "Error: file not found" in result.output
+
+
+def test_help_shows_default_options_and_commands():
+    result = CliRunner().invoke(main, ["--help"])
+    assert result.exit_code == 0
+    assert "--frame-interval" in result.output
+    commands = result.output.split("Commands:")[1]
+    assert all(name in commands for name in ("bench", "index", "search", "distribute", "worker"))
+    assert "process" not in commands
+
+
+def test_unknown_stage_timeout_is_rejected():
+    with pytest.raises(ValueError, match="extract"):
+        Pipeline("video.mp4", timeouts={"extract": 10})
+
+
+@needs_ffmpeg
+def test_pipeline_reports_progress(video, tmp_path, no_whisper, capsys, caplog, monkeypatch):
+    # Undo the console output a CLI test may have set up in this process
+    monkeypatch.setattr(logging.getLogger("vidwise"), "handlers", [])
+    monkeypatch.setattr(logging.getLogger("vidwise"), "propagate", True)
+    events = []
+    with caplog.at_level(logging.INFO, logger="vidwise"):
+        result = Pipeline(
+            str(video), tmp_path / "out", provider=None, frame_interval=1,
+            on_progress=events.append,
+        ).run()
+
+    assert capsys.readouterr().out == ""
+    assert "Extracting audio..." in caplog.messages
+
+    assert len(result.frames) == 20
+    assert result.guide is None
+    frames = [e for e in events if e.stage == "frames"]
+    assert frames[0].percent == 5.0 and frames[-1].percent == 100.0
+    assert {e.stage for e in events if e.percent == 100.0} == {
+        "acquire", "audio", "frames", "transcribe"
+    }
+    assert (events[-1].stage, events[-1].percent) == ("transcribe", 100.0)
+
+
+@needs_ffmpeg
+def test_cancel_stops_frame_extraction(video, tmp_path, no_whisper):
+    def on_progress(event):
+        if event.stage == "frames" and event.percent >= 10:
+            pipeline.cancel()
+
+    pipeline = Pipeline(
+        str(video), tmp_path / "out", provider=None, frame_interval=1, on_progress=on_progress
+    )
+    with pytest.raises(Cancelled) as excinfo:
+        pipeline.run()
+    assert excinfo.value.stage == "frames"
+    assert len(list((tmp_path / "out" / "frames").iterdir())) < 20
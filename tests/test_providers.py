@@ -0,0 +1,212 @@
+import asyncio
+import base64
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from vidwise.providers.async_base import SyncGuideProvider
+from vidwise.providers.base import GuideProvider
+from vidwise.providers.mock import MockGuideProvider
+from vidwise.providers.runtime import PayloadCache, parse_json_response, pooled_client
+from vidwise.providers.streaming import StreamingJSONParser
+
+
+def test_streaming_parser_partial_results():
+    text = '```json\n{"summary": "Intro", "key_frames": [{"filename": "a.png"}], "narrative": "x"}\n```'
+    parser = StreamingJSONParser()
+    seen = []
+    for ch in text:
+        parser.feed(ch)
+        partial = parser.partial()
+        if partial and partial not in seen:
+            seen.append(partial)
+
+    assert {"summary": "Intro"} in seen
+    assert {"summary": "Intro", "key_frames": [{"filename": "a.png"}]} in seen
+    assert parser.done
+    assert parser.result() == json.loads(text.strip("`json\n"))
+
+
+def test_streaming_parser_falls_back_to_text():
+    parser = StreamingJSONParser()
+    parser.feed("not json at all")
+    assert parser.partial() is None
+    assert parser.result()["summary"] == "not json at all"
+
+
+def test_mock_provider_multiplexes_batches():
+    provider = MockGuideProvider(chunk_size=5)
+    requests = [([Path(f"frame_0m{i:02d}s.png")], f"words {i}", f"0:{i:02d}") for i in range(20)]
+    results = asyncio.run(provider.analyze_batches(requests))
+    assert [r["key_frames"][0]["filename"] for r in results] == [r[0][0].name for r in requests]
+    assert provider.usage.requests == 20
+
+
+def test_async_provider_works_across_event_loops():
+    class Provider(MockGuideProvider):
+        def _new_client(self):
+            return object()
+
+    provider = Provider(latency=0.001, max_concurrency=1)
+    requests = [([Path("frame_0m00s.png")], f"words {i}", f"0:0{i}") for i in range(3)]
+
+    async def run():
+        await provider.analyze_batches(requests)
+        return provider.client
+
+    clients = [asyncio.run(run()) for _ in range(2)]
+    assert clients[0] is not clients[1]
+    assert provider.usage.requests == 6
+
+
+def test_usage_works_without_calling_base_init():
+    class Provider(GuideProvider):
+        def __init__(self):
+            pass
+
+        def analyze_batch(self, frame_paths, transcript_text, time_range):
+            return {}
+
+        def generate_overview(self, batch_results, full_transcript):
+            return {}
+
+    provider = Provider()
+    provider.usage.add(input_tokens=10)
+    assert provider.usage.input_tokens == 10
+
+
+def test_sync_adapter_keeps_blocking_api():
+    partials = []
+    provider = MockGuideProvider()
+    sync = SyncGuideProvider(provider)
+    try:
+        result = sync.analyze_batch([Path("frame_0m00s.png")], "hello there", "0:00 - 0:02")
+        overview = sync.generate_overview([result], "hello there")
+    finally:
+        sync.close()
+    asyncio.run(provider.analyze_batch([], "streamed", "0:00", on_partial=partials.append))
+
+    assert result["summary"] == "Segment 0:00 - 0:02: hello there"
+    assert overview["title"] == result["summary"]
+    assert partials[-1]["narrative"] == "streamed"
+
+
+def test_payload_cache_reuses_until_frame_changes(tmp_path):
+    frame = tmp_path / "frame_0m00s.png"
+    frame.write_bytes(b"first")
+    cache = PayloadCache()
+    assert base64.b64decode(cache.get(frame)) == b"first"
+    assert cache.get(frame) and (cache.hits, cache.misses) == (1, 1)
+
+    frame.write_bytes(b"second!")
+    os.utime(frame, ns=(0, os.stat(frame).st_mtime_ns + 1_000_000))
+    assert base64.b64decode(cache.get(frame)) == b"second!"
+    assert cache.misses == 2
+
+
+def test_payload_cache_evicts_least_recently_used(tmp_path):
+    frames = []
+    for i in range(3):
+        frames.append(tmp_path / f"frame_0m0{i}s.png")
+        frames[-1].write_bytes(bytes(30))  # 40 base64 characters each
+    cache = PayloadCache(max_bytes=100)
+    for frame in frames:
+        cache.get(frame)
+    assert cache.size == 80
+    cache.get(frames[1])
+    assert cache.hits == 1
+    cache.get(frames[0])
+    assert cache.misses == 4
+
+
+def test_pooled_client_is_shared_per_settings():
+    made = []
+
+    def factory():
+        made.append(object())
+        return made[-1]
+
+    first = pooled_client("test", factory, "http://a", "key")
+    assert pooled_client("test", factory, "http://a", "key") is first
+    assert pooled_client("test", factory, "http://b", "key") is not first
+    assert len(made) == 2
+
+
+def test_parse_json_response_strips_fences_and_falls_back():
+    assert parse_json_response('```json\n{"summary": "x"}\n```') == {"summary": "x"}
+    assert parse_json_response("plain")["narrative"] == "plain"
+
+
+def test_claude_request_shape_and_usage(tmp_path, monkeypatch):
+    pytest.importorskip("anthropic")
+    from vidwise.providers.claude import ClaudeGuideProvider
+    from vidwise.providers.runtime import SYSTEM_PROMPT
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    frame = tmp_path / "frame_0m00s.png"
+    frame.write_bytes(b"\x89PNG fake")
+    requests = []
+
+    def create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(
+            content=[SimpleNamespace(text='{"summary": "Intro"}')],
+            usage=SimpleNamespace(
+                input_tokens=300,
+                output_tokens=40,
+                cache_read_input_tokens=1200,
+                cache_creation_input_tokens=None,
+            ),
+        )
+
+    provider = ClaudeGuideProvider()
+    provider.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    assert provider.analyze_batch([frame], "Hello", "0:00 - 0:30") == {"summary": "Intro"}
+
+    request = requests[0]
+    assert request["system"] == SYSTEM_PROMPT
+    assert "cache_control" not in json.dumps(request)
+    image, text = request["messages"][0]["content"]
+    assert image["source"]["data"] == base64.standard_b64encode(frame.read_bytes()).decode()
+    assert text["type"] == "text" and "Hello" in text["text"]
+
+    usage = provider.usage
+    assert usage.input_tokens == 1500 and usage.cached_input_tokens == 1200
+    assert usage.cache_write_tokens == 0
+    assert (usage.output_tokens, usage.requests) == (40, 1)
+
+
+def test_claude_usage_counts_cache_writes_as_input():
+    from vidwise.providers.base import TokenUsage
+    from vidwise.providers.claude import _record_usage
+
+    usage = TokenUsage()
+    _record_usage(usage, SimpleNamespace(
+        input_tokens=10,
+        output_tokens=5,
+        cache_read_input_tokens=0,
+        cache_creation_input_tokens=2000,
+    ))
+    assert usage.input_tokens == 2010 and usage.cached_input_tokens == 0
+    assert usage.cache_write_tokens == 2000
+
+
+def test_openai_usage_reports_cached_prompt_tokens():
+    from vidwise.providers.base import TokenUsage
+    from vidwise.providers.openai import _record_usage
+
+    usage = TokenUsage()
+    _record_usage(usage, SimpleNamespace(
+        prompt_tokens=1500,
+        completion_tokens=30,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+    ))
+    _record_usage(usage, SimpleNamespace(prompt_tokens=200, completion_tokens=10))
+    _record_usage(usage, None)
+
+    assert usage.input_tokens == 1700 and usage.cached_input_tokens == 1024
+    assert usage.cache_write_tokens == 0
+    assert (usage.output_tokens, usage.requests) == (40, 2)
@@ -0,0 +1,72 @@
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from vidwise.errors import Cancelled, StageTimeout, ToolError
+from vidwise.progress import StageControl
+from vidwise.runner import TAIL_LINES, FfmpegProgress, run_tool
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_failure_keeps_only_the_stderr_tail():
+    code = "import sys\nfor i in range(5000): print('line', i, file=sys.stderr)\nsys.exit(3)"
+    with pytest.raises(ToolError, match="converting failed") as excinfo:
+        run_tool(_python(code), "converting")
+    lines = excinfo.value.stderr.splitlines()
+    assert len(lines) == TAIL_LINES
+    assert lines[-1] == "line 4999"
+
+
+def test_stdout_is_streamed_line_by_line():
+    seen = []
+    code = "import sys, time\nfor i in range(3): print(i, flush=True); time.sleep(0.05)"
+    assert run_tool(_python(code), "counting", on_stdout=seen.append) == ""
+    assert seen == ["0", "1", "2"]
+    assert run_tool(_python("print('a'); print('b')"), "printing") == "a\nb"
+
+
+def test_timeout_and_cancel_kill_the_tool():
+    sleeper = _python("import time; time.sleep(30)")
+    start = time.monotonic()
+    with pytest.raises(StageTimeout):
+        run_tool(sleeper, "sleeping", StageControl("audio", timeout=0.2))
+
+    control = StageControl("download")
+    threading.Timer(0.2, control.cancel.set).start()
+    with pytest.raises(Cancelled):
+        run_tool(sleeper, "sleeping", control)
+    assert time.monotonic() - start < 10
+
+
+def test_ffmpeg_progress_parsing():
+    events = []
+    progress = FfmpegProgress(StageControl("audio", events.append))
+    progress.stderr_line("  Duration: 00:01:40.00, start: 0.000000, bitrate: 128 kb/s")
+    for line in ("frame=0", "out_time_us=25000000", "progress=continue",
+                 "out_time_us=N/A", "progress=continue",
+                 "out_time_us=100000000", "progress=end"):
+        progress.stdout_line(line)
+    assert progress.duration == 100
+    assert [e.percent for e in events] == [25.0, 100.0]
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_extract_audio_reports_ffmpeg_progress(tmp_path):
+    from vidwise.extractor import extract_audio
+
+    video = tmp_path / "tone.mp4"
+    subprocess.run(
+        ["ffmpeg", "-f", "lavfi", "-i", "sine=duration=5", str(video), "-y"],
+        check=True, capture_output=True,
+    )
+    events = []
+    audio = extract_audio(video, tmp_path, StageControl("audio", events.append))
+    assert audio.exists()
+    assert events and events[-1].percent == 100.0
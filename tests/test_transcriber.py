@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from vidwise import transcriber
+from vidwise.transcriber import (
+    Segment,
+    WhisperOptions,
+    Words,
+    _write_compact_json,
+    _write_srt,
+    segments_for_timerange,
+    segments_to_text,
+    transcript_for_timerange,
+    word_segments,
+)
+
+
+def test_segment_is_compact_and_dict_compatible():
+    seg = Segment(1.0, 2.5, " Hello")
+    assert not hasattr(seg, "__dict__")
+    assert seg["start"] == 1.0 and seg.get("text") == " Hello"
+    assert seg.get("tokens") is None
+
+
+def test_segment_helpers_accept_segments():
+    segments = [Segment(0.0, 2.0, " One."), Segment(2.0, 4.0, " Two.")]
+    assert segments_to_text(segments_for_timerange(segments, 1.0, 3.0)) == "One. Two."
+
+
+def test_compact_json_roundtrip(tmp_path):
+    result = {"text": "One. Two.", "language": "en",
+              "segments": [Segment(0.0, 2.0, " One."), Segment(2.0, 4.5, " Two.")]}
+    path = tmp_path / "transcript.json"
+    with open(path, "w") as f:
+        _write_compact_json(f, result)
+    assert json.loads(path.read_text()) == {
+        "text": "One. Two.",
+        "language": "en",
+        "segments": [
+            {"start": 0.0, "end": 2.0, "text": " One."},
+            {"start": 2.0, "end": 4.5, "text": " Two."},
+        ],
+    }
+
+
+def test_srt_written_incrementally(tmp_path):
+    path = tmp_path / "transcript.srt"
+    with open(path, "w") as f:
+        _write_srt(f, [Segment(0.0, 1.5, " Hi"), Segment(61.0, 62.25, " Bye")])
+    assert path.read_text() == (
+        "1\n00:00:00,000 --> 00:00:01,500\nHi\n\n"
+        "2\n00:01:01,000 --> 00:01:02,250\nBye\n"
+    )
+
+
+def _worded(start, end, words):
+    return Segment(start, end, "".join(w for _, _, w in words), Words(words))
+
+
+def test_words_are_compact_and_serialized_as_triples(tmp_path):
+    seg = _worded(0.0, 1.0, [(0.0, 0.4, " Hello"), (0.4, 1.0, " there.")])
+    assert not hasattr(seg.words, "__dict__") and len(seg.words) == 2
+    path = tmp_path / "transcript.json"
+    with open(path, "w") as f:
+        _write_compact_json(f, {"text": seg.text, "segments": [seg]})
+    saved = json.loads(path.read_text())["segments"][0]
+    assert saved["words"] == [[0.0, 0.4, " Hello"], [0.4, 1.0, " there."]]
+
+
+def test_transcript_for_timerange_slices_words_exactly_once():
+    segments = [
+        _worded(0.0, 6.0, [(0.0, 1.0, " One"), (1.0, 2.0, " two"), (2.0, 3.0, " three"),
+                           (3.0, 4.5, " four"), (4.5, 6.0, " five.")]),
+        Segment(6.0, 9.0, " No words here."),
+    ]
+    first = transcript_for_timerange(segments, 0.0, 2.8)
+    second = transcript_for_timerange(segments, 2.8, 10.0)
+    assert first == "One two three"
+    assert second == "four five. No words here."
+    # Segment-level slicing repeats the whole first segment in both windows
+    assert segments_to_text(segments_for_timerange(segments, 2.8, 10.0)).startswith("One")
+
+
+def test_word_segments_split_only_worded_segments():
+    segments = [_worded(0.0, 2.0, [(0.0, 1.0, " A"), (1.0, 2.0, " b.")]), Segment(2.0, 3.0, " C")]
+    assert [s.text for s in word_segments(segments)] == [" A", " b.", " C"]
+
+
+def test_model_cache_ignores_batch_size(monkeypatch):
+    loads = []
+    monkeypatch.setattr("faster_whisper.WhisperModel", lambda *a, **kw: loads.append(kw))
+    transcriber._load_faster_model.cache_clear()
+    try:
+        transcriber.load_faster_model("tiny", WhisperOptions(compute_type="int8", batch_size=8))
+        transcriber.load_faster_model("tiny", WhisperOptions(compute_type="int8", batch_size=16))
+        transcriber.load_faster_model("tiny", WhisperOptions(compute_type="int8", cpu_threads=2))
+    finally:
+        transcriber._load_faster_model.cache_clear()
+    assert len(loads) == 2
+
+
+def test_int8_quantizes_whisper_linear_layers():
+    torch = pytest.importorskip("torch")
+    whisper_model = pytest.importorskip("whisper.model")
+
+    model = torch.nn.Sequential(whisper_model.Linear(8, 4), torch.nn.ReLU())
+    quantized = transcriber.quantize_int8(model)
+    dynamic_linear = torch.ao.nn.quantized.dynamic.Linear
+    assert any(isinstance(m, dynamic_linear) for m in quantized.modules())
+    assert quantized(torch.ones(1, 8)).shape == (1, 4)
@@ -0,0 +1,37 @@
+from vidwise import tuning
+from vidwise.transcriber import WhisperOptions
+
+
+def test_tuned_options_benchmarks_once_per_host(tmp_path, monkeypatch):
+    monkeypatch.setenv(tuning.TUNING_ENV, str(tmp_path / "tuning.json"))
+    calls = []
+
+    def fake_benchmark(model_size, audio_path, options, faster):
+        calls.append(options)
+        speed = {("int8", 8): 1.0, ("int8", 0): 2.0, ("float32", 0): 4.0, ("float32", 8): 3.0}
+        return [(o, speed[o.compute_type, o.batch_size]) for o in options]
+
+    monkeypatch.setattr(tuning, "benchmark", fake_benchmark)
+    monkeypatch.setattr(
+        tuning, "candidates",
+        lambda base, faster: [
+            WhisperOptions(c, base.cpu_threads, base.num_workers, b)
+            for c in ("int8", "float32") for b in (0, 8)
+        ],
+    )
+
+    base = WhisperOptions(compute_type="auto", cpu_threads=4)
+    first = tuning.tuned_options("small", tmp_path / "audio.wav", base, faster=True)
+    again = tuning.tuned_options("small", tmp_path / "audio.wav", base, faster=True)
+
+    assert first == again == WhisperOptions("int8", cpu_threads=4, batch_size=8)
+    assert len(calls) == 1
+
+    tuning.tuned_options("medium", tmp_path / "audio.wav", base, faster=True)
+    assert len(calls) == 2
+
+
+def test_openai_whisper_candidates_need_no_ctranslate2():
+    options = tuning.candidates(WhisperOptions("auto"), faster=False)
+    assert [o.compute_type for o in options] == ["float32", "int8"]
+    assert all(o.batch_size == 0 for o in options)
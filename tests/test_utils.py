@@ -29,3 +29,14 @@ def test_is_url():
     assert is_url("http://loom.com/share/xyz") is True
     assert is_url("/path/to/video.mp4") is False
     assert is_url("video.mp4") is False
+
+
+def test_timestamp_label_fractional():
+    assert timestamp_label(2.0) == "0m02s"
+    assert timestamp_label(2.5) == "0m02.500s"
+    assert timestamp_label(61.25) == "1m01.250s"
+
+
+def test_seconds_from_label_fractional():
+    assert seconds_from_label("frame_0m02.500s.png") == 2.5
+    assert seconds_from_label(f"frame_{timestamp_label(61.25)}.png") == 61.25
@@ -0,0 +1,95 @@
+import time
+
+from vidwise.workqueue import Heartbeat, WorkQueue
+
+
+def test_claim_respects_dependencies(tmp_path):
+    with WorkQueue(tmp_path / "q.db") as queue:
+        first = queue.add("a", {"n": 1})
+        queue.add("b", {"n": 2}, after=[first])
+        task = queue.claim("w1")
+        assert (task.id, task.payload, task.attempts) == (first, {"n": 1}, 1)
+        assert queue.claim("w2") is None  # b waits for a
+        assert queue.complete(task, {"ok": True})
+        assert queue.claim("w2").kind == "b"
+        assert queue.tasks([first])[0]["result"] == {"ok": True}
+
+
+def test_keys_make_adding_idempotent(tmp_path):
+    with WorkQueue(tmp_path / "q.db") as queue:
+        assert queue.add("a", {}, key="video-1") == queue.add("a", {}, key="video-1")
+        assert queue.counts()["pending"] == 1
+
+
+def test_expired_lease_is_reclaimed_and_old_worker_loses_it(tmp_path):
+    with WorkQueue(tmp_path / "q.db") as queue:
+        queue.add("a", {})
+        stale = queue.claim("w1", lease=0.05)
+        time.sleep(0.1)
+        fresh = queue.claim("w2")
+        assert fresh.id == stale.id and fresh.attempts == 2
+        assert not queue.heartbeat(stale)
+        assert not queue.complete(stale)
+        assert queue.fail(stale, "late") == "lost"
+        assert queue.complete(fresh)
+
+
+def test_failures_retry_then_fail_dependents(tmp_path):
+    with WorkQueue(tmp_path / "q.db", retry_delay=0) as queue:
+        first = queue.add("a", {}, max_attempts=2)
+        second = queue.add("b", {}, after=[first])
+        assert queue.fail(queue.claim("w1"), "boom") == "pending"
+        task = queue.claim("w1")
+        assert task.attempts == 2
+        assert queue.fail(task, "boom again") == "failed"
+        states = {t["id"]: (t["status"], t["error"]) for t in queue.tasks()}
+        assert states[first] == ("failed", "boom again")
+        assert states[second] == ("failed", f"task {first} failed")
+        assert queue.claim("w1") is None
+
+
+def test_task_added_after_a_failed_one_fails_at_once(tmp_path):
+    with WorkQueue(tmp_path / "q.db", retry_delay=0) as queue:
+        first = queue.add("a", {}, max_attempts=1)
+        queue.fail(queue.claim("w1"), "boom")
+        late = queue.add("b", {}, after=[first])
+        assert queue.tasks([late])[0]["status"] == "failed"
+        assert queue.counts()["pending"] == 0
+        assert queue.claim("w1") is None
+
+
+def test_requeue_failed_by_key_includes_derived_tasks(tmp_path):
+    with WorkQueue(tmp_path / "q.db", retry_delay=0) as queue:
+        first = queue.add("a", {}, key="video:x", max_attempts=1)
+        second = queue.add("b", {}, key="video:x#finish", after=[first])
+        other = queue.add("a", {}, key="video:y", max_attempts=1)
+        queue.fail(queue.claim("w1"), "boom")
+        queue.fail(queue.claim("w1"), "boom")
+        assert queue.requeue_failed(["video:x"]) == 2
+        states = {t["id"]: (t["status"], t["attempts"]) for t in queue.tasks()}
+        assert states == {first: ("pending", 0), second: ("pending", 0), other: ("failed", 1)}
+        assert queue.claim("w1").id == first
+
+
+def test_release_does_not_use_an_attempt(tmp_path):
+    with WorkQueue(tmp_path / "q.db") as queue:
+        queue.add("a", {})
+        queue.release(queue.claim("w1"))
+        assert queue.claim("w1").attempts == 1
+
+
+def test_heartbeat_keeps_lease_and_reports_loss(tmp_path):
+    path = tmp_path / "q.db"
+    with WorkQueue(path) as queue:
+        queue.add("a", {})
+        task = queue.claim("w1", lease=0.3)
+        with Heartbeat(path, task, lease=0.3) as heartbeat:
+            time.sleep(0.6)
+            assert queue.claim("w2") is None  # Still leased
+        assert not heartbeat.lost
+
+        lost = []
+        with Heartbeat(path, task, lease=0.3, on_lost=lambda: lost.append(True)) as heartbeat:
+            queue.conn.execute("UPDATE tasks SET worker = 'w2'")
+            time.sleep(0.3)
+        assert heartbeat.lost and lost == [True]